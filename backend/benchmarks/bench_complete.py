@@ -0,0 +1,65 @@
+"""Latency of /api/portfolio/complete against a fake backend with injected latency.
+
+    cd backend && python -m benchmarks.bench_complete [--iterations 20]
+
+Runs with the snapshot cache disabled so every request hits the (fake) database,
+and compares the concurrent endpoint with loading the sections one by one.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+import server
+from benchmarks.fakes import install_fake_mongo
+
+SECTION_LATENCY = {
+    "personal_info": 0.040,
+    "education": 0.030,
+    "experience": 0.050,
+    "projects": 0.080,
+    "skills": 0.060,
+}
+
+
+async def sequential_sections():
+    await server.load_personal_info()
+    await server.load_education()
+    await server.load_experience()
+    await server.load_projects()
+    await server.load_skills()
+
+
+async def main(iterations: int):
+    install_fake_mongo(server, SECTION_LATENCY)
+    server.portfolio_cache.max_entries = 0
+
+    sequential = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await sequential_sections()
+        sequential.append(time.perf_counter() - started)
+
+    concurrent = []
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            # identity encoding: measure the fan-out, not per-request compression
+            response = await client.get("/api/portfolio/complete", headers={"Accept-Encoding": "identity"})
+            concurrent.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    print(f"sum of section latencies: {sum(SECTION_LATENCY.values()) * 1000:7.1f} ms")
+    print(f"slowest section:          {max(SECTION_LATENCY.values()) * 1000:7.1f} ms")
+    print(f"sequential (median):      {statistics.median(sequential) * 1000:7.1f} ms")
+    print(f"/portfolio/complete:      {statistics.median(concurrent) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
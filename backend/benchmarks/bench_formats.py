@@ -0,0 +1,103 @@
+"""Size and encode/decode time of each response format.
+
+    cd backend && python -m benchmarks.bench_formats [--projects 100000] [--repeat 3]
+
+Encodes the seed portfolio (every section, as /portfolio/complete returns it)
+and `--projects` synthetic projects (as /portfolio/projects returns them) in
+each format the API negotiates, and prints the body size, its gzip and brotli
+sizes, and the best of `--repeat` encode and decode times:
+
+  json              responses.encode_json (what Accept: application/json gets)
+  msgpack / cbor    responses.encode_binary, one map per row
+  ... columnar      Accept: ...; layout=columnar, field names once per list
+
+Decoding JSON leaves datetimes as ISO strings; msgpack and CBOR decode them
+to datetime objects, which is included in their decode time.
+"""
+import argparse
+import gzip
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import TypeAdapter
+
+from benchmarks.bench_validation import storage_rows
+from models import Education, Experience, PersonalInfo, Project, Skill
+from repository import build_seed_data
+from responses import BinaryFormat, brotli, cbor2, encode_binary, encode_json, msgpack, orjson
+
+SECTION_MODELS = {"education": Education, "experience": Experience, "projects": Project, "skills": Skill}
+
+
+def seed_content() -> Dict[str, Any]:
+    seed = build_seed_data()
+    content: Dict[str, Any] = {"personal_info": PersonalInfo(**seed["personal_info"][0])}
+    for section, model in SECTION_MODELS.items():
+        content[section] = TypeAdapter(List[model]).validate_python(seed[section])
+    return content
+
+
+def project_content(count: int) -> List[Project]:
+    return TypeAdapter(List[Project]).validate_python(storage_rows("Project", count))
+
+
+def formats() -> List[Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    available = [("json", encode_json, orjson.loads if orjson is not None else json.loads)]
+    for name, library, decode in (
+        ("msgpack", msgpack, lambda body: msgpack.unpackb(body, timestamp=3)),
+        ("cbor", cbor2, lambda body: cbor2.loads(body)),
+    ):
+        if library is None:
+            continue
+        for columnar in (False, True):
+            fmt = BinaryFormat(name, columnar)
+            available.append((name + (" columnar" if columnar else ""), lambda content, fmt=fmt: encode_binary(content, fmt), decode))
+    return available
+
+
+def best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1e3
+
+
+def bench(content: Any, repeat: int) -> List[Tuple[str, Dict[str, float]]]:
+    results = []
+    for name, encode, decode in formats():
+        body = encode(content)
+        results.append((name, {
+            "bytes": len(body),
+            "gzip": len(gzip.compress(body, compresslevel=9, mtime=0)),
+            "br": len(brotli.compress(body, quality=5)) if brotli is not None else None,
+            "encode": best_ms(lambda: encode(content), repeat),
+            "decode": best_ms(lambda: decode(body), repeat),
+        }))
+    return results
+
+
+def main(args) -> None:
+    datasets = [("seed /complete", seed_content())]
+    if args.projects:
+        datasets.append((f"{args.projects} projects", project_content(args.projects)))
+    for label, content in datasets:
+        print(f"{label}")
+        print(f"  {'format':<18}{'bytes':>12}{'vs json':>9}{'gzip':>12}{'br':>12}{'encode ms':>12}{'decode ms':>12}")
+        results = bench(content, args.repeat)
+        json_bytes = results[0][1]["bytes"]
+        for name, result in results:
+            br = f"{result['br']:>12}" if result["br"] is not None else f"{'-':>12}"
+            print(
+                f"  {name:<18}{result['bytes']:>12}{result['bytes'] / json_bytes:>8.0%} {result['gzip']:>11}{br}"
+                f"{result['encode']:>12.2f}{result['decode']:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100000, help="synthetic projects (0 for the seed data only)")
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,113 @@
+"""Per-row cost of validating and serializing list responses.
+
+    cd backend && python -m benchmarks.bench_validation [--rows 10,100,1000,10000,100000] [--repeat 3]
+
+For Project, Experience, Skill and ContactMessage rows as they come out of
+storage, times each way of turning them into models and the models into a
+JSON body, and prints microseconds per row (best of `--repeat`):
+
+  validate   init      [Model(**row) for row in rows] (the old loaders)
+             adapter   TypeAdapter(List[Model]).validate_python(rows) (the loaders now)
+             construct Model.model_construct(**row) (no validation, but a Python loop)
+  serialize  fastapi   returning the models with a response_model: FastAPI dumps,
+                       re-validates and JSON-encodes them
+             stdlib    json.dumps(jsonable_encoder(models)) (encode_json without orjson)
+             orjson    responses.encode_json(models)
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from models import ContactMessage, Experience, Project, Skill
+from repository import build_seed_data
+from responses import encode_json, orjson
+
+MODELS = {"Project": Project, "Experience": Experience, "Skill": Skill, "ContactMessage": ContactMessage}
+
+
+def storage_rows(name: str, count: int) -> List[dict]:
+    """`count` distinct rows shaped like the repository returns them."""
+    if name == "ContactMessage":
+        templates = [{
+            "name": "Ada Lovelace",
+            "email": "ada@example.com",
+            "subject": "Collaboration",
+            "message": "I enjoyed your portfolio and would like to talk about a project. " * 4,
+            "status": "new",
+        }]
+    else:
+        collection = {"Project": "projects", "Experience": "experience", "Skill": "skills"}[name]
+        templates = build_seed_data()[collection]
+    started = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        row = dict(templates[i % len(templates)])
+        row.update(id=str(uuid.uuid4()), created_at=started + timedelta(seconds=i), updated_at=started + timedelta(seconds=i))
+        if "order" in row:
+            row["order"] = i
+        rows.append(row)
+    return rows
+
+
+def best_per_row(fn: Callable[[], object], rows: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best / rows * 1e6
+
+
+def fastapi_body(loop, field, models) -> bytes:
+    content = loop.run_until_complete(serialize_response(field=field, response_content=models, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def bench(loop, name: str, count: int, repeat: int) -> Dict[str, float]:
+    model = MODELS[name]
+    rows = storage_rows(name, count)
+    adapter = TypeAdapter(List[model])
+    models = adapter.validate_python(rows)
+    field = create_response_field(name="response", type_=List[model])
+    results = {
+        "init": best_per_row(lambda: [model(**row) for row in rows], count, repeat),
+        "adapter": best_per_row(lambda: adapter.validate_python(rows), count, repeat),
+        "construct": best_per_row(lambda: [model.model_construct(**row) for row in rows], count, repeat),
+        "fastapi": best_per_row(lambda: fastapi_body(loop, field, models), count, repeat),
+        "stdlib": best_per_row(
+            lambda: json.dumps(jsonable_encoder(models), ensure_ascii=False, separators=(",", ":")).encode(), count, repeat
+        ),
+    }
+    if orjson is not None:
+        results["orjson"] = best_per_row(lambda: encode_json(models), count, repeat)
+    return results
+
+
+def main(args) -> None:
+    counts = [int(value) for value in args.rows.split(",")]
+    columns = ["init", "adapter", "construct", "fastapi", "stdlib", "orjson"]
+    loop = asyncio.new_event_loop()
+    print("us/row            rows " + "".join(f"{column:>10}" for column in columns))
+    for name in args.models.split(","):
+        for count in counts:
+            results = bench(loop, name, count, args.repeat)
+            cells = "".join(f"{results[column]:10.2f}" if column in results else f"{'-':>10}" for column in columns)
+            print(f"{name:<16}{count:>6} {cells}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10,100,1000,10000,100000")
+    parser.add_argument("--models", default=",".join(MODELS))
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,245 @@
+"""In-memory stand-ins for the storage backends, used by the benchmarks."""
+import asyncio
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+from models import Education, Experience, PersonalInfo, Project, Skill
+from repository import MongoRepository
+from seed_data import EDUCATION_DATA, EXPERIENCE_DATA, PERSONAL_INFO, PROJECTS_DATA, SKILLS_DATA
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(key)
+            for op, operand in condition.items():
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+                if op == "$gt" and not (value is not None and value > operand):
+                    return False
+                if op == "$lte" and not (value is not None and value <= operand):
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(
+        self,
+        docs: List[dict],
+        latency: float,
+        projection: Optional[dict] = None,
+        query: Optional[dict] = None,
+        collection: Optional["FakeCollection"] = None,
+    ):
+        self.docs = docs
+        self.latency = latency
+        self.projection = projection
+        self.query = query or {}
+        self.collection = collection
+        self.sort_keys: List[tuple] = []
+        self._limit = 0
+
+    def sort(self, key, direction=1):
+        # Accepts sort("field", -1) or sort([("a", -1), ("b", -1)]) like motor
+        keys = [(key, direction)] if isinstance(key, str) else list(key)
+        self.sort_keys = keys
+        for field, order in reversed(keys):
+            self.docs = sorted(self.docs, key=lambda d: d.get(field), reverse=order < 0)
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def batch_size(self, size: int):
+        return self
+
+    def _selected(self) -> List[dict]:
+        return self.docs[:self._limit] if self._limit else self.docs
+
+    def _project(self, doc: dict) -> dict:
+        if not self.projection:
+            return dict(doc)
+        return {key: value for key, value in doc.items() if key == "_id" or self.projection.get(key)}
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(self.latency)
+        docs = self._selected() if length is None else self._selected()[:length]
+        return [self._project(d) for d in docs]
+
+    async def explain(self) -> dict:
+        """A winning plan shaped like mongod's: an IXSCAN when one of the collection's
+        indexes has the equality fields first and then the sort keys (either direction)"""
+        equality = {key for key, value in self.query.items() if key != "$or" and not isinstance(value, dict)}
+        reverse = [(field, -order) for field, order in self.sort_keys]
+        for name, (keys, *_) in self.collection.indexes.items():
+            rest = keys[len(equality):]
+            if {field for field, _ in keys[:len(equality)]} == equality and rest[:len(self.sort_keys)] in (self.sort_keys, reverse):
+                return _plan({"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": name}})
+        scan = {"stage": "COLLSCAN"}
+        return _plan({"stage": "SORT", "inputStage": scan} if self.sort_keys else scan)
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.latency)
+        for doc in self._selected():
+            yield self._project(doc)
+
+
+class FakeCollection:
+    """Just enough of motor's AsyncIOMotorCollection, with injected latency per call."""
+
+    def __init__(self, docs: Optional[List[dict]] = None, latency: float = 0.0, database=None, name: str = ""):
+        self.docs = list(docs or [])
+        self.latency = latency
+        self.database = database
+        self.name = name
+        self.calls = 0
+        self.indexes: Dict[str, tuple] = {}  # name -> (keys, unique, partial filter)
+
+    def _match(self, query: Optional[dict]) -> List[dict]:
+        return [d for d in self.docs if _matches(d, query or {})]
+
+    def find(self, query: Optional[dict] = None, projection: Optional[dict] = None):
+        self.calls += 1
+        return FakeCursor(self._match(query), self.latency, projection, query, self)
+
+    async def find_one(self, query: Optional[dict] = None):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        docs = self._match(query)
+        return dict(docs[0]) if docs else None
+
+    async def insert_one(self, doc: dict):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(dict(doc))
+        return type("InsertOneResult", (), {"inserted_id": doc["_id"]})()
+
+    async def insert_many(self, docs: List[dict], ordered: bool = True):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+            self.docs.append(dict(doc))
+        return type("InsertManyResult", (), {"inserted_ids": [doc["_id"] for doc in docs]})()
+
+    async def bulk_write(self, operations, ordered: bool = True):
+        """UpdateOne operations only ($set / $setOnInsert, optional upsert)"""
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        matched = upserted = 0
+        for op in operations:
+            found = self._match(op._filter)
+            if found:
+                matched += len(found[:1])
+                found[0].update(op._doc.get("$set", {}))
+            elif op._upsert:
+                upserted += 1
+                doc = {**op._filter, **op._doc.get("$setOnInsert", {}), **op._doc.get("$set", {})}
+                doc.setdefault("_id", ObjectId())
+                self.docs.append(doc)
+        return type("BulkWriteResult", (), {"matched_count": matched, "upserted_count": upserted})()
+
+    async def find_one_and_update(self, query: dict, update: dict, upsert: bool = False, return_document=False):
+        """$inc only; returns the document after the update"""
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        found = self._match(query)
+        if not found:
+            found = [dict(query)]
+            self.docs.append(found[0])
+        for field, amount in update.get("$inc", {}).items():
+            found[0][field] = found[0].get(field, 0) + amount
+        return dict(found[0])
+
+    async def create_indexes(self, indexes):
+        self.calls += 1
+        for index in indexes:
+            document = index.document
+            spec = (list(document["key"].items()), bool(document.get("unique")), document.get("partialFilterExpression"))
+            existing = self.indexes.get(index.document["name"])
+            if existing is not None and existing != spec:
+                raise OperationFailure(f"An existing index has the same name as the requested index: {index.document['name']}", 86)
+            self.indexes[index.document["name"]] = spec
+        return [index.document["name"] for index in indexes]
+
+    async def drop_index(self, name: str):
+        self.calls += 1
+        if self.indexes.pop(name, None) is None:
+            raise OperationFailure(f"index not found with name [{name}]", 27)
+
+    async def drop(self):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        self.docs = []
+
+    async def rename(self, new_name: str, dropTarget: bool = False):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        target = self.database[new_name]
+        target.docs, self.docs = self.docs, []
+        target.indexes, self.indexes = self.indexes, {}
+        del self.database[self.name]
+
+    async def delete_many(self, query: dict):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        keep = [d for d in self.docs if d not in self._match(query)]
+        deleted = len(self.docs) - len(keep)
+        self.docs = keep
+        return type("DeleteResult", (), {"deleted_count": deleted})()
+
+
+def _plan(winning_plan: dict) -> dict:
+    return {"queryPlanner": {"winningPlan": winning_plan}}
+
+
+def seed_docs() -> Dict[str, List[dict]]:
+    """Seed data as stored documents, keyed by collection name."""
+    def docs(rows, model):
+        return [dict(model(**row).model_dump(), _id=ObjectId()) for row in rows]
+
+    return {
+        "personal_info": docs([PERSONAL_INFO], PersonalInfo),
+        "education": docs(EDUCATION_DATA, Education),
+        "experience": docs(EXPERIENCE_DATA, Experience),
+        "projects": docs(PROJECTS_DATA, Project),
+        "skills": docs(SKILLS_DATA, Skill),
+    }
+
+
+class FakeDatabase(dict):
+    """Collections by name, created on first access like a motor database."""
+
+    def __init__(self, latency: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.latency = latency or {}
+
+    async def command(self, name: str):
+        await asyncio.sleep(self.latency.get("command", 0.0))
+        return {"ok": 1.0}
+
+    def __missing__(self, name: str) -> FakeCollection:
+        base = name.split("__")[0]
+        collection = self[name] = FakeCollection(latency=self.latency.get(base, 0.0), database=self, name=name)
+        return collection
+
+
+def install_fake_mongo(server, latency: Optional[Dict[str, float]] = None) -> FakeDatabase:
+    """Point the server's repository at a fake Mongo database holding the seed data."""
+    collections = FakeDatabase(latency)
+    for name, docs in seed_docs().items():
+        collections[name].docs = docs
+    server.repository = MongoRepository(collections)
+    server.portfolio_cache.invalidate()
+    return collections
@@ -0,0 +1,96 @@
+"""Cold-start budget check: how long `import server` takes, and what it pulls in.
+
+    cd backend && python -m benchmarks.importtime [--budget-ms 800] [--runs 5] [--top 15]
+
+Runs `python -X importtime -c "import server"` in fresh interpreters. The
+median cumulative time is compared against the budget. A set of modules that
+must never load at import is also checked (database clients, HTTP clients and
+the heavy data libraries); those belong in the lifespan hook or the code path
+that needs them. Exits 1 when either check fails, so CI can run it.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Loaded only by the backend, feature or script that needs them
+FORBIDDEN_AT_IMPORT = ("supabase", "motor", "pymongo", "bson", "requests", "httpx", "pandas", "numpy", "boto3", "PIL")
+
+
+def profile_import(module: str = "server") -> List[Tuple[int, int, str]]:
+    """One fresh interpreter's importtime rows: (self us, cumulative us, indented module name)."""
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def subtree(rows: List[Tuple[int, int, str]], module: str) -> List[Tuple[int, int, str]]:
+    """The rows `import module` caused (children are printed before their parent),
+    leaving out whatever the interpreter imported at startup."""
+    end = next(i for i, (_, _, name) in enumerate(rows) if name == " " + module)
+    start = end
+    while start > 0 and rows[start - 1][2].startswith("   "):
+        start -= 1
+    return rows[start:end + 1]
+
+
+def heaviest(rows: List[Tuple[int, int, str]], top: int) -> List[Tuple[int, str]]:
+    """Modules imported directly by the profiled module, by cumulative time."""
+    return sorted(
+        ((cumulative, name.strip()) for _, cumulative, name in rows if name.startswith("   ") and name[3] != " "),
+        reverse=True,
+    )[:top]
+
+
+def main(args) -> int:
+    profile_import(args.module)  # first run writes bytecode caches; don't count it
+    totals: List[int] = []
+    last: List[Tuple[int, int, str]] = []
+    for _ in range(args.runs):
+        last = subtree(profile_import(args.module), args.module)
+        totals.append(last[-1][1])
+    median_ms = statistics.median(totals) / 1000
+
+    loaded = {name.strip().split(".")[0] for _, _, name in last}
+    forbidden = [name for name in FORBIDDEN_AT_IMPORT if name in loaded]
+
+    print(f"import {args.module}: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print("\nheaviest direct imports:")
+    for cumulative, name in heaviest(last, args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if median_ms > args.budget_ms:
+        print(f"\nFAIL: over budget by {median_ms - args.budget_ms:.1f} ms")
+        failed = True
+    if forbidden:
+        print(f"\nFAIL: imported at module load: {', '.join(forbidden)}")
+        failed = True
+    if not failed:
+        print("\nOK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="server")
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("IMPORT_BUDGET_MS", "800")))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    sys.exit(main(parser.parse_args()))
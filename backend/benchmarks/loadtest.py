@@ -0,0 +1,313 @@
+"""Offline load test: every endpoint, against each backend, at several dataset sizes
+and concurrency levels. No network or database needed.
+
+    cd backend && python -m benchmarks.loadtest \\
+        [--backends memory,mongo,supabase] [--projects 5,1000,100000] \\
+        [--concurrency 1,16,64] [--requests 200] [--endpoints complete,search,...] \\
+        [--no-cache] [--output results.json] [--compare baseline.json]
+
+Backends: `memory` (MemoryRepository), `mongo` (MongoRepository over the in-memory
+fake in benchmarks/fakes.py) and `supabase` (SupabaseRepository over the stub
+PostgREST in benchmarks/stub_postgrest.py). `server:app` is driven in process
+through httpx's ASGI transport. Every scenario starts from a fresh copy of the
+dataset. Reported per scenario: p50/p95/p99 latency, RPS, status counts and the
+process's peak RSS. `--output` writes everything as JSON, and `--compare` diffs a
+run against an earlier file.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import cycle
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("PORTFOLIO_BACKEND", "memory")
+# Every request comes from one client, which the per-client limits would throttle
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+import server
+from benchmarks.fakes import FakeDatabase, seed_docs
+from benchmarks.stub_postgrest import StubPostgREST
+from executor import BlockingExecutor
+from repository import MemoryRepository, MongoRepository, SupabaseRepository
+
+Body = Optional[Callable[[int], object]]
+
+
+def _contact(i: int) -> dict:
+    return {"name": f"Load {i}", "email": "load@example.com", "subject": "Load test", "message": f"Message {i}"}
+
+
+def _bulk(i: int) -> list:
+    return [
+        {
+            "title": f"Bulk project {i}-{j}",
+            "description": "Created by the load test",
+            "long_description": "Created by the load test",
+            "tech": ["Python"],
+            "category": "AI/ML",
+            "featured": False,
+            "github": f"https://github.com/example/bulk-{i}-{j}",
+            "image": "https://example.com/image.png",
+            "status": "completed",
+            "highlights": [],
+            "order": 100000 + j,
+        }
+        for j in range(10)
+    ]
+
+
+# name -> (method, path, body factory taking the request number)
+SCENARIOS: Dict[str, Tuple[str, str, Body]] = {
+    "personal": ("GET", "/api/portfolio/personal", None),
+    "education": ("GET", "/api/portfolio/education", None),
+    "experience": ("GET", "/api/portfolio/experience", None),
+    "projects": ("GET", "/api/portfolio/projects", None),
+    "projects_category": ("GET", "/api/portfolio/projects?category=AI/ML", None),
+    "projects_featured": ("GET", "/api/portfolio/projects/featured", None),
+    "projects_card": ("GET", "/api/portfolio/projects?view=card", None),
+    "skills": ("GET", "/api/portfolio/skills", None),
+    "complete": ("GET", "/api/portfolio/complete", None),
+    "search": ("GET", "/api/portfolio/search?q=learn", None),
+    "contact": ("POST", "/api/contact", _contact),
+    "contact_messages": ("GET", "/api/contact/messages?limit=100", None),
+    "projects_bulk": ("POST", "/api/portfolio/projects/bulk", _bulk),
+    "seed": ("POST", "/api/admin/seed", None),
+}
+
+
+def make_dataset(projects: int) -> Dict[str, List[dict]]:
+    """Seed data with the projects cycled (titles, links and order made unique) up to `projects` rows."""
+    data = {name: [{k: v for k, v in doc.items() if k != "_id"} for doc in docs] for name, docs in seed_docs().items()}
+    seed_projects = data["projects"]
+    rows = []
+    for i, template in zip(range(projects), cycle(seed_projects)):
+        row = dict(template)
+        if i >= len(seed_projects):
+            row.update(
+                id=f"{template['id']}-{i}",
+                title=f"{template['title']} #{i}",
+                github=f"{template['github']}-{i}",
+                featured=i % 10 == 0,
+                order=i + 1,
+            )
+        rows.append(row)
+    data["projects"] = rows
+    return data
+
+
+class Backend:
+    """Installs a fresh copy of the dataset as `server.repository` for each scenario."""
+
+    def __init__(self, name: str, data: Dict[str, List[dict]]):
+        self.name = name
+        self.data = data
+        self.stub: Optional[StubPostgREST] = None
+        self.executor: Optional[BlockingExecutor] = None
+        if name == "supabase":
+            from supabase import create_client
+
+            self.stub = StubPostgREST().start()
+            self.executor = BlockingExecutor(max_workers=int(os.environ.get("SUPABASE_MAX_CONCURRENCY", "8")), name="supabase")
+            self.client = create_client(self.stub.url, "stub-service-role-key")
+            self.encoded = {name: jsonable_encoder(rows) for name, rows in data.items()}
+
+    def install(self) -> None:
+        if self.name == "memory":
+            server.repository = MemoryRepository(self.data, writable=True)
+        elif self.name == "mongo":
+            database = FakeDatabase()
+            for collection, rows in self.data.items():
+                database[collection].docs = [dict(row, _id=row["id"]) for row in rows]
+            server.repository = MongoRepository(database)
+        elif self.name == "supabase":
+            self.stub.tables = {name: [dict(row) for row in rows] for name, rows in self.encoded.items()}
+            server.repository = SupabaseRepository(self.client, self.executor)
+        else:
+            raise ValueError(f"Unknown backend '{self.name}'")
+        server.portfolio_cache.invalidate()
+        server.portfolio_search.invalidate()
+
+    def close(self) -> None:
+        if self.stub is not None:
+            self.stub.stop()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(pct / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def run_scenario(client: httpx.AsyncClient, endpoint: str, requests: int, concurrency: int, warmup: int) -> dict:
+    method, path, body = SCENARIOS[endpoint]
+
+    async def call(i: int) -> Tuple[float, int]:
+        started = time.perf_counter()
+        response = await client.request(method, path, json=body(i) if body else None)
+        await response.aread()
+        return time.perf_counter() - started, response.status_code
+
+    for i in range(warmup):
+        await call(-1 - i)
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    next_request = iter(range(requests))
+
+    async def worker():
+        for i in next_request:
+            seconds, status = await call(i)
+            latencies.append(seconds)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return {
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": round(wall, 4),
+        "rps": round(requests / wall, 1) if wall else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+            "max": ms(latencies[-1]) if latencies else 0.0,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _key(result: dict) -> Tuple:
+    return result["backend"], result["projects"], result["concurrency"], result["endpoint"]
+
+
+def compare(results: List[dict], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {_key(result): result for result in json.load(f)["results"]}
+    print(f"\nvs {baseline_path}")
+    print(f"{'backend':9} {'projects':>8} {'conc':>4} {'endpoint':18} {'p50 ms':>16} {'p95 ms':>16} {'rps':>16}")
+    for result in results:
+        old = baseline.get(_key(result))
+        if old is None:
+            continue
+
+        def delta(new_value, old_value):
+            if not old_value:
+                return f"{new_value:>9}"
+            return f"{new_value:>9} {100 * (new_value - old_value) / old_value:+5.0f}%"
+
+        print(
+            f"{result['backend']:9} {result['projects']:>8} {result['concurrency']:>4} {result['endpoint']:18} "
+            f"{delta(result['latency_ms']['p50'], old['latency_ms']['p50']):>16} "
+            f"{delta(result['latency_ms']['p95'], old['latency_ms']['p95']):>16} "
+            f"{delta(result['rps'], old['rps']):>16}"
+        )
+
+
+async def main(args) -> dict:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.no_cache:
+        server.portfolio_cache.max_entries = 0
+
+    results = []
+    print(f"{'backend':9} {'projects':>8} {'conc':>4} {'endpoint':18} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>9} {'err':>5} {'rss MB':>7}")
+    for backend_name in args.backends:
+        for projects in args.projects:
+            backend = Backend(backend_name, make_dataset(projects))
+            try:
+                transport = httpx.ASGITransport(app=server.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+                    for concurrency in args.concurrency:
+                        for endpoint in args.endpoints:
+                            backend.install()
+                            result = await run_scenario(client, endpoint, args.requests, concurrency, args.warmup)
+                            result = {"backend": backend_name, "projects": projects, "concurrency": concurrency, "endpoint": endpoint, **result}
+                            results.append(result)
+                            latency = result["latency_ms"]
+                            print(
+                                f"{backend_name:9} {projects:>8} {concurrency:>4} {endpoint:18} "
+                                f"{latency['p50']:>9} {latency['p95']:>9} {latency['p99']:>9} "
+                                f"{result['rps']:>9} {result['errors']:>5} {result['peak_rss_mb']:>7}"
+                            )
+            finally:
+                backend.close()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cache": not args.no_cache,
+            "requests": args.requests,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return report
+
+
+def _csv(cast):
+    return lambda value: [cast(part) for part in value.split(",") if part]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", type=_csv(str), default=["memory", "mongo", "supabase"])
+    parser.add_argument("--projects", type=_csv(int), default=[5, 1000])
+    parser.add_argument("--concurrency", type=_csv(int), default=[1, 16])
+    parser.add_argument("--endpoints", type=_csv(str), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests before each scenario")
+    parser.add_argument("--no-cache", action="store_true", help="disable the snapshot cache")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="diff against an earlier --output file")
+    args = parser.parse_args()
+    unknown = set(args.endpoints) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))} (choose from {', '.join(SCENARIOS)})")
+    asyncio.run(main(args))
@@ -0,0 +1,115 @@
+"""A tiny GitHub REST stand-in for exercising github_sync.py offline.
+
+Point the sync at it with GITHUB_API_URL=<stub.url>, or run this file to serve a
+generated account until interrupted:
+
+    python benchmarks/stub_github.py --repos 250
+"""
+import argparse
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+def make_repos(count: int, owner: str = "octocat") -> List[dict]:
+    topics = [["nlp"], ["react", "web"], ["docker", "api"], ["pytorch"], []]
+    return [
+        {
+            "id": i,
+            "name": f"repo-{i}",
+            "owner": {"login": owner},
+            "description": f"Example repository {i}",
+            "html_url": f"https://github.com/{owner}/repo-{i}",
+            "homepage": None,
+            "topics": topics[i % len(topics)],
+            "language": "Python" if i % 2 else "JavaScript",
+            "stargazers_count": i * 3,
+            "forks_count": i,
+            "fork": i % 10 == 9,
+        }
+        for i in range(count)
+    ]
+
+
+class StubGitHub:
+    """Serves /users/<name>/repos with per_page/page pagination, Link headers and
+    ETag / If-None-Match, counting full responses and 304s separately."""
+
+    def __init__(self, repos: Optional[List[dict]] = None):
+        self.repos = list(repos or [])
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubGitHub":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                per_page = int(query.get("per_page", ["30"])[0])
+                page = int(query.get("page", ["1"])[0])
+                with stub._lock:
+                    stub.requests += 1
+                    repos = stub.repos[(page - 1) * per_page:page * per_page]
+                    has_next = page * per_page < len(stub.repos)
+                body = json.dumps(repos).encode()
+                etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("X-RateLimit-Remaining", "59")
+                if has_next:
+                    self.send_header("Link", f'<{stub.url}{parts.path}?per_page={per_page}&page={page + 1}>; rel="next"')
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=30)
+    args = parser.parse_args()
+    with StubGitHub(make_repos(args.repos)) as stub:
+        print(f"GITHUB_API_URL={stub.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
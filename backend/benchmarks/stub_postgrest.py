@@ -0,0 +1,200 @@
+"""A tiny threaded PostgREST stand-in for exercising the Supabase code paths offline."""
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+# Columns PostgREST would fill from the table defaults in supabase_schema.sql
+_DEFAULTS = {"contact_messages": {"status": "new"}}
+
+
+def _coerce(value: str):
+    if value in ("true", "false"):
+        return value == "true"
+    return value.strip('"')
+
+
+def _split_top_level(expr: str) -> List[str]:
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in expr:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    return parts + [current] if current else parts
+
+
+def _condition(row: dict, column: str, op: str, operand: str) -> bool:
+    value, operand = row.get(column), _coerce(operand)
+    if op == "eq":
+        return value == operand
+    if op == "lt":
+        return value is not None and str(value) < str(operand)
+    raise ValueError(f"stub PostgREST does not support operator {op}")
+
+
+def _logic(row: dict, expr: str) -> bool:
+    """Evaluate an or=(...) / and(...) filter body against a row."""
+    if expr.startswith(("and(", "or(")):
+        name, _, inner = expr.partition("(")
+        results = [_logic(row, part) for part in _split_top_level(inner[:-1])]
+        return all(results) if name == "and" else any(results)
+    column, op, operand = expr.split(".", 2)
+    return _condition(row, column, op, operand)
+
+
+class StubPostgREST:
+    """Serves /rest/v1/<table> from in-memory rows, sleeping `delay` per request.
+
+    Records the peak number of requests handled at once, which is how the load
+    benchmarks show whether callers overlap or serialise.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[dict]]] = None, delay: float = 0.0):
+        self.tables = {name: list(rows) for name, rows in (tables or {}).items()}
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubPostgREST":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _enter(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def select(self, table: str, params: List[tuple]) -> List[dict]:
+        rows = list(self.tables.get(table, []))
+        limit = None
+        columns = None
+        for key, value in params:
+            if key == "order":
+                # "a.desc,b.desc": apply the least significant key first (stable sort)
+                for term in reversed(value.split(",")):
+                    column, _, direction = term.partition(".")
+                    rows.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=direction.startswith("desc"))
+            elif key == "limit":
+                limit = int(value)
+            elif key == "select":
+                columns = None if value == "*" else value.split(",")
+            elif key == "offset":
+                continue
+            elif key in ("or", "and"):
+                rows = [r for r in rows if _logic(r, f"{key}{value}")]
+            else:
+                op, _, operand = value.partition(".")
+                rows = [r for r in rows if _condition(r, key, op, operand)]
+        rows = rows if limit is None else rows[:limit]
+        if columns:
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+        return rows
+
+    @staticmethod
+    def _fill(table: str, payload) -> List[dict]:
+        now = datetime.now(timezone.utc).isoformat()
+        created = []
+        for row in payload if isinstance(payload, list) else [payload]:
+            row = {**_DEFAULTS.get(table, {}), **row}
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault("created_at", now)
+            row.setdefault("updated_at", now)
+            created.append(row)
+        return created
+
+    def insert(self, table: str, payload) -> List[dict]:
+        created = self._fill(table, payload)
+        with self._lock:
+            self.tables.setdefault(table, []).extend(created)
+        return created
+
+    def rpc(self, function: str, params: dict):
+        """replace_portfolio_table from supabase_schema.sql"""
+        if function != "replace_portfolio_table":
+            raise ValueError(f"stub PostgREST does not support rpc {function}")
+        rows = self._fill(params["target"], params["rows"])
+        with self._lock:
+            self.tables[params["target"]] = rows
+        return len(rows)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _table(self) -> tuple:
+                parts = urlsplit(self.path)
+                return parts.path.rsplit("/", 1)[-1], parse_qsl(parts.query)
+
+            def do_GET(self):
+                stub._enter()
+                try:
+                    time.sleep(stub.delay)
+                    table, params = self._table()
+                    self._reply(200, stub.select(table, params))
+                finally:
+                    stub._leave()
+
+            def do_POST(self):
+                stub._enter()
+                try:
+                    time.sleep(stub.delay)
+                    table, _ = self._table()
+                    length = int(self.headers.get("Content-Length") or 0)
+                    payload = json.loads(self.rfile.read(length) or b"[]")
+                    if "/rpc/" in self.path:
+                        self._reply(200, stub.rpc(table, payload))
+                    else:
+                        self._reply(201, stub.insert(table, payload))
+                finally:
+                    stub._leave()
+
+        return Handler
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Set by each load for the loads nested inside it; a nested load that falls
+# back to a stale value flags it, so the outer value isn't stored as fresh
+_stale_flag: ContextVar[Optional[List[bool]]] = ContextVar("snapshot_cache_stale", default=None)
+
+
+class SnapshotCache:
+    """Versioned in-memory cache for read-mostly portfolio data.
+
+    Keys are tuples whose first element is the collection name (or a tuple of
+    collection names the value depends on), so writes to one collection only
+    drop the snapshots built from it. Invalidation bumps a version
+    counter (global or per collection); a load that started before the bump is
+    never stored.
+
+    With `stale_if_error`, a load that fails with an error the predicate accepts
+    returns the last value successfully loaded for the key instead, even if it
+    has since expired or been invalidated (the last-known-good snapshot).
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_entries: int = 256,
+        stale_if_error: Optional[Callable[[BaseException], bool]] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_if_error = stale_if_error
+        self.version = 0
+        self._collection_versions: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, Tuple, Any]]" = OrderedDict()
+        self._last_good: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._inflight: Dict[Tuple, "asyncio.Task"] = {}
+        # Told about every invalidation and patch (collection, or None for everything)
+        self.on_change: Optional[Callable[[Optional[str]], None]] = None
+
+    async def get_or_load(
+        self,
+        key: Tuple[Hashable, ...],
+        loader: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return the cached value for `key`, loading it on a miss.
+
+        `cacheable` can veto storing a loaded value (it is still returned).
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, version, value = entry
+            if version == self._version_of(key) and (self.ttl <= 0 or time.monotonic() < expires_at):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        # Coalesce concurrent misses for the same key into a single load. The load
+        # runs as its own task so a cancelled or timed-out caller can't abort it.
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, self._version_of(key), loader, cacheable))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Tuple, version: Tuple, loader, cacheable) -> Any:
+        parent = _stale_flag.get()
+        stale = [False]
+        _stale_flag.set(stale)
+        try:
+            try:
+                value = await loader()
+            except Exception as e:
+                if self.stale_if_error is None or key not in self._last_good or not self.stale_if_error(e):
+                    raise
+                self.stale_served += 1
+                stale[0] = True
+                value = self._last_good[key]
+            if stale[0]:
+                if parent is not None:
+                    parent[0] = True
+            elif version == self._version_of(key) and (cacheable is None or cacheable(value)):
+                self._store(key, version, value)
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def _version_of(self, key: Tuple) -> Tuple:
+        return (self.version,) + tuple(self._collection_versions.get(c, 0) for c in _collections(key))
+
+    def _store(self, key: Tuple, version: Tuple, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.stale_if_error is not None:
+            self._last_good[key] = value
+            self._last_good.move_to_end(key)
+            while len(self._last_good) > self.max_entries:
+                self._last_good.popitem(last=False)
+
+    def invalidate(self, collection: Optional[str] = None) -> None:
+        """Drop cached snapshots for one collection, or everything if none given."""
+        if self.on_change is not None:
+            self.on_change(collection)
+        if collection is None:
+            self.version += 1
+            self._entries.clear()
+            self._inflight.clear()
+            return
+        self._collection_versions[collection] = self._collection_versions.get(collection, 0) + 1
+        for key in [k for k in self._entries if collection in _collections(k)]:
+            del self._entries[key]
+        for key in [k for k in self._inflight if collection in _collections(k)]:
+            del self._inflight[key]
+
+    def patch(self, collection: str, update: Callable[[Tuple, Any], Any]) -> None:
+        """Apply a change to `collection` to its cached snapshots in place of dropping them.
+
+        `update(key, value)` returns the new value, or None to drop the entry.
+        Loads already in flight are discarded as with `invalidate`, since they
+        may have read the data from before the change.
+        """
+        if self.on_change is not None:
+            self.on_change(collection)
+        self._collection_versions[collection] = self._collection_versions.get(collection, 0) + 1
+        for key in [k for k in self._inflight if collection in _collections(k)]:
+            del self._inflight[key]
+        for key in [k for k in self._entries if collection in _collections(k)]:
+            expires_at, _, value = self._entries[key]
+            value = update(key, value)
+            if value is None:
+                del self._entries[key]
+                continue
+            self._entries[key] = (expires_at, self._version_of(key), value)
+            if key in self._last_good:
+                self._last_good[key] = value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "collection_versions": dict(self._collection_versions),
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+        }
+
+
+def _collections(key: Tuple) -> Tuple:
+    return key[0] if isinstance(key[0], tuple) else (key[0],)
+
+
+def _consume_exception(task: "asyncio.Task") -> None:
+    # Failures are re-raised to every waiter; this only silences the
+    # "exception was never retrieved" warning when all waiters went away.
+    if not task.cancelled():
+        task.exception()
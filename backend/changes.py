@@ -0,0 +1,226 @@
+"""Change feeds from the database, applied to the in-process snapshots as they happen.
+
+A source yields ChangeEvents: a Mongo change stream (needs a replica set), a
+Postgres LISTEN channel fed by the triggers in supabase_schema.sql, or a queue
+that tests and benchmarks push events into. ChangeWatcher consumes one source
+and hands events to a callback in batches, reconnecting with backoff.
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from repository import PORTFOLIO_COLLECTIONS
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "portfolio_changes"
+
+
+class ChangeEvent(NamedTuple):
+    collection: str
+    op: str  # "upsert", "delete", or "reset" (anything could have changed: reload it)
+    id: Optional[str] = None
+    document: Optional[dict] = None  # the row after an upsert, id included; None if unknown
+
+
+class ChangeSource:
+    async def stream(self, connected: Callable[[bool], None]) -> AsyncIterator[ChangeEvent]:
+        """Yield events as they happen. `connected(resumed)` is called once the
+        feed is open; `resumed` means no event since the last stream was missed."""
+        raise NotImplementedError
+        yield
+
+
+def mongo_event(change: dict, collections: Sequence[str] = PORTFOLIO_COLLECTIONS) -> List[ChangeEvent]:
+    """Translate one change stream document into ChangeEvents."""
+    op = change.get("operationType")
+    collection = change.get("ns", {}).get("coll")
+    if op in ("insert", "update", "replace"):
+        document = change.get("fullDocument")
+        if document is None:
+            # updateLookup found nothing: deleted again before the lookup ran
+            return [ChangeEvent(collection, "delete", str(change["documentKey"]["_id"]))]
+        document = dict(document)
+        document["id"] = str(document.pop("_id"))
+        return [ChangeEvent(collection, "upsert", document["id"], document)]
+    if op == "delete":
+        return [ChangeEvent(collection, "delete", str(change["documentKey"]["_id"]))]
+    if op == "rename":
+        # The seed swaps a shadow collection in with renameCollection
+        target = change.get("to", {}).get("coll")
+        return [ChangeEvent(name, "reset") for name in (collection, target) if name in collections]
+    if op in ("drop", "dropDatabase", "invalidate"):
+        return [ChangeEvent(name, "reset") for name in ([collection] if collection in collections else collections)]
+    return []
+
+
+class MongoChangeSource(ChangeSource):
+    """Database-level change stream over the portfolio collections, resumed from
+    the last token after a reconnect so no event in between is lost."""
+
+    def __init__(self, db, collections: Sequence[str] = PORTFOLIO_COLLECTIONS):
+        self.db = db
+        self.collections = list(collections)
+        self.resume_token = None
+
+    async def stream(self, connected: Callable[[bool], None]) -> AsyncIterator[ChangeEvent]:
+        pipeline = [{"$match": {"$or": [
+            {"ns.coll": {"$in": self.collections}},
+            {"to.coll": {"$in": self.collections}},
+            {"operationType": {"$in": ["dropDatabase", "invalidate"]}},
+        ]}}]
+        async with self.db.watch(pipeline, full_document="updateLookup", resume_after=self.resume_token) as changes:
+            connected(self.resume_token is not None)
+            async for change in changes:
+                self.resume_token = changes.resume_token
+                for event in mongo_event(change, self.collections):
+                    yield event
+                if change.get("operationType") == "invalidate":
+                    self.resume_token = None  # an invalidated stream can't be resumed
+                    return
+
+
+def notify_event(payload: str) -> List[ChangeEvent]:
+    """Translate one `portfolio_changes` NOTIFY payload (see supabase_schema.sql)."""
+    message = json.loads(payload)
+    table, op = message["table"], message["op"]
+    if op == "TRUNCATE":
+        return [ChangeEvent(table, "reset")]
+    if op == "DELETE":
+        return [ChangeEvent(table, "delete", str(message["id"]))]
+    # Rows too large for a NOTIFY payload arrive without `row`
+    return [ChangeEvent(table, "upsert", str(message["id"]), message.get("row"))]
+
+
+class PostgresNotifySource(ChangeSource):
+    """LISTEN on the Supabase database itself (PostgREST has no change feed).
+    Needs a direct Postgres connection string and the optional `asyncpg` package."""
+
+    def __init__(self, dsn: str, channel: str = NOTIFY_CHANNEL):
+        self.dsn = dsn
+        self.channel = channel
+
+    async def stream(self, connected: Callable[[bool], None]) -> AsyncIterator[ChangeEvent]:
+        import asyncpg
+
+        payloads: asyncio.Queue = asyncio.Queue()
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            await connection.add_listener(self.channel, lambda _conn, _pid, _channel, payload: payloads.put_nowait(payload))
+            connection.add_termination_listener(lambda _conn: payloads.put_nowait(None))
+            connected(False)  # NOTIFY is fire-and-forget: whatever was sent while away is gone
+            while True:
+                payload = await payloads.get()
+                if payload is None:
+                    raise ConnectionError("Postgres LISTEN connection closed")
+                for event in notify_event(payload):
+                    yield event
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+
+
+class QueueChangeSource(ChangeSource):
+    """Events pushed in by hand: the fake source for tests and benchmarks."""
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def push(self, event: ChangeEvent) -> None:
+        self.queue.put_nowait(event)
+
+    async def stream(self, connected: Callable[[bool], None]) -> AsyncIterator[ChangeEvent]:
+        connected(False)
+        while True:
+            event = await self.queue.get()
+            if isinstance(event, BaseException):
+                raise event  # lets a test simulate a dropped connection
+            yield event
+
+
+class ChangeWatcher:
+    """Feeds `source` events to `apply` in batches: whatever arrived while the
+    previous batch was being applied, up to `max_batch`.
+
+    `reset` is called each time the feed opens without resuming, since changes
+    made before it opened were never seen; the first time that drops whatever
+    was loaded before the watcher started. When the stream fails it reconnects
+    with backoff.
+    """
+
+    def __init__(
+        self,
+        source: ChangeSource,
+        apply: Callable[[List[ChangeEvent]], None],
+        reset: Callable[[], None],
+        max_batch: int = 500,
+    ):
+        self.source = source
+        self.apply = apply
+        self.reset = reset
+        self.max_batch = max_batch
+        self.applied = 0
+        self.batches = 0
+        self.reconnects = 0
+        self.resets = 0
+        self.last_error: Optional[str] = None
+        self.connected = asyncio.Event()
+        self._backoff = 0.0
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self._consume()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+            self.connected.clear()
+            self.reconnects += 1
+            self._backoff = min(max(self._backoff * 2, 0.5), 60.0)
+            logger.warning("Change stream closed, reconnecting in %.1fs: %s", self._backoff, self.last_error)
+            await asyncio.sleep(self._backoff)
+
+    def _connected(self, resumed: bool) -> None:
+        if not resumed:
+            self.resets += 1
+            self.reset()
+        self._backoff = 0.0
+        self.connected.set()
+
+    async def _consume(self) -> None:
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def pump():
+            async for event in self.source.stream(self._connected):
+                events.put_nowait(event)
+
+        producer = asyncio.create_task(pump())
+        try:
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait({next_event, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_event.done():
+                    next_event.cancel()
+                    producer.result()  # raises the stream's error
+                    raise ConnectionError("Change stream ended")
+                batch = [next_event.result()]
+                while not events.empty() and len(batch) < self.max_batch:
+                    batch.append(events.get_nowait())
+                self.apply(batch)
+                self.applied += len(batch)
+                self.batches += 1
+        finally:
+            producer.cancel()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "source": type(self.source).__name__,
+            "applied": self.applied,
+            "batches": self.batches,
+            "connected": self.connected.is_set(),
+            "reconnects": self.reconnects,
+            "resets": self.resets,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class ContactWriteQueue:
+    """Write-behind queue for contact messages.
+
+    `submit` journals a message and returns at once. A background task writes
+    queued messages through `writer` in batches of up to `batch_size`, as soon
+    as a batch fills or `flush_interval` seconds after the first message. At
+    `max_depth` pending messages `submit` raises QueueFullError.
+
+    The journal is append-only NDJSON: an `add` record per accepted message and
+    a `done` record per written batch. On start, every `add` without a `done`
+    is queued again, so a crash or restart loses nothing (a replayed batch may
+    repeat a write, which is why `writer` must be idempotent on `id`).
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[dict]], Awaitable[int]],
+        journal_path: Path,
+        max_depth: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        fsync: bool = False,
+        compact_bytes: int = 1024 * 1024,
+        load: Optional[Callable[[dict], dict]] = None,
+    ):
+        self.writer = writer
+        self.journal_path = Path(journal_path)
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.compact_bytes = compact_bytes
+        self.load = load or (lambda raw: raw)  # journal JSON -> message dict
+        self._pending: "OrderedDict[str, dict]" = OrderedDict()
+        self._journal = None
+        self._arrived = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> int:
+        """Replay the journal and start flushing; returns how many messages were recovered."""
+        recovered = self._replay()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if recovered:
+            self._arrived.set()
+        self._task = asyncio.create_task(self._run())
+        return recovered
+
+    def submit(self, message: dict) -> None:
+        if len(self._pending) >= self.max_depth:
+            raise QueueFullError(f"Contact queue is full ({self.max_depth} messages pending)")
+        self._append({"op": "add", "message": jsonable_encoder(message)})
+        self._pending[message["id"]] = message
+        self._arrived.set()
+        if len(self._pending) >= self.batch_size:
+            self._full.set()
+
+    async def flush(self) -> int:
+        """Write one batch now; returns how many messages it covered."""
+        batch = list(self._pending.values())[:self.batch_size]
+        if not batch:
+            return 0
+        await self.writer(batch)
+        ids = [message["id"] for message in batch]
+        self._append({"op": "done", "ids": ids})
+        for message_id in ids:
+            self._pending.pop(message_id, None)
+        self.written += len(batch)
+        if not self._pending or self.journal_path.stat().st_size > self.compact_bytes:
+            self._compact()
+        return len(batch)
+
+    async def _run(self) -> None:
+        backoff = 0.0
+        while True:
+            await self._arrived.wait()
+            # Give a partial batch until flush_interval to fill up
+            if len(self._pending) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+            try:
+                await self.flush()
+                backoff = 0.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the batch queued (and journaled) and retry with backoff
+                self.failures += 1
+                self.last_error = str(e)
+                backoff = min(max(backoff * 2, 0.5), 30.0)
+                logger.warning("Contact queue flush failed, retrying in %.1fs: %s", backoff, e)
+                await asyncio.sleep(backoff)
+            if not self._pending:
+                self._arrived.clear()
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Stop the flusher and try to drain; whatever is left stays journaled for next start."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        deadline = time.monotonic() + timeout
+        try:
+            while self._pending and time.monotonic() < deadline:
+                await asyncio.wait_for(self.flush(), max(deadline - time.monotonic(), 0.01))
+        except Exception as e:
+            logger.warning("Contact queue could not drain on shutdown (%d journaled): %s", len(self._pending), e)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "depth": len(self._pending),
+            "max_depth": self.max_depth,
+            "written": self.written,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+    def _append(self, record: dict) -> None:
+        self._journal.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _replay(self) -> int:
+        if not self.journal_path.exists():
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            return 0
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a torn last line from a crash mid-write
+                if record.get("op") == "add":
+                    message = self.load(record["message"])
+                    self._pending[message["id"]] = message
+                elif record.get("op") == "done":
+                    for message_id in record["ids"]:
+                        self._pending.pop(message_id, None)
+        self._compact()
+        return len(self._pending)
+
+    def _compact(self) -> None:
+        """Rewrite the journal as just the pending `add` records."""
+        tmp = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for message in self._pending.values():
+                f.write(json.dumps({"op": "add", "message": jsonable_encoder(message)}, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        reopen = self._journal is not None
+        if reopen:
+            self._journal.close()
+        os.replace(tmp, self.journal_path)
+        if reopen:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
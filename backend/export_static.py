@@ -0,0 +1,166 @@
+"""Pre-render every read endpoint to static JSON for CDN hosting.
+
+    python export_static.py [--out ../frontend/public/static-api] [--source api|seed|<dir>] [--keep 3]
+
+Each endpoint is requested once from `server:app` in process, so the files are
+byte-identical to what the API serves. They are written under a content-hashed
+version directory next to gzip and brotli copies. A `manifest.json` maps each
+endpoint path to its file. Point the frontend at it with
+`REACT_APP_STATIC_API=true`; only `/contact` still needs the live API.
+
+Responsive `image_srcset`s are only exported when PORTFOLIO_IMAGE_BASE_URL is an
+absolute URL of an API that serves /api/images.
+
+`--source api` uses whatever backend the server is configured with (.env). `seed`
+or a `frontend/src/data`-style directory exports from the in-memory backend.
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import quote, unquote
+
+try:
+    import brotli
+except ImportError:  # optional: gzip copies only
+    brotli = None
+
+DEFAULT_OUT = Path(__file__).resolve().parent.parent / "frontend" / "public" / "static-api"
+MANIFEST = "manifest.json"
+
+# Read endpoints that don't depend on the data; per-category project lists are added from it
+STATIC_ENDPOINTS = (
+    "/portfolio/personal",
+    "/portfolio/education",
+    "/portfolio/experience",
+    "/portfolio/projects",
+    "/portfolio/projects/featured",
+    "/portfolio/skills",
+    "/portfolio/complete",
+)
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "uncategorized"
+
+
+def _file_for(endpoint: str) -> str:
+    path, _, query = endpoint.partition("?category=")
+    if query:
+        return f"{path.lstrip('/')}/category/{_slug(unquote(query))}.json"
+    return f"{path.lstrip('/')}.json"
+
+
+async def render_endpoints() -> Dict[str, bytes]:
+    """GET every read endpoint from the app; {endpoint path: JSON body}."""
+    import httpx
+
+    import server
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if server.image_service is not None and not server.image_service.base_url.startswith(("http://", "https://")):
+        # Relative /api/images URLs would 404 on a static host, and a failing <source> hides the <img>
+        print("exporting without image_srcset: set PORTFOLIO_IMAGE_BASE_URL to the API's absolute URL to keep it", file=sys.stderr)
+        server.image_service = None
+    server.open_repository()
+    bodies: Dict[str, bytes] = {}
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://export") as client:
+        async def get(endpoint: str) -> bytes:
+            response = await client.get("/api" + endpoint, headers={"Accept-Encoding": "identity"})
+            if response.status_code != 200:
+                raise RuntimeError(f"GET /api{endpoint} returned {response.status_code}: {response.text[:200]}")
+            return response.content
+
+        for endpoint in await read_endpoints(client):
+            bodies[endpoint] = await get(endpoint)
+    return bodies
+
+
+async def read_endpoints(client) -> List[str]:
+    """STATIC_ENDPOINTS plus one project list per category found in the data."""
+    response = await client.get("/api/portfolio/projects", headers={"Accept-Encoding": "identity"})
+    if response.status_code != 200:
+        raise RuntimeError(f"GET /api/portfolio/projects returned {response.status_code}: {response.text[:200]}")
+    categories = sorted({project["category"] for project in response.json()})
+    return list(STATIC_ENDPOINTS) + [f"/portfolio/projects?category={quote(category, safe='')}" for category in categories]
+
+
+def write_export(bodies: Dict[str, bytes], out: Path, keep: int = 3) -> dict:
+    """Write a versioned export plus the manifest; prune all but the newest `keep` versions."""
+    digest = hashlib.sha256()
+    for endpoint in sorted(bodies):
+        digest.update(endpoint.encode() + b"\0" + bodies[endpoint] + b"\0")
+    version = digest.hexdigest()[:12]
+    version_dir = out / version
+
+    files = {}
+    for endpoint, body in sorted(bodies.items()):
+        relative = _file_for(endpoint)
+        target = version_dir / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"file": f"{version}/{relative}", "etag": '"' + hashlib.sha256(body).hexdigest()[:32] + '"', "bytes": len(body)}
+        variants: List[Tuple[str, bytes]] = [("", body), (".gz", gzip.compress(body, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            # Build time, so the slowest/smallest setting is fine here
+            variants.append((".br", brotli.compress(body, quality=11)))
+        for suffix, data in variants:
+            target.with_name(target.name + suffix).write_bytes(data)
+            if suffix:
+                entry[f"{suffix[1:]}_bytes"] = len(data)
+        files[endpoint] = entry
+
+    manifest = {
+        "version": version,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "files": files,
+    }
+    # The manifest is the only unversioned file; replace it atomically so a
+    # reader never sees it pointing at a half-written version
+    tmp = out / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, out / MANIFEST)
+
+    versions = sorted(
+        (path for path in out.iterdir() if path.is_dir() and re.fullmatch(r"[0-9a-f]{12}", path.name)),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for stale in [path for path in versions if path != version_dir][max(keep - 1, 0):]:
+        shutil.rmtree(stale)
+    return manifest
+
+
+def _main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--source", default="api", help="api (configured backend), seed, or a data directory")
+    parser.add_argument("--keep", type=int, default=3, help="export versions to keep, including this one")
+    args = parser.parse_args()
+
+    if args.source != "api":
+        os.environ["PORTFOLIO_BACKEND"] = "memory"
+        os.environ["PORTFOLIO_MEMORY_SOURCE"] = args.source
+    try:
+        bodies = asyncio.run(render_endpoints())
+    except RuntimeError as e:
+        print(f"export failed: {e}", file=sys.stderr)
+        return 1
+    args.out.mkdir(parents=True, exist_ok=True)
+    manifest = write_export(bodies, args.out, args.keep)
+    total = sum(entry["bytes"] for entry in manifest["files"].values())
+    print(f"exported {len(manifest['files'])} endpoints ({total} bytes) as version {manifest['version']} to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,247 @@
+"""Backend health probing and read failover across repositories."""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from repository import InsertResult, Keyset, PortfolioRepository
+
+logger = logging.getLogger(__name__)
+
+# Preference order when choosing where to read
+_RANK = {"up": 0, "slow": 1, "down": 2}
+
+
+class BackendHealth:
+    """Rolling health of one backend, fed by probes and by real reads."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latency_ms: Optional[float] = None  # last successful round trip
+        self.ewma_ms: Optional[float] = None
+        self.failures = 0  # consecutive
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[str] = None
+        self.last_failure_at = 0.0  # monotonic
+
+    def record_success(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.latency_ms = round(ms, 3)
+        self.ewma_ms = round(ms if self.ewma_ms is None else 0.8 * self.ewma_ms + 0.2 * ms, 3)
+        self.failures = 0
+        self.last_error = None
+        self.last_checked = datetime.now(timezone.utc).isoformat()
+
+    def record_failure(self, error: BaseException) -> None:
+        self.failures += 1
+        self.last_error = str(error) or type(error).__name__
+        self.last_checked = datetime.now(timezone.utc).isoformat()
+        self.last_failure_at = time.monotonic()
+
+    def as_dict(self, status: str) -> Dict[str, Any]:
+        return {
+            "status": status,
+            "latency_ms": self.latency_ms,
+            "ewma_ms": self.ewma_ms,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_checked": self.last_checked,
+        }
+
+
+class HealthMonitor:
+    """Probes every watched backend with `ping()` every `interval` seconds.
+
+    A backend is `down` after `failure_threshold` consecutive failures (probes
+    or reads), `slow` while its latency average is above `slow_ms`, else `up`.
+    A down backend becomes eligible again `retry_after` seconds after its last
+    failure, so one request can find out it has recovered.
+    """
+
+    def __init__(
+        self,
+        interval: float = 15.0,
+        timeout: float = 2.0,
+        failure_threshold: int = 2,
+        slow_ms: float = 500.0,
+        retry_after: float = 30.0,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.slow_ms = slow_ms
+        self.retry_after = retry_after
+        self.repositories: List[PortfolioRepository] = []
+        self.health: Dict[str, BackendHealth] = {}
+
+    def watch(self, repositories: Sequence[PortfolioRepository]) -> None:
+        self.repositories = list(repositories)
+        self.health = {repository.name: BackendHealth(repository.name) for repository in repositories}
+
+    def _health(self, name: str) -> BackendHealth:
+        if name not in self.health:
+            self.health[name] = BackendHealth(name)
+        return self.health[name]
+
+    def status(self, name: str) -> str:
+        health = self._health(name)
+        if health.failures >= self.failure_threshold:
+            return "down"
+        if health.ewma_ms is not None and health.ewma_ms > self.slow_ms:
+            return "slow"
+        return "up"
+
+    def rank(self, name: str) -> int:
+        status = self.status(name)
+        if status == "down" and time.monotonic() - self._health(name).last_failure_at >= self.retry_after:
+            return _RANK["slow"]  # half-open: worth one more try
+        return _RANK[status]
+
+    def record_success(self, name: str, seconds: float) -> None:
+        self._health(name).record_success(seconds)
+
+    def record_failure(self, name: str, error: BaseException) -> None:
+        health = self._health(name)
+        was_down = self.status(name) == "down"
+        health.record_failure(error)
+        if not was_down and self.status(name) == "down":
+            logger.warning("Backend %s is down: %s", name, health.last_error)
+
+    async def probe(self, repository: PortfolioRepository) -> str:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(repository.ping(), self.timeout)
+        except Exception as e:
+            self.record_failure(repository.name, e)
+        else:
+            self.record_success(repository.name, time.perf_counter() - started)
+        return self.status(repository.name)
+
+    async def probe_all(self) -> Dict[str, Dict[str, Any]]:
+        await asyncio.gather(*(self.probe(repository) for repository in self.repositories))
+        return self.report()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {name: health.as_dict(self.status(name)) for name, health in self.health.items()}
+
+    async def run_forever(self) -> None:
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.interval)
+
+
+class FailoverRepository(PortfolioRepository):
+    """Reads from the healthiest of `repositories` (the first is the primary),
+    moving on to the next when one fails or takes longer than `read_timeout`.
+
+    Writes only ever go to the primary: writing to a fallback would leave the
+    backends holding different data.
+    """
+
+    def __init__(self, repositories: Sequence[PortfolioRepository], monitor: HealthMonitor, read_timeout: float = 5.0):
+        self.repositories = list(repositories)
+        self.primary = self.repositories[0]
+        self.monitor = monitor
+        self.read_timeout = read_timeout
+        self.name = self.primary.name
+        self.read_only = self.primary.read_only
+        self.failovers = 0
+
+    def _candidates(self) -> List[PortfolioRepository]:
+        # sorted() is stable, so equally healthy backends keep the configured order
+        return sorted(self.repositories, key=lambda repository: self.monitor.rank(repository.name))
+
+    async def _read(self, method: str, *args, **kwargs) -> Any:
+        error: Optional[BaseException] = None
+        for repository in self._candidates():
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(getattr(repository, method)(*args, **kwargs), self.read_timeout)
+            except Exception as e:
+                self.monitor.record_failure(repository.name, e)
+                error = e
+                continue
+            self.monitor.record_success(repository.name, time.perf_counter() - started)
+            if repository is not self.primary:
+                self.failovers += 1
+            return result
+        raise error
+
+    async def ping(self) -> None:
+        await self.primary.ping()
+
+    async def get_personal_info(self) -> Optional[dict]:
+        return await self._read("get_personal_info")
+
+    async def list_education(self) -> List[dict]:
+        return await self._read("list_education")
+
+    async def list_experience(self, fields: Optional[Sequence[str]] = None) -> List[dict]:
+        return await self._read("list_experience", fields)
+
+    async def list_projects(
+        self, category: Optional[str] = None, featured_only: bool = False, fields: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        return await self._read("list_projects", category, featured_only, fields)
+
+    async def list_skills(self) -> List[dict]:
+        return await self._read("list_skills")
+
+    async def list_contact_messages(
+        self, limit: int = 100, after: Optional[Keyset] = None, status: Optional[str] = None
+    ) -> List[dict]:
+        if after is not None:
+            # A cursor was built from the primary's ids and order; another backend would page wrongly
+            return await self.primary.list_contact_messages(limit, after, status)
+        return await self._read("list_contact_messages", limit, after, status)
+
+    async def list_status_checks(self, limit: int = 100, after: Optional[Keyset] = None) -> List[dict]:
+        if after is not None:
+            return await self.primary.list_status_checks(limit, after)
+        return await self._read("list_status_checks", limit, after)
+
+    async def iter_contact_messages(self, status: Optional[str] = None, page_size: int = 500) -> AsyncIterator[dict]:
+        # One backend for the whole export; keyset cursors don't carry across backends
+        async for row in self.primary.iter_contact_messages(status, page_size):
+            yield row
+
+    async def iter_status_checks(self, page_size: int = 500) -> AsyncIterator[dict]:
+        async for row in self.primary.iter_status_checks(page_size):
+            yield row
+
+    async def insert_projects(self, projects: List[dict]) -> List[InsertResult]:
+        return await self.primary.insert_projects(projects)
+
+    async def upsert_projects(self, projects: List[dict], key: str, insert_only: Sequence[str] = ()) -> Dict[str, int]:
+        return await self.primary.upsert_projects(projects, key, insert_only)
+
+    async def insert_contact_message(self, message: dict) -> dict:
+        return await self.primary.insert_contact_message(message)
+
+    async def insert_contact_messages(self, messages: List[dict]) -> int:
+        return await self.primary.insert_contact_messages(messages)
+
+    async def insert_status_check(self, status: dict) -> dict:
+        return await self.primary.insert_status_check(status)
+
+    async def replace_all(self, data: Dict[str, List[dict]]) -> Dict[str, dict]:
+        return await self.primary.replace_all(data)
+
+    # Versions are per backend, so the change log is only ever read from the primary
+
+    async def change_log_bounds(self) -> Tuple[int, int]:
+        return await self.primary.change_log_bounds()
+
+    async def list_changes(self, since: int, limit: int = 500) -> List[dict]:
+        return await self.primary.list_changes(since, limit)
+
+    async def get_rows(self, collection: str, ids: Sequence[str]) -> List[dict]:
+        return await self.primary.get_rows(collection, ids)
+
+    async def prune_changes(self, before: datetime) -> int:
+        return await self.primary.prune_changes(before)
+
+    async def close(self) -> None:
+        for repository in self.repositories:
+            await repository.close()
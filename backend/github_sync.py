@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from executor import BlockingExecutor
+from models import Project
+from repository import PortfolioRepository
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Same defaults as frontend/src/components/Projects.js
+DEFAULT_EXCLUDED_REPOS = ("nlpmini", "agenthacks", "agentmodules", "rohanchavan0701", "portfolio")
+
+# Imported rows carry `owner/name` here: the upsert key, and what tells them apart
+# from hand-written projects (which the sync never touches, even on the same URL)
+SYNC_KEY = "github_repo"
+
+# Written on every sync; everything else (featured, image, order, status) is only
+# set when a repo is first imported, so curating those by hand sticks
+SYNCED_FIELDS = ("title", "description", "long_description", "tech", "category", "github", "demo", "highlights", "updated_at", SYNC_KEY)
+
+
+def repo_key(name: str) -> str:
+    """Normalise a repo name for the exclude list: lowercase, no spaces/hyphens/underscores"""
+    return re.sub(r"[\s\-_]", "", (name or "").lower())
+
+
+def repo_path(url: str) -> str:
+    """`owner/name` of a repository URL, lowercase (GitHub names are case-insensitive)"""
+    return urlsplit(url).path.strip("/").lower()
+
+
+def infer_category(repo: dict) -> str:
+    """Port of inferCategory() in the frontend's Projects.js"""
+    topics = [topic.lower() for topic in repo.get("topics") or []]
+
+    def has(keyword: str) -> bool:
+        return any(keyword in topic for topic in topics)
+
+    if has("nlp"):
+        return "NLP"
+    if has("vision") or has("cv"):
+        return "Computer Vision"
+    if has("devops") or has("api"):
+        return "DevOps/API"
+    if has("safety"):
+        return "AI Safety"
+    if has("fullstack") or has("full-stack") or has("react") or has("web"):
+        return "Full-Stack"
+    return "AI/ML"  # the frontend's python/ml/ai check lands here too
+
+
+def repo_to_project(repo: dict, order: int, username: str) -> Project:
+    """Port of mapRepoToProjectCreate() in the frontend's Projects.js"""
+    owner = (repo.get("owner") or {}).get("login") or username
+    name = repo.get("name") or ""
+    topics = repo.get("topics") or []
+    tech = list(topics) if topics else [repo["language"]] if repo.get("language") else ["GitHub"]
+    return Project(
+        title=re.sub(r"[-_]", " ", name) or "GitHub Project",
+        description=repo.get("description") or "Repository hosted on GitHub",
+        long_description=repo.get("description") or "Imported from GitHub.",
+        tech=tech,
+        category=infer_category(repo),
+        featured=False,
+        github=repo["html_url"],
+        demo=repo.get("homepage") or None,
+        image=f"https://opengraph.githubassets.com/1/{owner}/{name}",
+        status="completed",
+        highlights=[
+            f"Stars: {repo.get('stargazers_count') or 0}",
+            f"Forks: {repo.get('forks_count') or 0}",
+            f"Language: {repo.get('language') or 'N/A'}",
+        ],
+        order=order,
+    )
+
+
+class GitHubSync:
+    """Pulls a user's public repos and upserts them as projects.
+
+    Every page is fetched with `If-None-Match` and its last ETag, so an
+    unchanged account costs one 304 per page (which GitHub does not count
+    against the rate limit) and no database writes.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        api_url: str = GITHUB_API_URL,
+        token: Optional[str] = None,
+        exclude: Iterable[str] = DEFAULT_EXCLUDED_REPOS,
+        timeout: float = 10.0,
+        executor: Optional[BlockingExecutor] = None,
+    ):
+        self.username = username
+        self.api_url = api_url.rstrip("/")
+        self.exclude = {repo_key(name) for name in exclude}
+        self.timeout = timeout
+        # requests is blocking; one worker keeps the session single-threaded
+        self.executor = executor or BlockingExecutor(max_workers=1, name="github")
+        import requests  # only when a sync is configured; it's a noticeable share of startup
+
+        self.session = requests.Session()
+        self.session.headers["Accept"] = "application/vnd.github+json"
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self._pages: Dict[str, Tuple[str, list, Optional[str]]] = {}  # url -> (etag, repos, next url)
+        self.rate_limit_remaining: Optional[str] = None
+        self.last_result: Optional[dict] = None
+
+    def fetch_repos(self) -> Tuple[List[dict], bool]:
+        """All repos (following Link: rel=next) and whether any page changed."""
+        url = f"{self.api_url}/users/{self.username}/repos?per_page=100&sort=updated"
+        repos: List[dict] = []
+        changed = False
+        seen = set()
+        while url and url not in seen:
+            seen.add(url)
+            headers = {}
+            cached = self._pages.get(url)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            self.rate_limit_remaining = response.headers.get("X-RateLimit-Remaining", self.rate_limit_remaining)
+            if response.status_code == 304 and cached:
+                # A 304 may omit Link, so the next page comes from the cache too
+                _, page, next_url = cached
+            else:
+                response.raise_for_status()
+                page = response.json()
+                next_url = response.links.get("next", {}).get("url")
+                changed = True
+                etag = response.headers.get("ETag")
+                if etag:
+                    self._pages[url] = (etag, page, next_url)
+                else:
+                    self._pages.pop(url, None)
+            repos.extend(page)
+            url = next_url
+        return repos, changed
+
+    def to_projects(self, repos: List[dict]) -> List[Project]:
+        kept = [repo for repo in repos if not repo.get("fork") and repo_key(repo.get("name")) not in self.exclude]
+        return [repo_to_project(repo, order, self.username) for order, repo in enumerate(kept, start=1)]
+
+    async def sync(self, repository: PortfolioRepository, force: bool = False) -> dict:
+        """Fetch and upsert; a no-op (`changed: False`) when GitHub answered 304 throughout."""
+        started = time.perf_counter()
+        repos, changed = await self.executor.run(self.fetch_repos)
+        result = {"changed": changed or force, "repos": len(repos), "created": 0, "updated": 0}
+        if changed or force:
+            projects = self.to_projects(repos)
+            # `order` is insert-only: new repos go after everything already listed
+            existing = await repository.list_projects(None, False, ("id", "github", SYNC_KEY, "order"))
+            synced = {row[SYNC_KEY] for row in existing if row.get(SYNC_KEY)}
+            curated = {row.get("github") for row in existing if not row.get(SYNC_KEY)}
+            next_order = max((row.get("order") or 0 for row in existing), default=0)
+            docs = []
+            for project in projects:
+                doc = project.dict()
+                doc[SYNC_KEY] = repo_path(doc["github"])
+                if doc[SYNC_KEY] not in synced:
+                    if doc["github"] in curated:
+                        result["skipped"] = result.get("skipped", 0) + 1  # already listed by hand
+                        continue
+                    next_order += 1
+                    doc["order"] = next_order
+                doc["updated_at"] = datetime.utcnow()
+                docs.append(doc)
+            insert_only = [name for name in docs[0] if name not in SYNCED_FIELDS] if docs else []
+            try:
+                result.update(await repository.upsert_projects(docs, SYNC_KEY, insert_only))
+            except Exception:
+                # Forget the ETags, or the next round would get 304s and never retry the write
+                self._pages.clear()
+                raise
+            result["projects"] = len(projects)
+        result["rate_limit_remaining"] = self.rate_limit_remaining
+        result["seconds"] = round(time.perf_counter() - started, 4)
+        self.last_result = result
+        return result
+
+    async def run_forever(self, repository: PortfolioRepository, interval: float, on_change: Callable[[dict], Any]) -> None:
+        """Sync every `interval` seconds until cancelled; failures are logged and retried next round."""
+        while True:
+            try:
+                result = await self.sync(repository)
+                if result["changed"]:
+                    on_change(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("GitHub sync failed: %s", e)
+                self.last_result = {"changed": False, "error": str(e)}
+            await asyncio.sleep(interval)
+
+    def close(self) -> None:
+        self.session.close()
+        self.executor.shutdown()
@@ -0,0 +1,178 @@
+"""Abuse guards for the write endpoints: token-bucket rate limiting, a duplicate
+submission window and single-flight coalescing."""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+
+class RateLimitRule(NamedTuple):
+    rate: float  # tokens refilled per second
+    burst: int  # bucket capacity
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimitRule":
+        """'5/minute', '10/second', '100/hour', optionally with a burst: '5/minute;burst=10'"""
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(second|minute|hour)\s*(?:;\s*burst\s*=\s*(\d+))?\s*", spec)
+        if not match:
+            raise ValueError(f"Invalid rate limit '{spec}' (expected e.g. '5/minute' or '5/minute;burst=10')")
+        count, unit, burst = match.groups()
+        seconds = {"second": 1, "minute": 60, "hour": 3600}[unit]
+        return cls(rate=int(count) / seconds, burst=int(burst or count))
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds until a token is available (0 when allowed)
+
+
+class BucketStore:
+    """Where token buckets live. The in-memory store is per process; a shared
+    store makes the limit hold across workers."""
+
+    async def take(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        raise NotImplementedError
+
+
+def _refill(tokens: float, updated: float, now: float, rule: RateLimitRule) -> float:
+    return min(rule.burst, tokens + (now - updated) * rule.rate)
+
+
+class MemoryBucketStore(BucketStore):
+    """Buckets in a dict, least recently used dropped past `max_keys` (a dropped
+    bucket was idle, so it would have refilled anyway)."""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (rule.burst, now))
+        tokens = _refill(tokens, updated, now, rule)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        retry_after = 0.0 if allowed else (1 - tokens) / rule.rate
+        return RateLimitResult(allowed, int(tokens), retry_after)
+
+
+# KEYS[1] bucket; ARGV: rate, burst, now. Refill and take atomically on the server.
+_REDIS_TAKE = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore(BucketStore):
+    """Buckets shared by every worker through Redis (needs the optional `redis` package)."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(_REDIS_TAKE)
+
+    async def take(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        allowed, tokens = await self._take(keys=[self.prefix + key], args=[rule.rate, rule.burst, time.time()])
+        tokens = float(tokens)
+        retry_after = 0.0 if allowed else (1 - tokens) / rule.rate
+        return RateLimitResult(bool(allowed), int(tokens), retry_after)
+
+
+class RateLimiter:
+    """Token buckets per (rule name, client)."""
+
+    def __init__(self, store: BucketStore, rules: Dict[str, RateLimitRule]):
+        self.store = store
+        self.rules = rules
+
+    async def check(self, name: str, client: str) -> Optional[RateLimitResult]:
+        rule = self.rules.get(name)
+        if rule is None:
+            return None
+        return await self.store.take(f"{name}:{client}", rule)
+
+
+class DedupWindow:
+    """Remembers a result per content hash for `ttl` seconds, so an identical
+    resubmission can be answered without doing the work again."""
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def key(content: dict) -> str:
+        """Hash of the content with string fields trimmed and case-folded"""
+        normalised = {
+            name: " ".join(value.split()).casefold() if isinstance(value, str) else value
+            for name, value in content.items()
+        }
+        return hashlib.sha256(json.dumps(normalised, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SingleFlight:
+    """Runs at most one `fn()` at a time; callers arriving while it runs share its result."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """(result, whether this call joined one already in flight)"""
+        joined = self._task is not None
+        if not joined:
+            self._task = asyncio.ensure_future(fn())
+            self._task.add_done_callback(self._finished)
+        # shield: a caller that disconnects must not cancel the shared work
+        return await asyncio.shield(self._task), joined
+
+    def _finished(self, task: "asyncio.Task") -> None:
+        if self._task is task:
+            self._task = None
+        if not task.cancelled():
+            task.exception()  # retrieved here so a failure with no waiters isn't logged as unhandled
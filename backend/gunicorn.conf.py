@@ -0,0 +1,58 @@
+"""Multi-worker deployment: `gunicorn -c gunicorn.conf.py server:app`
+
+WEB_CONCURRENCY uvicorn workers (default: one per CPU). With more than one, a
+snapshot publisher process runs next to them (see snapshot.py), so the
+/portfolio reads are rendered once and read from shared memory by every
+worker instead of each worker keeping its own copy and its own database reads.
+"""
+import fcntl
+import multiprocessing
+import os
+from pathlib import Path
+
+from snapshot import PublisherProcess, default_directory
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Workers import the app after forking, so no database client is shared across a fork
+preload_app = False
+graceful_timeout = 30
+keepalive = 5
+
+SHARED_SNAPSHOT = workers > 1 and os.environ.get("PORTFOLIO_SHARED_SNAPSHOT_ENABLED", "true").lower() in ("1", "true", "yes")
+SNAPSHOT_DIR = Path(os.environ.get("PORTFOLIO_SHARED_SNAPSHOT_DIR", str(default_directory())))
+publisher = PublisherProcess(SNAPSHOT_DIR, float(os.environ.get("PORTFOLIO_SHARED_SNAPSHOT_INTERVAL", "60")))
+
+if SHARED_SNAPSHOT:
+    os.environ["PORTFOLIO_SHARED_SNAPSHOT"] = str(SNAPSHOT_DIR)  # inherited by the workers
+else:
+    os.environ.pop("PORTFOLIO_SHARED_SNAPSHOT", None)
+
+
+def when_ready(server):
+    if SHARED_SNAPSHOT:
+        publisher.start()
+
+
+def on_exit(server):
+    publisher.stop()
+
+
+def post_fork(server, worker):
+    # One contact journal per worker: slots are claimed with a lock held for the
+    # worker's life, so a replacement worker takes over (and replays) a dead one's
+    base = os.environ.get("CONTACT_JOURNAL_PATH", str(BACKEND_DIR / "contact_journal.ndjson"))
+    for slot in range(workers * 2):
+        lock = open(f"{base}.{slot}.lock", "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            continue
+        worker.journal_lock = lock
+        os.environ["CONTACT_JOURNAL_PATH"] = f"{base}.{slot}"
+        return
+    server.log.warning("No free contact journal slot for worker %s; sharing %s", worker.pid, base)
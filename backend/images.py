@@ -0,0 +1,492 @@
+"""Resized WebP/AVIF/JPEG derivatives of project images and logos.
+
+    python images.py warm [--source api|seed|<dir>] [--widths 320,640] [--formats webp,avif]
+
+Sources are files under the frontend's public directory (`/images/projects/x.jpeg`,
+`/logos/y.png`) or https images on an allow-listed host (GitHub's OpenGraph
+cards, Unsplash); redirects are only followed to allow-listed hosts. Remote
+originals are downloaded once and kept on disk.
+
+A derivative is named after the SHA-256 of its source's bytes plus the width,
+format and quality, so the URL handed out in `image_srcset` changes whenever the
+source does and can be served as immutable. Derivatives live in a disk cache
+capped at a byte budget; the least recently used are evicted first.
+
+`warm` renders every derivative of every project image and public image
+at deploy time, so the first visitors don't pay for the resizing.
+"""
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import quote, urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+# Pillow is optional and heavy, so it's only imported when an image is decoded
+PILLOW_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+DEFAULT_ROOT = BACKEND_DIR.parent / "frontend" / "public"
+DEFAULT_WIDTHS = (160, 320, 480, 640, 960, 1280)
+DEFAULT_REMOTE_HOSTS = ("opengraph.githubassets.com", "images.unsplash.com", "avatars.githubusercontent.com")
+SOURCE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp", ".avif", ".gif")
+MAX_REDIRECTS = 3
+
+# Output format -> (Pillow format name, media type)
+FORMATS = {
+    "avif": ("AVIF", "image/avif"),
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class ImageError(Exception):
+    """A request for an image that can't be served; `status` is the HTTP status to answer with."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SourceInfo(NamedTuple):
+    digest: str  # hex SHA-256 of the original's bytes (first 16 characters)
+    width: int
+    path: Path
+
+
+class Derivative(NamedTuple):
+    path: Path
+    media_type: str
+    digest: str
+
+
+def supported_formats() -> List[str]:
+    """Output formats the installed Pillow can encode, best first."""
+    if not PILLOW_AVAILABLE:
+        return []
+    from PIL import features
+
+    return [name for name in FORMATS if name == "jpeg" or features.check(name)]
+
+
+class DerivativeCache:
+    """Files in a directory, capped at `max_bytes` with least-recently-used eviction.
+
+    Recency is kept in memory and mirrored into each file's mtime, so a restart
+    (or another worker sharing the directory) rebuilds roughly the same order.
+    A file another process evicted is simply a miss.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, int]"] = None  # name -> size, oldest first
+        self._bytes = 0
+
+    def _index(self) -> "OrderedDict[str, int]":
+        if self._entries is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = [(entry.stat().st_mtime, entry.name, entry.stat().st_size) for entry in os.scandir(self.directory)
+                     if entry.is_file() and not entry.name.startswith(".")]
+            self._entries = OrderedDict((name, size) for _, name, size in sorted(files))
+            self._bytes = sum(self._entries.values())
+            self._evict()  # the budget may have shrunk since the files were written
+        return self._entries
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evicted += 1
+            try:
+                os.unlink(self.directory / oldest)
+            except FileNotFoundError:
+                pass
+
+    def get(self, name: str) -> Optional[Path]:
+        path = self.directory / name
+        with self._lock:
+            entries = self._index()
+            if name in entries:
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    self._bytes -= entries.pop(name)
+                else:
+                    entries.move_to_end(name)
+                    self.hits += 1
+                    return path
+            self.misses += 1
+            return None
+
+    def put(self, name: str, data: bytes) -> Path:
+        path = self.directory / name
+        with self._lock:
+            entries = self._index()
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._bytes += len(data) - entries.pop(name, 0)
+            entries[name] = len(data)
+            self._evict()
+        return path
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._index()
+            return {
+                "entries": len(entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted": self.evicted,
+            }
+
+
+class ImageService:
+    """Resolves image sources and renders their derivatives into a DerivativeCache.
+
+    Every method blocks (file and network IO, decoding); the server runs them on
+    a thread pool.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        cache_dir: Path,
+        max_bytes: int = 512 * 1024 * 1024,
+        widths: Sequence[int] = DEFAULT_WIDTHS,
+        formats: Optional[Sequence[str]] = None,
+        quality: int = 75,
+        remote_hosts: Iterable[str] = DEFAULT_REMOTE_HOSTS,
+        remote_ttl: float = 86400.0,
+        max_source_bytes: int = 10 * 1024 * 1024,
+        base_url: str = "",
+    ):
+        self.root = Path(root).resolve()
+        self.cache = DerivativeCache(Path(cache_dir) / "derivatives", max_bytes)
+        self.originals_dir = Path(cache_dir) / "originals"
+        self.widths = tuple(sorted(set(widths)))
+        self._requested_formats = formats
+        self._formats: Optional[Tuple[str, ...]] = None
+        self.quality = quality
+        self.remote_hosts = {host.strip().lower() for host in remote_hosts if host.strip()}
+        self.remote_ttl = remote_ttl
+        self.max_source_bytes = max_source_bytes
+        self.base_url = base_url.rstrip("/")
+        self._sources: Dict[str, Tuple[Tuple[int, int], SourceInfo]] = {}  # src -> ((mtime_ns, size), info)
+
+    @property
+    def formats(self) -> Tuple[str, ...]:
+        # Resolved on first use: asking Pillow for its codecs imports it
+        if self._formats is None:
+            available = supported_formats()
+            self._formats = tuple(name for name in (self._requested_formats or available) if name in available)
+        return self._formats
+
+    # Sources
+
+    def _local_path(self, src: str) -> Path:
+        path = (self.root / src.split("?", 1)[0].lstrip("/")).resolve()
+        if not path.is_relative_to(self.root) or path.suffix.lower() not in SOURCE_SUFFIXES:
+            raise ImageError(400, f"Not an image under the public directory: {src}")
+        if not path.is_file():
+            raise ImageError(404, f"Image not found: {src}")
+        return path
+
+    def _remote_path(self, src: str) -> Path:
+        self._check_remote(src)
+        return self.originals_dir / hashlib.sha256(src.encode()).hexdigest()[:32]
+
+    def _check_remote(self, url: str) -> None:
+        # Applied to the source and to every redirect, so an allowed host can't point the server elsewhere
+        parts = urlsplit(url)
+        if parts.scheme != "https":
+            raise ImageError(400, f"Remote images must be https: {url}")
+        if (parts.hostname or "").lower() not in self.remote_hosts:
+            raise ImageError(400, f"Remote images are only fetched from {', '.join(sorted(self.remote_hosts))}")
+
+    def _is_remote(self, src: str) -> bool:
+        return src.startswith(("http://", "https://"))
+
+    def source(self, src: str, fetch: bool = True) -> Optional[SourceInfo]:
+        """Digest and width of `src`, downloading a remote original if needed.
+
+        With `fetch=False` a remote source that isn't on disk yet returns None
+        instead of touching the network.
+        """
+        if self._is_remote(src):
+            path = self._remote_path(src)
+            if fetch:
+                self._fetch_remote(src, path)
+            elif not path.exists():
+                return None
+        else:
+            path = self._local_path(src)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        known = self._sources.get(src)
+        if known is not None and known[0] == version:
+            return known[1]
+        data = path.read_bytes()
+        info = SourceInfo(hashlib.sha256(data).hexdigest()[:16], _image_width(data, src), path)
+        self._sources[src] = (version, info)
+        return info
+
+    def known(self, src: str) -> Optional[SourceInfo]:
+        """What `source` last found for `src`, without touching the disk or network."""
+        entry = self._sources.get(src)
+        return entry[1] if entry is not None else None
+
+    def resolve(self, sources: Iterable[str]) -> bool:
+        """Look up every source already on disk (remote ones aren't fetched); True if any changed."""
+        changed = False
+        for src in sources:
+            before = self.known(src)
+            try:
+                changed |= self.source(src, fetch=False) != before
+            except (ImageError, OSError):
+                continue
+        return changed
+
+    def _fetch_remote(self, src: str, path: Path) -> None:
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            age = None
+        if age is not None and age < self.remote_ttl:
+            return
+        import httpx  # only when a remote original is missing or stale
+
+        url = src
+        try:
+            with self._http_client() as client:
+                for _ in range(MAX_REDIRECTS + 1):
+                    with client.stream("GET", url) as response:
+                        if response.is_redirect:
+                            url = str(response.url.join(response.headers["location"]))
+                            self._check_remote(url)
+                            continue
+                        response.raise_for_status()
+                        chunks, size = [], 0
+                        for chunk in response.iter_bytes():
+                            size += len(chunk)
+                            if size > self.max_source_bytes:
+                                raise ImageError(413, f"Remote image is larger than {self.max_source_bytes} bytes")
+                            chunks.append(chunk)
+                        break
+                else:
+                    raise ImageError(502, f"Too many redirects fetching {src}")
+        except httpx.HTTPError as e:
+            if age is not None:
+                return  # keep serving the copy we have
+            raise ImageError(502, f"Could not fetch {src}: {e}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"".join(chunks))
+        os.replace(tmp, path)
+
+    def _http_client(self):
+        import httpx
+
+        # Redirects are followed by hand in _fetch_remote, each one checked against the allow-list
+        return httpx.Client(follow_redirects=False, timeout=10.0)
+
+    # Derivatives
+
+    def derivative(self, src: str, width: int, fmt: str) -> Derivative:
+        """The cached derivative, rendering it on a miss."""
+        if width not in self.widths:
+            raise ImageError(400, f"Width must be one of {', '.join(map(str, self.widths))}")
+        if fmt not in self.formats:
+            raise ImageError(400, f"Format must be one of {', '.join(self.formats)}")
+        info = self.source(src)
+        name = f"{info.digest}-{width}-q{self.quality}.{fmt}"
+        path = self.cache.get(name)
+        if path is None:
+            path = self.cache.put(name, render(info.path.read_bytes(), width, fmt, self.quality))
+        return Derivative(path, FORMATS[fmt][1], info.digest)
+
+    def url(self, src: str, width: int, fmt: str, digest: Optional[str] = None) -> str:
+        url = f"{self.base_url}/api/images/{width}.{fmt}?src={quote(src, safe='/:')}"
+        return f"{url}&v={digest}" if digest else url
+
+    def srcset(self, src: Optional[str]) -> Optional[Dict[str, str]]:
+        """`{format: "url 320w, url 640w, ..."}` for an image, or None when it isn't servable yet.
+
+        Doesn't block: only sources `resolve` (or `source`) has already read
+        get one, so a remote image is left out until its original has been
+        fetched. Widths above the original's are left out too.
+        """
+        info = self.known(src) if src else None
+        if info is None or not self.formats:
+            return None
+        widths = [w for w in self.widths if not info.width or w <= info.width] or self.widths[:1]
+        return {fmt: ", ".join(f"{self.url(src, w, fmt, info.digest)} {w}w" for w in widths) for fmt in self.formats}
+
+    def warm(self, sources: Iterable[str], widths: Optional[Sequence[int]] = None,
+             formats: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """Render every derivative of `sources`; counts of what was rendered, cached or failed."""
+        counts = {"sources": 0, "rendered": 0, "cached": 0, "failed": 0}
+        for src in dict.fromkeys(sources):
+            counts["sources"] += 1
+            try:
+                info = self.source(src)
+            except ImageError as e:
+                print(f"skipped {src}: {e}", file=sys.stderr)
+                counts["failed"] += 1
+                continue
+            for fmt in formats or self.formats:
+                for width in widths or self.widths:
+                    if info.width and width > info.width and width != self.widths[0]:
+                        continue
+                    name = f"{info.digest}-{width}-q{self.quality}.{fmt}"
+                    if self.cache.get(name) is not None:
+                        counts["cached"] += 1
+                        continue
+                    try:
+                        self.derivative(src, width, fmt)
+                        counts["rendered"] += 1
+                    except ImageError as e:
+                        print(f"failed {src} at {width}.{fmt}: {e}", file=sys.stderr)
+                        counts["failed"] += 1
+        return counts
+
+    def public_images(self) -> List[str]:
+        """Every image file under the public directory, as `/path` sources."""
+        return sorted(
+            "/" + path.relative_to(self.root).as_posix()
+            for path in self.root.rglob("*")
+            if path.suffix.lower() in SOURCE_SUFFIXES and path.is_file() and "static-api" not in path.parts
+        )
+
+    def stats(self) -> dict:
+        return dict(self.cache.stats(), widths=list(self.widths), formats=list(self.formats), quality=self.quality)
+
+
+def _image_width(data: bytes, src: str) -> int:
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:  # reads the header only
+            return image.width
+    except (UnidentifiedImageError, OSError):
+        raise ImageError(415, f"Not a readable image: {src}")
+
+
+def render(data: bytes, width: int, fmt: str, quality: int) -> bytes:
+    """`data` scaled down to `width` (never up) and encoded as `fmt`."""
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.format == "JPEG":
+                image.draft("RGB", (width, image.height * width // image.width))  # decode at reduced scale
+            image = ImageOps.exif_transpose(image)
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+            if fmt == "jpeg" or not has_alpha:
+                if has_alpha:
+                    image = image.convert("RGBA")
+                    flattened = Image.new("RGB", image.size, (255, 255, 255))
+                    flattened.paste(image, mask=image.getchannel("A"))
+                    image = flattened
+                else:
+                    image = image.convert("RGB")
+            else:
+                image = image.convert("RGBA")
+            out = io.BytesIO()
+            options = {"jpeg": {"optimize": True, "progressive": True}, "webp": {"method": 4}, "avif": {"speed": 6}}[fmt]
+            image.save(out, FORMATS[fmt][0], quality=quality, **options)
+            return out.getvalue()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ImageError(415, f"Could not render image: {e}")
+
+
+def service_from_env() -> Optional[ImageService]:
+    """The service as configured by PORTFOLIO_IMAGE_* (None when disabled or Pillow is missing)."""
+    if os.environ.get("PORTFOLIO_IMAGES", "false").lower() not in ("1", "true", "yes") or not PILLOW_AVAILABLE:
+        return None
+    widths = os.environ.get("PORTFOLIO_IMAGE_WIDTHS")
+    formats = os.environ.get("PORTFOLIO_IMAGE_FORMATS")
+    hosts = os.environ.get("PORTFOLIO_IMAGE_REMOTE_HOSTS")
+    return ImageService(
+        root=Path(os.environ.get("PORTFOLIO_IMAGE_ROOT", str(DEFAULT_ROOT))),
+        cache_dir=Path(os.environ.get("PORTFOLIO_IMAGE_CACHE_DIR", str(BACKEND_DIR / "image_cache"))),
+        max_bytes=int(os.environ.get("PORTFOLIO_IMAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+        widths=[int(w) for w in widths.split(",")] if widths else DEFAULT_WIDTHS,
+        formats=[f.strip() for f in formats.split(",")] if formats else None,
+        quality=int(os.environ.get("PORTFOLIO_IMAGE_QUALITY", "75")),
+        remote_hosts=hosts.split(",") if hosts else DEFAULT_REMOTE_HOSTS,
+        remote_ttl=float(os.environ.get("PORTFOLIO_IMAGE_REMOTE_TTL", "86400")),
+        base_url=os.environ.get("PORTFOLIO_IMAGE_BASE_URL", ""),
+    )
+
+
+async def project_images() -> List[str]:
+    """The `image` of every project in the configured backend."""
+    import server
+
+    repository = server.open_repository()
+    try:
+        rows = await repository.list_projects(None, False, ("id", "image"))
+    finally:
+        await repository.close()
+    return [row["image"] for row in rows if row.get("image")]
+
+
+def _main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["warm"])
+    parser.add_argument("--source", default="api", help="api (configured backend), seed, or a data directory")
+    parser.add_argument("--widths", help="comma-separated subset of PORTFOLIO_IMAGE_WIDTHS")
+    parser.add_argument("--formats", help="comma-separated subset of the supported formats")
+    parser.add_argument("--no-public", action="store_true", help="skip the images under the public directory")
+    args = parser.parse_args()
+
+    service = service_from_env()
+    if service is None:
+        print("image derivatives are disabled (set PORTFOLIO_IMAGES=true and install Pillow)", file=sys.stderr)
+        return 1
+    if args.source != "api":
+        os.environ["PORTFOLIO_BACKEND"] = "memory"
+        os.environ["PORTFOLIO_MEMORY_SOURCE"] = args.source
+    started = time.perf_counter()
+    sources = asyncio.run(project_images()) + ([] if args.no_public else service.public_images())
+    counts = service.warm(
+        sources,
+        widths=[int(w) for w in args.widths.split(",")] if args.widths else None,
+        formats=args.formats.split(",") if args.formats else None,
+    )
+    stats = service.cache.stats()
+    print(
+        f"warmed {counts['sources']} sources in {time.perf_counter() - started:.1f}s: {counts['rendered']} rendered, "
+        f"{counts['cached']} already cached, {counts['failed']} failed ({stats['entries']} files, {stats['bytes']} bytes cached)"
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,150 @@
+"""Mongo index declarations and query-plan checks.
+
+    python indexes.py ensure    # create any missing indexes
+    python indexes.py explain   # explain() every endpoint query, flag COLLSCAN / in-memory SORT
+
+Both use MONGO_URL and DB_NAME. The Postgres equivalents live in supabase_schema.sql.
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+# Every list endpoint sorts on `order`; projects also filter on category/featured
+# (equality fields first, then the sort key). Contact messages and status checks
+# are keyset-paginated newest first.
+MONGO_INDEXES: Dict[str, List[IndexModel]] = {
+    "education": [IndexModel([("order", ASCENDING)], name="order")],
+    "experience": [IndexModel([("order", ASCENDING)], name="order")],
+    "skills": [IndexModel([("order", ASCENDING)], name="order")],
+    "projects": [
+        IndexModel([("order", ASCENDING)], name="order"),
+        IndexModel([("category", ASCENDING), ("order", ASCENDING)], name="category_order"),
+        IndexModel([("featured", ASCENDING), ("order", ASCENDING)], name="featured_order"),
+        IndexModel(
+            [("category", ASCENDING), ("featured", ASCENDING), ("order", ASCENDING)],
+            name="category_featured_order",
+        ),
+        # GitHub sync upserts match on github_repo; unique so two syncs racing on a
+        # new repo cannot both insert it. Partial: hand-written projects have no
+        # github_repo, and several of them may link the same GitHub URL
+        IndexModel(
+            [("github_repo", ASCENDING)],
+            name="github_repo_unique",
+            unique=True,
+            partialFilterExpression={"github_repo": {"$type": "string"}},
+        ),
+    ],
+    "contact_messages": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_created_at_id",
+        ),
+    ],
+    "status_checks": [IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id")],
+    # Entries are keyed by data version (_id); pruning goes by age
+    "portfolio_changes": [IndexModel([("changed_at", ASCENDING)], name="changed_at")],
+}
+
+# Indexes replaced by the ones above, dropped by ensure_mongo_indexes
+OBSOLETE_MONGO_INDEXES: Dict[str, List[str]] = {"projects": ["github", "github_unique"]}
+
+# Plan stages that mean a query is not served by an index
+PLAN_PROBLEMS = {"COLLSCAN", "SORT"}
+
+
+async def ensure_mongo_indexes(db) -> Dict[str, List[str]]:
+    """Create the declared indexes (a no-op for ones that already exist) and drop obsolete ones."""
+    for collection, names in OBSOLETE_MONGO_INDEXES.items():
+        for name in names:
+            try:
+                await db[collection].drop_index(name)
+            except OperationFailure:
+                pass  # already gone
+    created = {}
+    for collection, indexes in MONGO_INDEXES.items():
+        created[collection] = await db[collection].create_indexes(indexes)
+    return created
+
+
+def _plan_stages(plan) -> List[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for key in ("inputStage", "queryPlan", "thenStage", "elseStage"):
+            stages.extend(_plan_stages(plan.get(key)))
+        for child in plan.get("inputStages", []):
+            stages.extend(_plan_stages(child))
+    return stages
+
+
+def endpoint_queries(repository) -> Dict[str, object]:
+    """The cursor each Mongo-backed read endpoint runs, keyed by a readable label."""
+    keyset = (datetime.utcnow().isoformat(), "0" * 24)
+    return {
+        "GET /portfolio/education": repository.ordered_cursor("education"),
+        "GET /portfolio/experience": repository.ordered_cursor("experience"),
+        "GET /portfolio/skills": repository.ordered_cursor("skills"),
+        "GET /portfolio/projects": repository.ordered_cursor("projects"),
+        "GET /portfolio/projects?category=": repository.ordered_cursor("projects", repository.projects_query("AI/ML")),
+        "GET /portfolio/projects/featured": repository.ordered_cursor("projects", repository.projects_query(None, True)),
+        "GET /portfolio/projects?category=&featured_only=true": repository.ordered_cursor(
+            "projects", repository.projects_query("AI/ML", True)
+        ),
+        "GET /contact/messages": repository.contact_cursor(None, None).limit(100),
+        "GET /contact/messages?status=": repository.contact_cursor(None, "new").limit(100),
+        "GET /contact/messages?cursor=": repository.contact_cursor(keyset, None).limit(100),
+        "GET /status": repository.status_cursor(None).limit(100),
+    }
+
+
+async def explain_queries(repository) -> List[dict]:
+    """explain() every endpoint query; `problems` lists COLLSCAN / in-memory SORT stages."""
+    report = []
+    for endpoint, cursor in endpoint_queries(repository).items():
+        plan = await cursor.explain()
+        stages = _plan_stages(plan.get("queryPlanner", {}).get("winningPlan", {}))
+        report.append({
+            "endpoint": endpoint,
+            "collection": cursor.collection.name,
+            "stages": stages,
+            "problems": sorted(PLAN_PROBLEMS.intersection(stages)),
+        })
+    return report
+
+
+async def _main(command: str) -> int:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from repository import MongoRepository
+
+    load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    db = client[os.environ["DB_NAME"]]
+    try:
+        if command == "ensure":
+            for collection, names in (await ensure_mongo_indexes(db)).items():
+                print(f"{collection}: {', '.join(names)}")
+            return 0
+        failed = False
+        for entry in await explain_queries(MongoRepository(db)):
+            flag = "FAIL" if entry["problems"] else "ok"
+            failed = failed or bool(entry["problems"])
+            print(f"{flag:4}  {entry['endpoint']:55} {' <- '.join(entry['stages'])}")
+        return 1 if failed else 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in ("ensure", "explain"):
+        print(__doc__)
+        sys.exit(2)
+    sys.exit(asyncio.run(_main(sys.argv[1])))
@@ -0,0 +1,97 @@
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from models import BulkIngestResult, BulkRowResult, Project, ProjectCreate
+from repository import PortfolioRepository
+
+
+class IngestError(Exception):
+    pass
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (line number, line) from a streamed NDJSON body, skipping blank lines.
+
+    Only the current partial line is buffered, so memory stays bounded by
+    `max_line_bytes` however large the body is.
+    """
+    pending = bytearray()
+    line_no = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, rest = pending.split(b"\n")
+        pending = bytearray(rest)
+        for line in lines:
+            line_no += 1
+            if len(line) > max_line_bytes:
+                raise IngestError(f"Line {line_no} exceeds {max_line_bytes} bytes")
+            if line.strip():
+                yield line_no, bytes(line)
+        if len(pending) > max_line_bytes:
+            raise IngestError(f"Line {line_no + 1} exceeds {max_line_bytes} bytes")
+    if pending.strip():
+        yield line_no + 1, bytes(pending)
+
+
+class ProjectIngest:
+    """Validates projects one at a time and writes them in batches of `batch_size`.
+
+    `on_created` is called with the projects each batch created.
+    """
+
+    def __init__(
+        self,
+        repository: PortfolioRepository,
+        batch_size: int,
+        on_created: Optional[Callable[[List[Project]], None]] = None,
+    ):
+        self.repository = repository
+        self.batch_size = batch_size
+        self.on_created = on_created
+        self.results: List[BulkRowResult] = []
+        self._batch: List[Tuple[int, dict]] = []
+
+    @property
+    def created(self) -> int:
+        return sum(1 for result in self.results if result.status == "created")
+
+    async def add_json(self, line: int, raw: bytes) -> None:
+        try:
+            project = ProjectCreate.model_validate_json(raw)
+        except ValidationError as e:
+            self.results.append(BulkRowResult(line=line, status="invalid", error=_describe(e)))
+            return
+        await self.add(line, project)
+
+    async def add(self, line: int, project: ProjectCreate) -> None:
+        self._batch.append((line, Project(**project.dict()).dict()))
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        inserted = await self.repository.insert_projects([doc for _, doc in batch])
+        created: List[Project] = []
+        for (line, _), result in zip(batch, inserted):
+            if result.error is None:
+                self.results.append(BulkRowResult(line=line, status="created", id=str(result.row["id"])))
+                created.append(Project(**result.row))
+            else:
+                self.results.append(BulkRowResult(line=line, status="failed", error=result.error))
+        if created and self.on_created is not None:
+            self.on_created(created)
+
+    def summary(self) -> BulkIngestResult:
+        results = sorted(self.results, key=lambda result: result.line)
+        created = self.created
+        return BulkIngestResult(created=created, failed=len(results) - created, results=results)
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'body'}: {err['msg']}"
+        for err in error.errors()
+    )
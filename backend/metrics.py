@@ -0,0 +1,222 @@
+"""Request metrics: per-route latency/size histograms plus time spent in the
+database, model validation and serialization, attributed to the route that
+caused it. Rendered in the Prometheus text format by `/metrics`.
+
+Timers look up the current request through a contextvar, so outside an
+instrumented request (or with the middleware not installed) they cost one
+`ContextVar.get()`.
+"""
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, description: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # counts per bucket + [+Inf, sum]
+
+    def observe(self, label_values: Tuple[str, ...], value: float) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, series in sorted(self._series.items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}'
+            yield f"{self.name}_sum{{{labels}}} {series[-1]:.6f}"
+            yield f"{self.name}_count{{{labels}}} {cumulative}"
+
+    def reset(self) -> None:
+        self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestTimings:
+    """Seconds spent per phase (and per database operation) during one request.
+
+    Shared by every task the request spawns, so concurrent section loads add up:
+    phase totals can exceed the request's wall time.
+    """
+
+    __slots__ = ("phases", "db_operations")
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.db_operations: Dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float, operation: Optional[str] = None) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        if operation is not None:
+            self.db_operations[operation] = self.db_operations.get(operation, 0.0) + seconds
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("portfolio_request_timings", default=None)
+# Set while inside a timed database call, so nested repository calls count once
+_in_db: ContextVar[bool] = ContextVar("portfolio_in_db", default=False)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the block's duration to `phase` of the current request, if any."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+def timed_db(fn):
+    """Decorate a repository coroutine so its time counts as `db` for the current request."""
+    if not inspect.iscoroutinefunction(fn):
+        return fn
+    operation = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None or _in_db.get():
+            return await fn(*args, **kwargs)
+        token = _in_db.set(True)
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            timings.add("db", time.perf_counter() - started, operation)
+            _in_db.reset(token)
+
+    return wrapper
+
+
+class Metrics:
+    def __init__(self):
+        self.requests = Histogram(
+            "portfolio_request_duration_seconds", "Request latency until the response finished",
+            ("method", "route", "status"), LATENCY_BUCKETS,
+        )
+        self.request_sizes = Histogram(
+            "portfolio_request_size_bytes", "Request body size", ("method", "route"), SIZE_BUCKETS,
+        )
+        self.response_sizes = Histogram(
+            "portfolio_response_size_bytes", "Response body size (after compression)", ("method", "route"), SIZE_BUCKETS,
+        )
+        self.phases = Histogram(
+            "portfolio_request_phase_seconds", "Time per request spent in db / validate / serialize / compress",
+            ("route", "phase"), LATENCY_BUCKETS,
+        )
+        self.db_operations = Histogram(
+            "portfolio_db_operation_seconds", "Time per request spent in each repository operation",
+            ("route", "operation"), LATENCY_BUCKETS,
+        )
+
+    def record(self, method: str, route: str, status: int, seconds: float, request_bytes: int,
+               response_bytes: int, timings: RequestTimings) -> None:
+        self.requests.observe((method, route, str(status)), seconds)
+        self.request_sizes.observe((method, route), request_bytes)
+        self.response_sizes.observe((method, route), response_bytes)
+        for phase, phase_seconds in timings.phases.items():
+            self.phases.observe((route, phase), phase_seconds)
+        for operation, operation_seconds in timings.db_operations.items():
+            self.db_operations.observe((route, operation), operation_seconds)
+
+    def render(self) -> str:
+        histograms = (self.requests, self.request_sizes, self.response_sizes, self.phases, self.db_operations)
+        return "\n".join(line for histogram in histograms for line in histogram.render()) + "\n"
+
+    def reset(self) -> None:
+        for histogram in (self.requests, self.request_sizes, self.response_sizes, self.phases, self.db_operations):
+            histogram.reset()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (so streamed responses pass straight through).
+
+    Routes are labelled by their path template (`/api/portfolio/projects`),
+    never the raw path, to keep label cardinality bounded. With
+    `server_timing`, the phases measured before the response starts are also
+    sent as a `Server-Timing` header.
+    """
+
+    def __init__(self, app, metrics: Metrics, record: bool = True, server_timing: bool = False):
+        self.app = app
+        self.metrics = metrics
+        self.record = record
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        sizes = {"request": 0, "response": 0}
+        status = {"code": 500}
+
+        async def receive_counted():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["request"] += len(message.get("body", b""))
+            return message
+
+        async def send_counted(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(timings, time.perf_counter() - started).encode()))
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_counted, send_counted)
+        finally:
+            _current.reset(token)
+            if self.record:
+                route = scope.get("route")
+                self.metrics.record(
+                    scope["method"],
+                    getattr(route, "path", "unmatched"),
+                    status["code"],
+                    time.perf_counter() - started,
+                    sizes["request"],
+                    sizes["response"],
+                    timings,
+                )
+
+
+def _server_timing(timings: RequestTimings, total: float) -> str:
+    entries = [f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in timings.phases.items()]
+    entries.append(f"app;dur={total * 1000:.2f}")
+    return ", ".join(entries)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from pydantic import BaseModel, Field, SerializeAsAny
+from typing import Dict, List, Optional, Literal, Union
 from datetime import datetime
 import uuid
 
@@ -135,8 +135,43 @@ class ContactMessageCreate(BaseModel):
     message: str
 
 class PortfolioComplete(BaseModel):
-    personal: PersonalInfo
-    education: List[Education]
-    experience: List[Experience] 
-    projects: List[Project]
-    skills: dict  # Grouped by skill_group
\ No newline at end of file
+    # Sections are only None when loaded with partial=true and listed in errors
+    personal: Optional[PersonalInfo] = None
+    education: Optional[List[Education]] = None
+    experience: Optional[List[Experience]] = None
+    projects: Optional[List[SerializeAsAny[Project]]] = None  # may carry image_srcset
+    skills: Optional[dict] = None  # Grouped by skill_group
+    errors: Dict[str, str] = Field(default_factory=dict)  # section -> error message
+
+class SectionChanges(BaseModel):
+    upserted: List[SerializeAsAny[BaseModel]] = Field(default_factory=list)  # current rows, in the section's model
+    deleted: List[str] = Field(default_factory=list)  # ids of deleted rows (tombstones)
+
+class PortfolioChanges(BaseModel):
+    version: int  # pass back as `since` on the next call
+    reset: bool = False  # True: `upserted` holds every row; replace local data instead of merging
+    more: bool = False  # changes past `version` were left out (limit); ask again right away
+    changes: Dict[str, SectionChanges] = Field(default_factory=dict)  # collection -> changes; unchanged ones are left out
+
+class BulkRowResult(BaseModel):
+    line: int  # 1-based line (NDJSON) or item (JSON array) number
+    status: Literal["created", "invalid", "failed"]
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkIngestResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkRowResult]
+
+class SearchHit(BaseModel):
+    type: Literal["project", "experience"]
+    id: str
+    score: float
+    item: Union[Project, Experience]
+
+class SearchResult(BaseModel):
+    query: str
+    total: int
+    results: List[SearchHit]
+    facets: Dict[str, Dict[str, int]]  # facet -> value -> matching documents
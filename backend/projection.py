@@ -0,0 +1,104 @@
+"""Sparse responses: named views and `fields=` selections over the list models.
+
+A selection resolves to a tuple of field names that is pushed down to the
+repository (Mongo projection / PostgREST select). It is validated with a
+model holding only those fields, so unrequested fields are never read,
+validated or serialized.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, SerializeAsAny, create_model
+
+from models import Experience, PortfolioComplete, Project
+
+Fields = Optional[Tuple[str, ...]]  # None: every field
+
+# What list views render; `detail` is everything
+VIEWS: Dict[Type[BaseModel], Dict[str, Fields]] = {
+    Project: {
+        "card": ("id", "title", "description", "image", "tech", "category", "featured", "status", "github", "demo"),
+        "detail": None,
+    },
+    Experience: {
+        "card": ("id", "title", "company", "location", "period", "type", "color", "tech"),
+        "detail": None,
+    },
+}
+
+
+COMPLETE_SECTIONS = {"projects": Project, "experience": Experience}
+
+
+def resolve_fields(model: Type[BaseModel], view: Optional[str] = None, fields: Optional[str] = None) -> Fields:
+    """Field names for a view name or a comma-separated `fields` list (`id` is
+    always included); raises ValueError for unknown names."""
+    if view and fields:
+        raise ValueError("Pass either fields or view, not both")
+    if view:
+        views = VIEWS.get(model, {"detail": None})
+        if view not in views:
+            raise ValueError(f"Unknown view '{view}' (choose from {', '.join(views)})")
+        return views[view]
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in model.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown {model.__name__} fields: {', '.join(unknown)}")
+    selected = set(requested) | {"id"}
+    # Model order, so equal selections share one cache entry and one model
+    return tuple(name for name in model.model_fields if name in selected)
+
+
+@lru_cache(maxsize=128)
+def sparse_model(model: Type[BaseModel], fields: Fields) -> Type[BaseModel]:
+    """`model` cut down to `fields` (the model itself when fields is None)."""
+    if fields is None or len(fields) == len(model.model_fields):
+        return model
+    view = next((name for name, selected in VIEWS.get(model, {}).items() if selected == fields), None)
+    name = f"{model.__name__}{view.title() if view else 'Sparse'}"
+    return create_model(
+        name,
+        **{field: (model.model_fields[field].annotation, model.model_fields[field]) for field in fields},
+    )
+
+
+def resolve_complete_fields(view: Optional[str] = None, fields: Optional[str] = None) -> Dict[str, Fields]:
+    """Per-section selections for /portfolio/complete: `view` applies to every
+    sparse section, `fields` takes `section.field` names (`projects.title,experience.company`)."""
+    if view and fields:
+        raise ValueError("Pass either fields or view, not both")
+    if view:
+        return {section: resolve_fields(model, view=view) for section, model in COMPLETE_SECTIONS.items()}
+    grouped: Dict[str, List[str]] = {}
+    for name in (fields or "").split(","):
+        if not name.strip():
+            continue
+        section, _, field = name.strip().partition(".")
+        if section not in COMPLETE_SECTIONS or not field:
+            raise ValueError(f"Fields must look like <section>.<field> with section one of {', '.join(COMPLETE_SECTIONS)}")
+        grouped.setdefault(section, []).append(field)
+    return {
+        section: resolve_fields(model, fields=",".join(grouped[section])) if section in grouped else None
+        for section, model in COMPLETE_SECTIONS.items()
+    }
+
+
+@lru_cache(maxsize=128)
+def sparse_complete_model(project_fields: Fields, experience_fields: Fields) -> Type[PortfolioComplete]:
+    """PortfolioComplete whose project/experience lists hold the sparse models."""
+    if project_fields is None and experience_fields is None:
+        return PortfolioComplete
+    return create_model(
+        "PortfolioCompleteSparse",
+        __base__=PortfolioComplete,
+        projects=(Optional[List[SerializeAsAny[sparse_model(Project, project_fields)]]], None),
+        experience=(Optional[List[sparse_model(Experience, experience_fields)]], None),
+    )
+
+
+@lru_cache(maxsize=128)
+def with_image_srcset(model: Type[BaseModel]) -> Type[BaseModel]:
+    """`model` plus the derived `image_srcset` (see images.py); never stored, only served."""
+    return create_model(model.__name__, __base__=model, image_srcset=(Optional[Dict[str, str]], None))
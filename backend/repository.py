@@ -0,0 +1,860 @@
+import asyncio
+import copy
+import json
+import time
+from itertools import cycle
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from executor import BlockingExecutor
+from metrics import timed_db
+from models import Education, Experience, PersonalInfo, Project, Skill
+
+# Portfolio collections (Mongo collections / Supabase tables) in seed order
+PORTFOLIO_COLLECTIONS = ("personal_info", "education", "experience", "projects", "skills")
+
+# Every write to a portfolio collection is appended here under the next data version
+CHANGE_LOG = "portfolio_changes"
+
+# Columns the projects table may leave out; filled in before validation
+PROJECT_DEFAULTS = {
+    "tech": [],
+    "highlights": [],
+    "demo": None,
+    "featured": False,
+    "status": "completed",
+}
+
+
+class RepositoryError(Exception):
+    pass
+
+
+# Keyset pagination position: (ISO timestamp, id) of the last row already seen.
+# Lists are newest first, ties broken by id descending.
+Keyset = Tuple[str, str]
+
+
+class InsertResult(NamedTuple):
+    """Outcome of one row in a batch insert: the stored row, or why it was rejected."""
+    row: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class ReadOnlyRepositoryError(RepositoryError):
+    pass
+
+
+class PortfolioRepository:
+    """Storage interface every API handler goes through.
+
+    Reads return plain dicts (with `id` set) ready for the Pydantic models;
+    writes take dicts produced from the models.
+    """
+
+    name = "base"
+    read_only = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every public storage call counts as database time in the request metrics
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith("_"):
+                setattr(cls, attr, timed_db(value))
+
+    async def ping(self) -> None:
+        """One cheap round trip; opens the connection (raises if the backend is unreachable)."""
+
+    async def get_personal_info(self) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def list_education(self) -> List[dict]:
+        raise NotImplementedError
+
+    async def list_experience(self, fields: Optional[Sequence[str]] = None) -> List[dict]:
+        """`fields` limits the columns read (`id` is always returned); None reads every column."""
+        raise NotImplementedError
+
+    async def list_projects(
+        self, category: Optional[str] = None, featured_only: bool = False, fields: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        raise NotImplementedError
+
+    async def list_skills(self) -> List[dict]:
+        raise NotImplementedError
+
+    async def insert_projects(self, projects: List[dict]) -> List[InsertResult]:
+        """Insert one batch; returns one result per input row, in order."""
+        raise NotImplementedError
+
+    async def upsert_projects(self, projects: List[dict], key: str, insert_only: Sequence[str] = ()) -> Dict[str, int]:
+        """Insert or update projects matched on `key` (used by the GitHub sync).
+
+        Fields in `insert_only` are only written for new rows, so edits made to
+        them afterwards survive later syncs. Returns `{"created": n, "updated": n}`.
+        """
+        raise NotImplementedError
+
+    async def insert_contact_message(self, message: dict) -> dict:
+        raise NotImplementedError
+
+    async def insert_contact_messages(self, messages: List[dict]) -> int:
+        """Insert a batch keyed by each message's `id`. Idempotent, so a replayed
+        batch never duplicates rows; returns how many were new."""
+        raise NotImplementedError
+
+    async def list_contact_messages(
+        self, limit: int = 100, after: Optional[Keyset] = None, status: Optional[str] = None
+    ) -> List[dict]:
+        """Newest first, starting after the `after` keyset."""
+        raise NotImplementedError
+
+    async def iter_contact_messages(self, status: Optional[str] = None, page_size: int = 500) -> AsyncIterator[dict]:
+        """Every message, newest first, fetched a page at a time."""
+        async for row in _iter_pages(
+            lambda after: self.list_contact_messages(page_size, after, status), page_size, "created_at"
+        ):
+            yield row
+
+    async def insert_status_check(self, status: dict) -> dict:
+        raise NotImplementedError
+
+    async def list_status_checks(self, limit: int = 100, after: Optional[Keyset] = None) -> List[dict]:
+        """Newest first (by timestamp), starting after the `after` keyset."""
+        raise NotImplementedError
+
+    async def iter_status_checks(self, page_size: int = 500) -> AsyncIterator[dict]:
+        async for row in _iter_pages(lambda after: self.list_status_checks(page_size, after), page_size, "timestamp"):
+            yield row
+
+    async def replace_all(self, data: Dict[str, List[dict]]) -> Dict[str, dict]:
+        """Replace the portfolio collections with `data` (used by /admin/seed).
+
+        Returns `{collection: {"count": ..., "seconds": ...}}`.
+        """
+        raise NotImplementedError
+
+    # Change log: every portfolio write gets a data version one higher than the
+    # last, with a tombstone for each deleted row
+
+    async def change_log_bounds(self) -> Tuple[int, int]:
+        """(oldest, newest) data version still in the change log; (0, 0) when it is empty."""
+        raise NotImplementedError
+
+    async def list_changes(self, since: int, limit: int = 500) -> List[dict]:
+        """Entries after version `since`, oldest first, as `{version, collection, id, op, changed_at}`
+        with op `upsert` or `delete`. A write still in flight (or rolled back) can leave a gap."""
+        raise NotImplementedError
+
+    async def get_rows(self, collection: str, ids: Sequence[str]) -> List[dict]:
+        """The rows of a portfolio collection with these ids; deleted ones are left out."""
+        raise NotImplementedError
+
+    async def prune_changes(self, before: datetime) -> int:
+        """Drop entries logged before `before` (naive UTC), always keeping the newest; returns how many."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+def _from_mongo(doc: dict) -> dict:
+    doc["id"] = str(doc.pop("_id"))
+    return doc
+
+
+def _contact_doc(message: dict) -> dict:
+    # The message's uuid is its _id on every write path: the (created_at, _id) keyset
+    # only compares ids of one BSON type, and the id acknowledged to the sender stays valid
+    doc = {k: v for k, v in message.items() if k != "id"}
+    doc["_id"] = message["id"]
+    return doc
+
+
+class MongoRepository(PortfolioRepository):
+    # pymongo is imported inside the methods that need it, so processes running
+    # another backend never pay for importing it
+    name = "mongo"
+
+    def __init__(self, db):
+        self.db = db
+
+    # Cursor builders are shared with indexes.explain_queries, so the query-plan
+    # check always looks at the exact queries the endpoints run
+
+    def ordered_cursor(self, collection: str, query: Optional[dict] = None, fields: Optional[Sequence[str]] = None):
+        projection = {field: 1 for field in fields if field != "id"} if fields else None
+        return self.db[collection].find(query or {}, projection).sort("order", 1)
+
+    async def _list(self, collection: str, query: Optional[dict] = None, fields: Optional[Sequence[str]] = None) -> List[dict]:
+        cursor = self.ordered_cursor(collection, query, fields)
+        return [_from_mongo(doc) for doc in await cursor.to_list(length=None)]
+
+    async def ping(self) -> None:
+        await self.db.command("ping")
+
+    async def get_personal_info(self) -> Optional[dict]:
+        doc = await self.db["personal_info"].find_one({})
+        return _from_mongo(doc) if doc else None
+
+    async def list_education(self) -> List[dict]:
+        return await self._list("education")
+
+    async def list_experience(self, fields: Optional[Sequence[str]] = None) -> List[dict]:
+        return await self._list("experience", fields=fields)
+
+    @staticmethod
+    def projects_query(category: Optional[str] = None, featured_only: bool = False) -> dict:
+        query = {}
+        if category:
+            query["category"] = category
+        if featured_only:
+            query["featured"] = True
+        return query
+
+    async def list_projects(
+        self, category: Optional[str] = None, featured_only: bool = False, fields: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        return await self._list("projects", self.projects_query(category, featured_only), fields)
+
+    async def list_skills(self) -> List[dict]:
+        return await self._list("skills")
+
+    async def insert_projects(self, projects: List[dict]) -> List[InsertResult]:
+        if not projects:
+            return []
+        from pymongo.errors import BulkWriteError
+
+        docs = [dict(project) for project in projects]
+        errors = {}
+        try:
+            # ordered=False keeps inserting past a bad row; pymongo sets each doc's _id
+            await self.db["projects"].insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            errors = {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+        await self._log_changes([("projects", doc["_id"], "upsert") for i, doc in enumerate(docs) if i not in errors])
+        return [
+            InsertResult(error=errors[i]) if i in errors else InsertResult(row={**project, "id": str(doc["_id"])})
+            for i, (project, doc) in enumerate(zip(projects, docs))
+        ]
+
+    async def upsert_projects(self, projects: List[dict], key: str, insert_only: Sequence[str] = ()) -> Dict[str, int]:
+        if not projects:
+            return {"created": 0, "updated": 0}
+        from pymongo import UpdateOne
+
+        operations = []
+        for project in projects:
+            # Mongo ids come from _id; never store the model's uuid
+            fields = {name: value for name, value in project.items() if name != "id"}
+            on_insert = {name: fields.pop(name) for name in insert_only if name in fields}
+            update = {"$set": fields}
+            if on_insert:
+                update["$setOnInsert"] = on_insert
+            operations.append(UpdateOne({key: project[key]}, update, upsert=True))
+        result = await self.db["projects"].bulk_write(operations, ordered=False)
+        touched = await self.db["projects"].find({key: {"$in": [project[key] for project in projects]}}, {"_id": 1}).to_list(length=None)
+        await self._log_changes([("projects", doc["_id"], "upsert") for doc in touched])
+        return {"created": result.upserted_count, "updated": result.matched_count}
+
+    async def insert_contact_message(self, message: dict) -> dict:
+        await self.db["contact_messages"].insert_one(_contact_doc(message))
+        return dict(message)
+
+    async def insert_contact_messages(self, messages: List[dict]) -> int:
+        if not messages:
+            return 0
+        from pymongo.errors import BulkWriteError
+
+        # A replayed batch hits duplicate keys instead of duplicating
+        docs = [_contact_doc(message) for message in messages]
+        try:
+            result = await self.db["contact_messages"].insert_many(docs, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            fatal = [err for err in errors if err.get("code") != 11000]
+            if fatal:
+                raise RepositoryError(fatal[0].get("errmsg", "write error"))
+            return e.details.get("nInserted", len(docs) - len(errors))
+
+    def contact_cursor(self, after: Optional[Keyset], status: Optional[str]):
+        query = {}
+        if status:
+            query["status"] = status
+        if after:
+            query.update(_mongo_keyset_filter("created_at", "_id", _parse_time(after[0]), _mongo_id(after[1])))
+        return self.db["contact_messages"].find(query).sort([("created_at", -1), ("_id", -1)])
+
+    async def list_contact_messages(
+        self, limit: int = 100, after: Optional[Keyset] = None, status: Optional[str] = None
+    ) -> List[dict]:
+        cursor = self.contact_cursor(after, status).limit(limit)
+        return [_from_mongo(doc) for doc in await cursor.to_list(length=limit)]
+
+    async def iter_contact_messages(self, status: Optional[str] = None, page_size: int = 500) -> AsyncIterator[dict]:
+        # Stream straight off the server-side cursor, one batch in memory at a time
+        async for doc in self.contact_cursor(None, status).batch_size(page_size):
+            yield _from_mongo(doc)
+
+    async def insert_status_check(self, status: dict) -> dict:
+        await self.db["status_checks"].insert_one(dict(status))
+        return status
+
+    def status_cursor(self, after: Optional[Keyset]):
+        query = _mongo_keyset_filter("timestamp", "id", _parse_time(after[0]), after[1]) if after else {}
+        return self.db["status_checks"].find(query).sort([("timestamp", -1), ("id", -1)])
+
+    async def list_status_checks(self, limit: int = 100, after: Optional[Keyset] = None) -> List[dict]:
+        return await self.status_cursor(after).limit(limit).to_list(length=limit)
+
+    async def iter_status_checks(self, page_size: int = 500) -> AsyncIterator[dict]:
+        async for doc in self.status_cursor(None).batch_size(page_size):
+            yield doc
+
+    async def replace_all(self, data: Dict[str, List[dict]]) -> Dict[str, dict]:
+        return await _replace_concurrently(self._replace_collection, data)
+
+    async def _replace_collection(self, collection: str, docs: List[dict]) -> int:
+        from indexes import MONGO_INDEXES
+
+        # Load a shadow collection with one bulk insert, then rename it over the
+        # live one so readers see either the old or the new data, never a mix
+        shadow = self.db[f"{collection}__seed"]
+        await shadow.drop()
+        replaced = await self.db[collection].find({}, {"_id": 1}).to_list(length=None)
+        tombstones = [(collection, doc["_id"], "delete") for doc in replaced]
+        if not docs:
+            await self.db[collection].drop()
+            await self._log_changes(tombstones)
+            return 0
+        result = await shadow.insert_many([dict(doc) for doc in docs], ordered=False)
+        # rename(dropTarget=True) drops the live collection's indexes with it
+        if MONGO_INDEXES.get(collection):
+            await shadow.create_indexes(MONGO_INDEXES[collection])
+        await shadow.rename(collection, dropTarget=True)
+        await self._log_changes(tombstones + [(collection, row_id, "upsert") for row_id in result.inserted_ids])
+        return len(result.inserted_ids)
+
+    async def _log_changes(self, changes: List[Tuple[str, object, str]]) -> None:
+        # Logged after the write it describes: a reader may see the new data a
+        # moment before its version, never a version before its data
+        if not changes:
+            return
+        from pymongo import ReturnDocument
+
+        counter = await self.db["counters"].find_one_and_update(
+            {"_id": CHANGE_LOG}, {"$inc": {"seq": len(changes)}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        first = counter["seq"] - len(changes) + 1
+        now = datetime.utcnow()
+        await self.db[CHANGE_LOG].insert_many([
+            {"_id": first + i, "collection": collection, "id": str(row_id), "op": op, "changed_at": now}
+            for i, (collection, row_id, op) in enumerate(changes)
+        ], ordered=False)
+
+    async def change_log_bounds(self) -> Tuple[int, int]:
+        oldest = await self.db[CHANGE_LOG].find({}, {"_id": 1}).sort("_id", 1).limit(1).to_list(length=1)
+        newest = await self.db[CHANGE_LOG].find({}, {"_id": 1}).sort("_id", -1).limit(1).to_list(length=1)
+        return (oldest[0]["_id"], newest[0]["_id"]) if oldest and newest else (0, 0)
+
+    async def list_changes(self, since: int, limit: int = 500) -> List[dict]:
+        cursor = self.db[CHANGE_LOG].find({"_id": {"$gt": since}}).sort("_id", 1).limit(limit)
+        return [{**doc, "version": doc.pop("_id")} for doc in await cursor.to_list(length=limit)]
+
+    async def get_rows(self, collection: str, ids: Sequence[str]) -> List[dict]:
+        cursor = self.db[collection].find({"_id": {"$in": [_mongo_id(row_id) for row_id in ids]}})
+        return [_from_mongo(doc) for doc in await cursor.to_list(length=None)]
+
+    async def prune_changes(self, before: datetime) -> int:
+        _, newest = await self.change_log_bounds()
+        result = await self.db[CHANGE_LOG].delete_many({"changed_at": {"$lt": before}, "_id": {"$lt": newest}})
+        return result.deleted_count
+
+    async def close(self) -> None:
+        client = getattr(self.db, "client", None)
+        if client is not None:
+            client.close()
+
+
+class SupabaseRepository(PortfolioRepository):
+    """Supabase (PostgREST) tables named after the Mongo collections; see supabase_schema.sql."""
+
+    name = "supabase"
+
+    def __init__(self, client, executor: BlockingExecutor):
+        self.client = client
+        self.executor = executor
+
+    async def _execute(self, query) -> List[dict]:
+        # The supabase client is synchronous; never call .execute() on the event loop
+        result = await self.executor.run(query.execute)
+        return result.data or []
+
+    async def ping(self) -> None:
+        await self._execute(self.client.table("personal_info").select("id").limit(1))
+
+    async def get_personal_info(self) -> Optional[dict]:
+        rows = await self._execute(self.client.table("personal_info").select("*").limit(1))
+        return rows[0] if rows else None
+
+    async def list_education(self) -> List[dict]:
+        return await self._execute(self.client.table("education").select("*").order("order"))
+
+    async def list_experience(self, fields: Optional[Sequence[str]] = None) -> List[dict]:
+        return await self._execute(self.client.table("experience").select(_select(fields)).order("order"))
+
+    async def list_projects(
+        self, category: Optional[str] = None, featured_only: bool = False, fields: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        q = self.client.table("projects").select(_select(fields))
+        if category:
+            q = q.eq("category", category)
+        if featured_only:
+            q = q.eq("featured", True)
+        rows = await self._execute(q.order("order"))
+        defaults = {key: default for key, default in PROJECT_DEFAULTS.items() if not fields or key in fields}
+        for row in rows:
+            for key, default in defaults.items():
+                row.setdefault(key, copy.copy(default))
+        return rows
+
+    async def list_skills(self) -> List[dict]:
+        return await self._execute(self.client.table("skills").select("*").order("order"))
+
+    async def insert_projects(self, projects: List[dict]) -> List[InsertResult]:
+        if not projects:
+            return []
+        from postgrest.exceptions import APIError
+
+        payload = jsonable_encoder(projects)
+        try:
+            rows = await self._execute(self.client.table("projects").insert(payload))
+            return [InsertResult(row=row) for row in rows]
+        except APIError as e:
+            if len(payload) == 1:
+                return [InsertResult(error=e.message or str(e))]
+        # A PostgREST insert is all-or-nothing; retry row by row to find the bad ones
+        results = []
+        for row in payload:
+            try:
+                inserted = await self._execute(self.client.table("projects").insert(row))
+                results.append(InsertResult(row=inserted[0]))
+            except APIError as e:
+                results.append(InsertResult(error=e.message or str(e)))
+        return results
+
+    async def upsert_projects(self, projects: List[dict], key: str, insert_only: Sequence[str] = ()) -> Dict[str, int]:
+        if not projects:
+            return {"created": 0, "updated": 0}
+        payload = jsonable_encoder(projects)
+        existing = await self._execute(
+            self.client.table("projects").select(key).in_(key, [row[key] for row in payload])
+        )
+        known = {row[key] for row in existing}
+        new_rows = [row for row in payload if row[key] not in known]
+        skip = set(insert_only) | {"id"}
+        updates = [
+            self._execute(
+                self.client.table("projects")
+                .update({name: value for name, value in row.items() if name not in skip})
+                .eq(key, row[key])
+            )
+            for row in payload if row[key] in known
+        ]
+        # Updates fan out over the executor; PostgREST has no per-row bulk update
+        await asyncio.gather(*updates)
+        for result in await self.insert_projects(new_rows):
+            if result.error is not None:
+                raise RepositoryError(result.error)
+        return {"created": len(new_rows), "updated": len(updates)}
+
+    async def insert_contact_message(self, message: dict) -> dict:
+        payload = jsonable_encoder(message)
+        rows = await self._execute(self.client.table("contact_messages").insert(payload))
+        if not rows:
+            raise RepositoryError("Failed to save contact message")
+        row = rows[0]
+        row.setdefault("status", "new")
+        return row
+
+    async def insert_contact_messages(self, messages: List[dict]) -> int:
+        if not messages:
+            return 0
+        payload = jsonable_encoder(messages)
+        rows = await self._execute(
+            self.client.table("contact_messages").upsert(payload, on_conflict="id", ignore_duplicates=True)
+        )
+        return len(rows)
+
+    async def list_contact_messages(
+        self, limit: int = 100, after: Optional[Keyset] = None, status: Optional[str] = None
+    ) -> List[dict]:
+        q = self.client.table("contact_messages").select("*")
+        if status:
+            q = q.eq("status", status)
+        if after:
+            q = q.or_(_postgrest_keyset_filter("created_at", after))
+        q = q.order("created_at", desc=True).order("id", desc=True).limit(limit)
+        return await self._execute(q)
+
+    async def insert_status_check(self, status: dict) -> dict:
+        rows = await self._execute(self.client.table("status_checks").insert(jsonable_encoder(status)))
+        return rows[0] if rows else status
+
+    async def list_status_checks(self, limit: int = 100, after: Optional[Keyset] = None) -> List[dict]:
+        q = self.client.table("status_checks").select("*")
+        if after:
+            q = q.or_(_postgrest_keyset_filter("timestamp", after))
+        q = q.order("timestamp", desc=True).order("id", desc=True).limit(limit)
+        return await self._execute(q)
+
+    async def replace_all(self, data: Dict[str, List[dict]]) -> Dict[str, dict]:
+        return await _replace_concurrently(self._replace_table, data)
+
+    async def _replace_table(self, table: str, rows: List[dict]) -> int:
+        # replace_portfolio_table (supabase_schema.sql) deletes and bulk-inserts in
+        # one transaction: a single round trip, and readers never see it half done
+        params = {"target": table, "rows": jsonable_encoder(rows)}
+        result = await self.executor.run(self.client.rpc("replace_portfolio_table", params).execute)
+        return int(result.data or 0)
+
+    # The change log is written by the log_portfolio_change trigger, so it also
+    # covers edits made outside the API
+
+    async def change_log_bounds(self) -> Tuple[int, int]:
+        oldest = await self._execute(self.client.table(CHANGE_LOG).select("version").order("version").limit(1))
+        newest = await self._execute(self.client.table(CHANGE_LOG).select("version").order("version", desc=True).limit(1))
+        return (oldest[0]["version"], newest[0]["version"]) if oldest and newest else (0, 0)
+
+    async def list_changes(self, since: int, limit: int = 500) -> List[dict]:
+        rows = await self._execute(
+            self.client.table(CHANGE_LOG).select("version,collection,row_id,op,changed_at").gt("version", since).order("version").limit(limit)
+        )
+        return [
+            {"version": row["version"], "collection": row["collection"], "id": row["row_id"], "op": row["op"],
+             "changed_at": _parse_time(row["changed_at"])}
+            for row in rows
+        ]
+
+    async def get_rows(self, collection: str, ids: Sequence[str]) -> List[dict]:
+        # Ids go in the query string, so ask for them a hundred at a time
+        chunks = [list(ids[start:start + 100]) for start in range(0, len(ids), 100)]
+        pages = await asyncio.gather(*(self._execute(self.client.table(collection).select("*").in_("id", chunk)) for chunk in chunks))
+        rows = [row for page in pages for row in page]
+        if collection == "projects":
+            for row in rows:
+                for key, default in PROJECT_DEFAULTS.items():
+                    row.setdefault(key, copy.copy(default))
+        return rows
+
+    async def prune_changes(self, before: datetime) -> int:
+        _, newest = await self.change_log_bounds()
+        deleted = await self._execute(
+            self.client.table(CHANGE_LOG).delete().lt("changed_at", before.replace(tzinfo=timezone.utc).isoformat()).lt("version", newest)
+        )
+        return len(deleted)
+
+
+class MemoryRepository(PortfolioRepository):
+    """Serves the portfolio from RAM, loaded once at startup.
+
+    Read-only unless `writable=True`, in which case writes go to memory and are
+    lost on restart (useful for offline benchmarks).
+    """
+
+    name = "memory"
+
+    def __init__(self, data: Dict[str, List[dict]], writable: bool = False):
+        self.data = {name: [dict(row) for row in data.get(name, [])] for name in PORTFOLIO_COLLECTIONS}
+        self.data["contact_messages"] = []
+        self.data["status_checks"] = []
+        self.writable = writable
+        self.read_only = not writable
+        self.changes: List[dict] = []  # the loaded data is version 0
+        self.version = 0
+
+    def _check_writable(self) -> None:
+        if not self.writable:
+            raise ReadOnlyRepositoryError("The in-memory portfolio backend is read-only")
+
+    def _list(self, collection: str, fields: Optional[Sequence[str]] = None, where=None) -> List[dict]:
+        rows = sorted(
+            (row for row in self.data[collection] if where is None or where(row)),
+            key=lambda row: row.get("order", 0),
+        )
+        if fields:
+            return [{field: row[field] for field in fields if field in row} for row in rows]
+        return [dict(row) for row in rows]
+
+    async def get_personal_info(self) -> Optional[dict]:
+        rows = self.data["personal_info"]
+        return dict(rows[0]) if rows else None
+
+    async def list_education(self) -> List[dict]:
+        return self._list("education")
+
+    async def list_experience(self, fields: Optional[Sequence[str]] = None) -> List[dict]:
+        return self._list("experience", fields)
+
+    async def list_projects(
+        self, category: Optional[str] = None, featured_only: bool = False, fields: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        return self._list(
+            "projects",
+            fields,
+            lambda row: (not category or row.get("category") == category) and (not featured_only or row.get("featured")),
+        )
+
+    async def list_skills(self) -> List[dict]:
+        return self._list("skills")
+
+    async def insert_projects(self, projects: List[dict]) -> List[InsertResult]:
+        self._check_writable()
+        self.data["projects"] = self.data["projects"] + [dict(p) for p in projects]
+        self._log_changes([("projects", p["id"], "upsert") for p in projects])
+        return [InsertResult(row=dict(p)) for p in projects]
+
+    async def upsert_projects(self, projects: List[dict], key: str, insert_only: Sequence[str] = ()) -> Dict[str, int]:
+        self._check_writable()
+        rows = [dict(row) for row in self.data["projects"]]
+        by_key = {row.get(key): row for row in rows}
+        created = 0
+        touched = []
+        for project in projects:
+            row = by_key.get(project[key])
+            if row is None:
+                rows.append(dict(project))
+                touched.append(project["id"])
+                created += 1
+            else:
+                row.update({name: value for name, value in project.items() if name not in insert_only and name != "id"})
+                touched.append(row["id"])
+        self.data["projects"] = rows
+        self._log_changes([("projects", row_id, "upsert") for row_id in touched])
+        return {"created": created, "updated": len(projects) - created}
+
+    async def insert_contact_message(self, message: dict) -> dict:
+        self._check_writable()
+        self.data["contact_messages"].append(dict(message))
+        return dict(message)
+
+    async def insert_contact_messages(self, messages: List[dict]) -> int:
+        self._check_writable()
+        known = {row["id"] for row in self.data["contact_messages"]}
+        new = [dict(message) for message in messages if message["id"] not in known]
+        self.data["contact_messages"].extend(new)
+        return len(new)
+
+    async def list_contact_messages(
+        self, limit: int = 100, after: Optional[Keyset] = None, status: Optional[str] = None
+    ) -> List[dict]:
+        rows = [row for row in self.data["contact_messages"] if not status or row.get("status") == status]
+        return _memory_page(rows, "created_at", limit, after)
+
+    async def insert_status_check(self, status: dict) -> dict:
+        self._check_writable()
+        self.data["status_checks"].append(dict(status))
+        return dict(status)
+
+    async def list_status_checks(self, limit: int = 100, after: Optional[Keyset] = None) -> List[dict]:
+        return _memory_page(self.data["status_checks"], "timestamp", limit, after)
+
+    async def replace_all(self, data: Dict[str, List[dict]]) -> Dict[str, dict]:
+        self._check_writable()
+        return await _replace_concurrently(self._replace_collection, data)
+
+    async def _replace_collection(self, collection: str, rows: List[dict]) -> int:
+        # Build the new list first, then swap it in with a single assignment
+        replaced = self.data[collection]
+        self.data[collection] = [dict(row) for row in rows]
+        self._log_changes(
+            [(collection, row["id"], "delete") for row in replaced] + [(collection, row["id"], "upsert") for row in rows]
+        )
+        return len(rows)
+
+    def _log_changes(self, changes: List[Tuple[str, str, str]]) -> None:
+        now = datetime.utcnow()
+        for collection, row_id, op in changes:
+            self.version += 1
+            self.changes.append({"version": self.version, "collection": collection, "id": row_id, "op": op, "changed_at": now})
+
+    async def change_log_bounds(self) -> Tuple[int, int]:
+        return (self.changes[0]["version"], self.changes[-1]["version"]) if self.changes else (0, 0)
+
+    async def list_changes(self, since: int, limit: int = 500) -> List[dict]:
+        if not self.changes:
+            return []
+        start = max(since - self.changes[0]["version"] + 1, 0)  # versions here have no gaps
+        return [dict(change) for change in self.changes[start:start + limit]]
+
+    async def get_rows(self, collection: str, ids: Sequence[str]) -> List[dict]:
+        wanted = set(ids)
+        return [dict(row) for row in self.data[collection] if row["id"] in wanted]
+
+    async def prune_changes(self, before: datetime) -> int:
+        kept = [change for change in self.changes[:-1] if change["changed_at"] >= before] + self.changes[-1:]
+        pruned = len(self.changes) - len(kept)
+        self.changes = kept
+        return pruned
+
+
+def keyset_of(row: dict, time_field: str) -> Keyset:
+    value = row[time_field]
+    return (value.isoformat() if isinstance(value, datetime) else str(value), str(row["id"]))
+
+
+async def _iter_pages(fetch, page_size: int, time_field: str) -> AsyncIterator[dict]:
+    after = None
+    while True:
+        rows = await fetch(after)
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            return
+        after = keyset_of(rows[-1], time_field)
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    # Mongo stores naive UTC datetimes (datetime.utcnow)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _mongo_id(value: str):
+    from bson import ObjectId
+
+    return ObjectId(value) if ObjectId.is_valid(value) else value
+
+
+def _mongo_keyset_filter(time_field: str, id_field: str, time_value, id_value) -> dict:
+    # The $lte bound lets the (time, id) index range-scan; the $or only trims ties
+    return {
+        time_field: {"$lte": time_value},
+        "$or": [{time_field: {"$lt": time_value}}, {id_field: {"$lt": id_value}}],
+    }
+
+
+def _select(fields: Optional[Sequence[str]]) -> str:
+    return ",".join(fields) if fields else "*"
+
+
+def _postgrest_keyset_filter(time_field: str, after: Keyset) -> str:
+    # Values are quoted: ISO timestamps contain ':' and '+', which PostgREST reserves
+    timestamp, row_id = (value.replace('"', "") for value in after)
+    return f'{time_field}.lt."{timestamp}",and({time_field}.eq."{timestamp}",id.lt."{row_id}")'
+
+
+def _memory_page(rows: List[dict], time_field: str, limit: int, after: Optional[Keyset]) -> List[dict]:
+    ordered = sorted(rows, key=lambda row: keyset_of(row, time_field), reverse=True)
+    if after:
+        ordered = [row for row in ordered if keyset_of(row, time_field) < tuple(after)]
+    return [dict(row) for row in ordered[:limit]]
+
+
+async def _replace_concurrently(replace, data: Dict[str, List[dict]]) -> Dict[str, dict]:
+    """Run `replace(collection, docs)` for every portfolio collection at once, timing each."""
+    async def timed(collection: str) -> dict:
+        started = time.perf_counter()
+        count = await replace(collection, data.get(collection, []))
+        return {"count": count, "seconds": round(time.perf_counter() - started, 4)}
+
+    results = await asyncio.gather(*(timed(c) for c in PORTFOLIO_COLLECTIONS))
+    return dict(zip(PORTFOLIO_COLLECTIONS, results))
+
+
+def build_seed_data() -> Dict[str, List[dict]]:
+    """Validate seed_data.py through the models, keyed by collection."""
+    # Imported here so only seeding pays for it
+    from seed_data import EDUCATION_DATA, EXPERIENCE_DATA, PERSONAL_INFO, PROJECTS_DATA, SKILLS_DATA
+
+    return {
+        "personal_info": [PersonalInfo(**PERSONAL_INFO).dict()],
+        "education": [Education(**row).dict() for row in EDUCATION_DATA],
+        "experience": [Experience(**row).dict() for row in EXPERIENCE_DATA],
+        "projects": [Project(**row).dict() for row in PROJECTS_DATA],
+        "skills": [Skill(**row).dict() for row in SKILLS_DATA],
+    }
+
+
+_SKILL_GROUPS = {"languages": "languages", "frameworks": "frameworks", "tools": "tools", "aiMl": "aiMl", "ai": "aiMl"}
+_EXPERIENCE_COLORS = ("blue", "cyan", "purple", "green", "orange", "red")
+
+
+def _experience_type(role: dict) -> str:
+    text = f"{role.get('title', '')} {role.get('company', '')}".lower()
+    if "intern" in text:
+        return "Internship"
+    if "challenge" in text or "research" in text:
+        return "Research"
+    return "Contract"
+
+
+def load_frontend_data(data_dir: Path) -> Dict[str, List[dict]]:
+    """Map frontend/src/data/*.json onto the API models.
+
+    Those files only hold projects, experience and skills; personal info and
+    education still come from seed_data.py.
+    """
+    data = build_seed_data()
+
+    projects = json.loads((data_dir / "projects.json").read_text())
+    data["projects"] = [
+        Project(
+            title=p["title"],
+            description=p.get("summary", ""),
+            long_description=p.get("summary", ""),
+            tech=p.get("stack", []),
+            category=p.get("category", "other"),
+            featured=True,
+            github=p.get("links", {}).get("github", ""),
+            demo=p.get("links", {}).get("demo") or None,
+            image=p.get("thumb", ""),
+            status="completed",
+            highlights=p.get("metrics", []),
+            order=i + 1,
+        ).dict()
+        for i, p in enumerate(projects)
+    ]
+
+    roles = json.loads((data_dir / "experience.json").read_text()).get("roles", [])
+    data["experience"] = [
+        Experience(
+            title=role["title"],
+            company=role["company"],
+            location=role.get("location", ""),
+            period=role.get("dates", ""),
+            type=_experience_type(role),
+            color=color,
+            achievements=role.get("bullets", []),
+            tech=role.get("stack", []),
+            order=i + 1,
+        ).dict()
+        for i, (role, color) in enumerate(zip(roles, cycle(_EXPERIENCE_COLORS)))
+    ]
+
+    groups = json.loads((data_dir / "skills.json").read_text())
+    skills = []
+    for group, entries in groups.items():
+        for entry in entries:
+            skills.append(Skill(
+                name=entry["name"],
+                level=entry["level"],
+                category=group,
+                skill_group=_SKILL_GROUPS.get(group, "tools"),
+                order=len(skills) + 1,
+            ).dict())
+    data["skills"] = skills
+    return data
+
+
+def load_memory_data(source: str = "seed") -> Dict[str, List[dict]]:
+    """`seed` for seed_data.py, otherwise a directory shaped like frontend/src/data."""
+    if source == "seed":
+        return build_seed_data()
+    return load_frontend_data(Path(source))
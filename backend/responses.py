@@ -0,0 +1,400 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import ResponseValidationError
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+from starlette.requests import Request
+from starlette.responses import Response
+
+from metrics import timed
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants without it
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder, several times slower
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: Accept: application/msgpack gets JSON without it
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # optional: Accept: application/cbor gets JSON without it
+    cbor2 = None
+
+CACHE_CONTROL = os.environ.get('PORTFOLIO_CACHE_CONTROL', 'public, max-age=0, must-revalidate')
+# Variants are built on the event loop once per data version. On the portfolio
+# payload brotli 11 is ~12% smaller than 5 but takes ~20x the CPU (tens of ms)
+BROTLI_QUALITY = int(os.environ.get('PORTFOLIO_BROTLI_QUALITY', '5'))
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode like starlette's JSONResponse, so bodies are byte-identical to FastAPI's.
+
+    With orjson, models are dumped by pydantic-core and the result encoded in
+    one call, instead of jsonable_encoder walking every value in Python.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_dump_model, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _dump_model(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        # JSON mode, as jsonable_encoder does: pydantic writes UTC datetimes with `Z` where orjson writes `+00:00`
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class BinaryFormat(NamedTuple):
+    """A binary representation a client asked for in Accept.
+
+    `columnar` (`layout=columnar`) turns every list of objects into
+    `{"columns": {name: [value per row]}}`, so field names are sent once.
+    """
+
+    name: str  # "msgpack" or "cbor"
+    columnar: bool = False
+
+    @property
+    def media_type(self) -> str:
+        return f"application/{self.name}" + ("; layout=columnar" if self.columnar else "")
+
+
+BINARY_MEDIA_TYPES = {
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/cbor": "cbor",
+}
+# Set per request by NegotiatedRoute, for responses built without the request at hand
+requested_format: ContextVar[Optional[BinaryFormat]] = ContextVar("requested_format", default=None)
+
+
+def choose_format(accept: Optional[str]) -> Optional[BinaryFormat]:
+    """The binary format an Accept header prefers over JSON; None means JSON.
+
+    Formats whose library isn't installed are skipped, as are wildcards: a
+    client gets msgpack or CBOR only by naming it.
+    """
+    if not accept or "application/" not in accept:
+        return None
+    best, best_q = None, 0.0
+    for part in accept.split(","):
+        media_type, *params = (value.strip() for value in part.split(";"))
+        media_type = media_type.lower()
+        if media_type == "application/json":
+            name = "json"
+        else:
+            name = BINARY_MEDIA_TYPES.get(media_type)
+            if name is None or (msgpack if name == "msgpack" else cbor2) is None:
+                continue
+        q, columnar = 1.0, False
+        for param in params:
+            key, _, value = param.partition("=")
+            key, value = key.strip().lower(), value.strip().strip('"').lower()
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+            elif key == "layout":
+                columnar = value == "columnar"
+        # Ties go to the first listed
+        if q > best_q:
+            best, best_q = (None if name == "json" else BinaryFormat(name, columnar)), q
+    return best
+
+
+def encode_binary(content: Any, fmt: BinaryFormat) -> bytes:
+    """Encode models and plain values as msgpack or CBOR.
+
+    Datetimes become native timestamps (msgpack's timestamp extension, CBOR
+    tag 1); naive ones are taken as UTC, which is how they are stored.
+    """
+    value = _plain(content)
+    if fmt.columnar:
+        value = _columnar(value)
+    if fmt.name == "msgpack":
+        return msgpack.packb(value, default=_msgpack_default)
+    return cbor2.dumps(value, datetime_as_timestamp=True, timezone=timezone.utc, default=_cbor_default)
+
+
+def _plain(value: Any) -> Any:
+    # Python-mode dumps keep datetimes as datetimes for the encoder
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], BaseModel) and all(type(item) is type(value[0]) for item in value):
+            return _list_adapter(type(value[0])).dump_python(value)  # one pydantic-core call for the list
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def _columnar(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _columnar(item) if isinstance(item, (list, dict)) else item for key, item in value.items()}
+    # Lists dumped from models hold one kind of item, so a list of scalars stays as it is
+    if not value or not isinstance(value[0], (list, dict)):
+        return value
+    if not all(isinstance(item, dict) for item in value):
+        return [_columnar(item) for item in value]
+    # Rows of one model share their keys; any extra key gets a column, None where missing
+    names: Dict[str, None] = dict.fromkeys(value[0])
+    for row in value:
+        if row.keys() != names.keys():
+            names.update(dict.fromkeys(row))
+    columns = {}
+    for name in names:
+        column = [row.get(name) for row in value]
+        if any(isinstance(cell, (list, dict)) for cell in column):
+            column = [_columnar(cell) if isinstance(cell, (list, dict)) else cell for cell in column]
+        columns[name] = column
+    return {"columns": columns}
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Naive datetimes are UTC; this is ~2x faster than Timestamp.from_datetime
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = value - _EPOCH
+        return msgpack.Timestamp(delta.days * 86400 + delta.seconds, delta.microseconds * 1000)
+    if isinstance(value, date):
+        return value.isoformat()
+    return jsonable_encoder(value)
+
+
+def _cbor_default(encoder, value: Any) -> None:
+    encoder.encode(jsonable_encoder(value))
+
+
+class ModelJSONResponse(Response):
+    """JSON response for models that are already validated. Returning it from a
+    handler skips FastAPI's second validation against `response_model` (which
+    still documents the endpoint); the body is encoded by `encode_json`, or by
+    `encode_binary` when the route negotiated msgpack or CBOR."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        fmt = requested_format.get()
+        if fmt is None:
+            return encode_json(content)
+        self.media_type = fmt.media_type
+        return encode_binary(content, fmt)
+
+
+class NegotiatedRoute(APIRoute):
+    """Route class that answers msgpack or CBOR when the Accept header asks for it.
+
+    Values and models a handler returns are dumped through its `response_model`
+    in Python mode (so datetimes stay datetimes) and encoded by `encode_binary`,
+    keeping the status code and headers set on the injected `Response`.
+    ModelJSONResponse and SerializedBody negotiate themselves; other responses
+    (streams, files, errors) are sent as they are.
+    """
+
+    def get_route_handler(self):
+        dependant = self.dependant
+        if asyncio.iscoroutinefunction(dependant.call):
+            dependant.call = self._binary_endpoint(dependant.call, dependant.response_param_name)
+            # The sub-response carries the status code and headers a handler sets
+            dependant.response_param_name = dependant.response_param_name or _RESPONSE_PARAM
+        handler = super().get_route_handler()
+
+        async def negotiated(request: Request) -> Response:
+            token = requested_format.set(choose_format(request.headers.get("accept")))
+            try:
+                response = await handler(request)
+            finally:
+                requested_format.reset(token)
+            media_type = response.headers.get("content-type", "").partition(";")[0]
+            if media_type == "application/json" or media_type in BINARY_MEDIA_TYPES:
+                vary = response.headers.get("vary")
+                if not vary:
+                    response.headers["Vary"] = "Accept"
+                elif "accept" not in (value.strip().lower() for value in vary.split(",")):
+                    response.headers["Vary"] = vary + ", Accept"
+            return response
+
+        return negotiated
+
+    def _binary_endpoint(self, endpoint, response_param: Optional[str]):
+        async def call(**values):
+            sub_response = values[response_param] if response_param else values.pop(_RESPONSE_PARAM)
+            content = await endpoint(**values)
+            fmt = requested_format.get()
+            if fmt is None or isinstance(content, Response):
+                return content
+            return self._binary_response(content, fmt, sub_response)
+
+        return call
+
+    def _binary_response(self, content: Any, fmt: BinaryFormat, sub_response: Response) -> Response:
+        field = self.secure_cloned_response_field
+        if field is not None:
+            value, errors = field.validate(content, {}, loc=("response",))
+            if errors:
+                raise ResponseValidationError(errors=errors, body=content)
+            content = field.serialize(
+                value,
+                mode="python",
+                include=self.response_model_include,
+                exclude=self.response_model_exclude,
+                by_alias=self.response_model_by_alias,
+                exclude_unset=self.response_model_exclude_unset,
+                exclude_defaults=self.response_model_exclude_defaults,
+                exclude_none=self.response_model_exclude_none,
+            )
+        response = Response(
+            encode_binary(content, fmt),
+            status_code=sub_response.status_code or self.status_code or 200,
+            media_type=fmt.media_type,
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+
+_RESPONSE_PARAM = "_negotiated_response"
+
+
+class SerializedBody:
+    """A JSON response body encoded once per data version.
+
+    Carries a strong ETag derived from the bytes and lazily builds (then keeps)
+    gzip/brotli variants, each with its own ETag (see `encoded_etag`), so
+    serving a cached read is just picking bytes. Built
+    `from_content`, it also keeps the content, to encode the msgpack and CBOR
+    representations the first time one is asked for.
+    """
+
+    def __init__(self, body: bytes, media_type: str = "application/json", content: Any = None):
+        self.body = body
+        self.media_type = media_type
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.content = content
+        self._variants: Dict[str, bytes] = {}
+        self._formats: Dict[BinaryFormat, "SerializedBody"] = {}
+
+    @classmethod
+    def from_content(cls, content: Any) -> "SerializedBody":
+        with timed("serialize"):
+            return cls(encode_json(content), content=content)
+
+    def representation(self, fmt: Optional[BinaryFormat]) -> "SerializedBody":
+        if fmt is None or self.content is None:
+            return self
+        body = self._formats.get(fmt)
+        if body is None:
+            with timed("serialize"):
+                body = SerializedBody(encode_binary(self.content, fmt), fmt.media_type)
+            self._formats[fmt] = body
+        return body
+
+    def variant(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        data = self._variants.get(encoding)
+        if data is None:
+            with timed("compress"):
+                if encoding == "br":
+                    data = brotli.compress(self.body, quality=BROTLI_QUALITY)
+                else:
+                    # mtime=0 keeps the output (and thus any CDN copy) deterministic
+                    data = gzip.compress(self.body, compresslevel=9, mtime=0)
+            self._variants[encoding] = data
+        return data
+
+    def response(self, request: Request, headers: Optional[Dict[str, str]] = None) -> Response:
+        body = self.representation(choose_format(request.headers.get("accept")))
+        if body is not self:
+            return body.response(request, headers)
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        response_headers = {
+            "ETag": encoded_etag(self.etag, encoding),
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept, Accept-Encoding",
+            **(headers or {}),
+        }
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=response_headers)
+        if encoding is not None:
+            response_headers["Content-Encoding"] = encoding
+        return Response(content=self.variant(encoding), media_type=self.media_type, headers=response_headers)
+
+
+# Strong ETags name exact bytes, so each content-coding of a body gets its own
+ETAG_SUFFIXES = {"gzip": "-gz", "br": "-br"}
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """The ETag of `encoding`'s variant of the body tagged `etag` (None/identity: unchanged)."""
+    suffix = ETAG_SUFFIXES.get(encoding or "identity")
+    return etag[:-1] + suffix + '"' if suffix else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"; any content-coding
+    # of the same body matches too, whichever one the client cached
+    variants = {etag, *(encoded_etag(etag, encoding) for encoding in ETAG_SUFFIXES)}
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) in variants for tag in candidates)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick br, then gzip, from an Accept-Encoding header; None means identity."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
@@ -0,0 +1,194 @@
+import asyncio
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models import Experience, Project
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Field boosts: a hit in a title counts as much as three in the long description
+PROJECT_FIELDS = {"title": 3.0, "description": 2.0, "long_description": 1.0, "tech": 2.0, "highlights": 1.0}
+EXPERIENCE_FIELDS = {"title": 2.0, "company": 2.0, "achievements": 1.0, "tech": 2.0}
+
+# Query terms only matched as a prefix of an indexed term score this fraction
+PREFIX_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+class SearchIndex:
+    """In-memory inverted index with BM25 ranking, prefix matching and facet counts.
+
+    Documents can be added and removed one at a time, so writes update it
+    incrementally instead of rebuilding.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.terms: List[str] = []  # sorted, for prefix lookups
+        self.doc_lengths: Dict[str, float] = {}
+        self.doc_terms: Dict[str, List[str]] = {}
+        self.facets: Dict[str, Dict[str, List[str]]] = {}
+        self.payloads: Dict[str, Any] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: str, fields: Dict[str, Tuple[str, float]], facets: Dict[str, List[str]], payload: Any) -> None:
+        """Index `fields` ({name: (text, boost)}); replaces any document with the same id."""
+        self.remove(doc_id)
+        weights: Counter = Counter()
+        for text, boost in fields.values():
+            for token in tokenize(text):
+                weights[token] += boost
+        for term, weight in weights.items():
+            if term not in self.postings:
+                insort(self.terms, term)
+            self.postings[term][doc_id] = weight
+        length = sum(weights.values())
+        self.doc_lengths[doc_id] = length
+        self.doc_terms[doc_id] = list(weights)
+        self.facets[doc_id] = facets
+        self.payloads[doc_id] = payload
+        self._total_length += length
+
+    def remove(self, doc_id: str) -> None:
+        if doc_id not in self.doc_lengths:
+            return
+        for term in self.doc_terms.pop(doc_id):
+            postings = self.postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+                self.terms.pop(bisect_left(self.terms, term))
+        self._total_length -= self.doc_lengths.pop(doc_id)
+        self.facets.pop(doc_id, None)
+        self.payloads.pop(doc_id, None)
+
+    def _expand(self, token: str) -> Iterable[Tuple[str, float]]:
+        """Indexed terms matching `token`: itself, then longer terms it prefixes."""
+        start = bisect_left(self.terms, token)
+        for term in self.terms[start:]:
+            if not term.startswith(token):
+                break
+            yield term, 1.0 if term == token else PREFIX_WEIGHT
+
+    def search(self, query: str, filters: Optional[Dict[str, str]] = None) -> List[Tuple[str, float]]:
+        """(doc_id, score) for every match, best first. `filters` are exact facet values."""
+        if not self.doc_lengths:
+            return []
+        n_docs = len(self.doc_lengths)
+        avg_length = self._total_length / n_docs or 1.0
+        scores: Dict[str, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            for term, weight in self._expand(token):
+                postings = self.postings[term]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] += weight * idf * tf * (self.k1 + 1) / (tf + norm)
+        if filters:
+            scores = {
+                doc_id: score for doc_id, score in scores.items()
+                if all(value in self.facets[doc_id].get(name, []) for name, value in filters.items())
+            }
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def facet_counts(self, doc_ids: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        for doc_id in doc_ids:
+            for name, values in self.facets[doc_id].items():
+                counts[name].update(values)
+        return {name: dict(counter.most_common()) for name, counter in counts.items()}
+
+
+def project_document(project: Project) -> Tuple[str, dict, dict]:
+    fields = {name: (_field_text(getattr(project, name)), boost) for name, boost in PROJECT_FIELDS.items()}
+    facets = {"type": ["project"], "category": [project.category], "tech": list(project.tech)}
+    return f"project:{project.id}", fields, facets
+
+
+def experience_document(experience: Experience) -> Tuple[str, dict, dict]:
+    fields = {name: (_field_text(getattr(experience, name)), boost) for name, boost in EXPERIENCE_FIELDS.items()}
+    facets = {"type": ["experience"], "tech": list(experience.tech)}
+    return f"experience:{experience.id}", fields, facets
+
+
+class PortfolioSearch:
+    """Keeps a SearchIndex over projects and experience in step with the data.
+
+    Built lazily on the first search; project writes are applied incrementally,
+    anything else (a seed, a manual cache flush) marks it for a rebuild.
+    """
+
+    def __init__(self):
+        self.index = SearchIndex()
+        self.stale = True
+        self.generation = 0  # bumped by every change a rebuild in flight could miss
+        self._lock = asyncio.Lock()
+
+    async def ensure(
+        self,
+        load_projects: Callable[[], Awaitable[List[Project]]],
+        load_experience: Callable[[], Awaitable[List[Experience]]],
+    ) -> SearchIndex:
+        if not self.stale:
+            return self.index
+        async with self._lock:
+            if self.stale:
+                generation = self.generation
+                projects, experience = await asyncio.gather(load_projects(), load_experience())
+                index = SearchIndex()
+                for project in projects:
+                    self._add(index, project_document(project), project)
+                for item in experience:
+                    self._add(index, experience_document(item), item)
+                self.index = index
+                # A write that landed mid-build may be missing; rebuild next time
+                self.stale = generation != self.generation
+        return self.index
+
+    @staticmethod
+    def _add(index: SearchIndex, document: Tuple[str, dict, dict], payload: Any) -> None:
+        doc_id, fields, facets = document
+        index.add(doc_id, fields, facets, payload)
+
+    def add_projects(self, projects: Iterable[Project]) -> None:
+        if self.stale:
+            self.generation += 1  # the next rebuild picks them up
+            return
+        for project in projects:
+            self._add(self.index, project_document(project), project)
+
+    def add_experience(self, items: Iterable[Experience]) -> None:
+        if self.stale:
+            self.generation += 1
+            return
+        for item in items:
+            self._add(self.index, experience_document(item), item)
+
+    def remove(self, doc_ids: Iterable[str]) -> None:
+        """Drop documents by `project:<id>` / `experience:<id>`"""
+        if self.stale:
+            self.generation += 1
+            return
+        for doc_id in doc_ids:
+            self.index.remove(doc_id)
+
+    def invalidate(self) -> None:
+        self.stale = True
+        self.generation += 1
@@ -1,20 +1,49 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import json
+import time
+import base64
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
+from starlette.responses import FileResponse, PlainTextResponse, StreamingResponse
 from models import *
-from seed_data import *
+from cache import SnapshotCache
+from executor import BlockingExecutor
+from responses import CACHE_CONTROL, ModelJSONResponse, NegotiatedRoute, SerializedBody, etag_matches
+from metrics import Metrics, MetricsMiddleware, timed
+from ingest import IngestError, ProjectIngest, iter_ndjson_lines
+from search import PortfolioSearch
+from images import IMMUTABLE, Derivative, ImageError, service_from_env
+from github_sync import DEFAULT_EXCLUDED_REPOS, GITHUB_API_URL, GitHubSync
+from failover import FailoverRepository, HealthMonitor
+from snapshot import SharedSnapshot, SharedSnapshotMiddleware
+from changes import ChangeEvent, ChangeWatcher, MongoChangeSource, PostgresNotifySource
+from projection import Fields, resolve_complete_fields, resolve_fields, sparse_complete_model, sparse_model, with_image_srcset
+from contact_queue import ContactWriteQueue, QueueFullError
+from guards import DedupWindow, MemoryBucketStore, RateLimiter, RateLimitRule, RedisBucketStore, SingleFlight
+from repository import (
+    PORTFOLIO_COLLECTIONS,
+    MemoryRepository,
+    MongoRepository,
+    PortfolioRepository,
+    ReadOnlyRepositoryError,
+    SupabaseRepository,
+    build_seed_data,
+    keyset_of,
+    load_memory_data,
+)
 
 # Import legacy models for compatibility
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List
 import uuid
-from datetime import datetime
-from supabase import create_client, Client
+from datetime import datetime, timedelta
 
 class StatusCheck(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -27,151 +56,263 @@ class StatusCheckCreate(BaseModel):
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection (used if Supabase is not configured)
+# MongoDB connection (used if Supabase is not configured). Pool and timeout
+# settings map onto the MongoClient options of the same name
 mongo_url = os.environ.get('MONGO_URL')
-db = None
-client = None
-if mongo_url:
-    client = AsyncIOMotorClient(mongo_url)
-    db = client[os.environ['DB_NAME']]
+MONGO_CLIENT_OPTIONS = {
+    option: int(os.environ[variable])
+    for variable, option in (
+        ('MONGO_MAX_POOL_SIZE', 'maxPoolSize'),
+        ('MONGO_MIN_POOL_SIZE', 'minPoolSize'),
+        ('MONGO_MAX_IDLE_TIME_MS', 'maxIdleTimeMS'),
+        ('MONGO_WAIT_QUEUE_TIMEOUT_MS', 'waitQueueTimeoutMS'),
+        ('MONGO_CONNECT_TIMEOUT_MS', 'connectTimeoutMS'),
+        ('MONGO_SOCKET_TIMEOUT_MS', 'socketTimeoutMS'),
+        ('MONGO_SERVER_SELECTION_TIMEOUT_MS', 'serverSelectionTimeoutMS'),
+    )
+    if os.environ.get(variable)
+}
+# pymongo's 30s default would hold a request that long before failover kicks in
+MONGO_CLIENT_OPTIONS.setdefault('serverSelectionTimeoutMS', 5000)
+MONGO_CLIENT_OPTIONS['retryReads'] = os.environ.get('MONGO_RETRY_READS', 'true').lower() in ('1', 'true', 'yes')
 
 # Supabase connection (preferred when configured)
 SUPABASE_URL = os.environ.get('SUPABASE_URL')
 SUPABASE_SERVICE_ROLE_KEY = os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
-supabase: Optional[Client] = None
-if SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY:
-    supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+
+# The Supabase client is synchronous; its calls run on this bounded pool so a
+# round trip never blocks the event loop
+SUPABASE_MAX_CONCURRENCY = int(os.environ.get('SUPABASE_MAX_CONCURRENCY', '8'))
+supabase_executor = BlockingExecutor(max_workers=SUPABASE_MAX_CONCURRENCY, name='supabase')
+# Its HTTP pool: one connection per executor worker is enough; retries only
+# cover failed connection attempts, never a request that reached PostgREST
+SUPABASE_TIMEOUT = float(os.environ.get('SUPABASE_TIMEOUT', '10'))
+SUPABASE_CONNECT_TIMEOUT = float(os.environ.get('SUPABASE_CONNECT_TIMEOUT', '3'))
+SUPABASE_MAX_CONNECTIONS = int(os.environ.get('SUPABASE_MAX_CONNECTIONS', str(SUPABASE_MAX_CONCURRENCY)))
+SUPABASE_CONNECT_RETRIES = int(os.environ.get('SUPABASE_CONNECT_RETRIES', '1'))
+
+def _supabase_http_client():
+    import httpx
+
+    limits = httpx.Limits(max_connections=SUPABASE_MAX_CONNECTIONS, max_keepalive_connections=SUPABASE_MAX_CONNECTIONS)
+    return httpx.Client(
+        transport=httpx.HTTPTransport(limits=limits, retries=SUPABASE_CONNECT_RETRIES),
+        timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT),
+        follow_redirects=True,
+    )
+
+# Storage backend every handler goes through: PORTFOLIO_BACKEND=supabase|mongo|memory.
+# Defaults to Supabase when configured, then Mongo, then the in-memory backend
+# loaded once from PORTFOLIO_MEMORY_SOURCE (seed_data.py, or a frontend/src/data dir)
+PORTFOLIO_BACKEND = os.environ.get('PORTFOLIO_BACKEND', '').lower() or (
+    'supabase' if SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY else 'mongo' if mongo_url else 'memory'
+)
+
+def create_repository(backend: str) -> PortfolioRepository:
+    # Client libraries are imported here, so only the configured one is ever loaded
+    if backend == 'supabase':
+        if not (SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY):
+            raise RuntimeError("PORTFOLIO_BACKEND=supabase needs SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY")
+        from supabase import create_client
+        from supabase.lib.client_options import SyncClientOptions
+
+        client = create_client(
+            SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, options=SyncClientOptions(httpx_client=_supabase_http_client())
+        )
+        return SupabaseRepository(client, supabase_executor)
+    if backend == 'mongo':
+        if not (mongo_url and os.environ.get('DB_NAME')):
+            raise RuntimeError("PORTFOLIO_BACKEND=mongo needs MONGO_URL and DB_NAME")
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        return MongoRepository(AsyncIOMotorClient(mongo_url, **MONGO_CLIENT_OPTIONS)[os.environ['DB_NAME']])
+    if backend == 'memory':
+        return MemoryRepository(
+            load_memory_data(os.environ.get('PORTFOLIO_MEMORY_SOURCE', 'seed')),
+            writable=os.environ.get('PORTFOLIO_MEMORY_WRITABLE', 'false').lower() in ('1', 'true', 'yes'),
+        )
+    raise RuntimeError(f"Unknown PORTFOLIO_BACKEND '{backend}'")
+
+# Reads fail over to PORTFOLIO_FAILOVER backends (comma-separated, e.g. `mongo`
+# or `supabase,memory`) when the primary is down or slower than
+# PORTFOLIO_READ_TIMEOUT; writes always go to the primary
+PORTFOLIO_FAILOVER = [
+    name.strip().lower() for name in os.environ.get('PORTFOLIO_FAILOVER', '').split(',')
+    if name.strip() and name.strip().lower() != PORTFOLIO_BACKEND
+]
+PORTFOLIO_READ_TIMEOUT = float(os.environ.get('PORTFOLIO_READ_TIMEOUT', '5'))
+health_monitor = HealthMonitor(
+    interval=float(os.environ.get('PORTFOLIO_HEALTH_INTERVAL', '15')),
+    timeout=float(os.environ.get('PORTFOLIO_HEALTH_TIMEOUT', '2')),
+    failure_threshold=int(os.environ.get('PORTFOLIO_HEALTH_FAILURES', '2')),
+    slow_ms=float(os.environ.get('PORTFOLIO_HEALTH_SLOW_MS', '500')),
+    retry_after=float(os.environ.get('PORTFOLIO_HEALTH_RETRY_AFTER', '30')),
+)
+
+# Created on first use by open_repository() (the lifespan hook, or a script
+# driving `app` directly), so importing this module never touches a database
+repository: Optional[PortfolioRepository] = None
+
+def open_repository() -> PortfolioRepository:
+    global repository
+    if repository is None:
+        backends = [create_repository(name) for name in [PORTFOLIO_BACKEND] + PORTFOLIO_FAILOVER]
+        health_monitor.watch(backends)
+        repository = backends[0] if len(backends) == 1 else FailoverRepository(backends, health_monitor, PORTFOLIO_READ_TIMEOUT)
+    return repository
+
+def _backends() -> List[PortfolioRepository]:
+    return list(getattr(repository, "repositories", [repository]))
+
+# Snapshot cache for portfolio reads; invalidated by the write endpoints
+portfolio_cache = SnapshotCache(
+    ttl=float(os.environ.get('PORTFOLIO_CACHE_TTL', '300')),
+    max_entries=int(os.environ.get('PORTFOLIO_CACHE_MAX_ENTRIES', '256')),
+    # When every backend fails, serve the last snapshot that loaded (PORTFOLIO_STALE_IF_ERROR=false
+    # turns this off); HTTP errors such as a 404 are real answers, not outages
+    stale_if_error=(lambda error: not isinstance(error, HTTPException))
+    if os.environ.get('PORTFOLIO_STALE_IF_ERROR', 'true').lower() in ('1', 'true', 'yes') else None,
+)
+
+# Inverted index behind /portfolio/search; project writes update it in place
+portfolio_search = PortfolioSearch()
+
+# Resized project images and logos behind /api/images (images.py); None when
+# PORTFOLIO_IMAGES is not true or Pillow is missing, and projects then carry no image_srcset
+image_service = service_from_env()
+image_executor = BlockingExecutor(max_workers=int(os.environ.get('PORTFOLIO_IMAGE_WORKERS', '2')), name="images")
+
+# Multi-worker mode (gunicorn.conf.py sets PORTFOLIO_SHARED_SNAPSHOT): one publisher
+# process keeps every /portfolio read rendered in a memory-mapped file in that
+# directory and workers answer from it. Workers then skip warm-up, the change feed
+# and GitHub sync, and a write in a worker asks the publisher for a new version
+PORTFOLIO_SHARED_SNAPSHOT = os.environ.get('PORTFOLIO_SHARED_SNAPSHOT')
+shared_snapshot: Optional[SharedSnapshot] = None
+if PORTFOLIO_SHARED_SNAPSHOT:
+    shared_snapshot = SharedSnapshot(
+        Path(PORTFOLIO_SHARED_SNAPSHOT),
+        check_interval=float(os.environ.get('PORTFOLIO_SHARED_SNAPSHOT_CHECK', '1')),
+        max_age=float(os.environ.get('PORTFOLIO_SHARED_SNAPSHOT_MAX_AGE', '300')),
+    )
+    portfolio_cache.on_change = shared_snapshot.request_refresh
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await startup()
+    try:
+        yield
+    finally:
+        await shutdown()
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", route_class=NegotiatedRoute)
 
-# Collections (MongoDB only)
-if db is not None:
-    personal_collection = db.personal_info
-    education_collection = db.education
-    experience_collection = db.experience
-    projects_collection = db.projects
-    skills_collection = db.skills
-    contact_collection = db.contact_messages
+# Portfolio section loaders: cached model snapshots, shared by the single-section
+# endpoints and /portfolio/complete
 
-# Portfolio Data Endpoints
-@api_router.get("/portfolio/personal", response_model=PersonalInfo)
-async def get_personal_info():
-    """Get personal information"""
-    personal = await personal_collection.find_one({})
+# Rows from storage are validated in one pydantic-core call per list (see
+# benchmarks/bench_validation.py: faster than a model per row, and than model_construct)
+@lru_cache(maxsize=None)
+def _list_adapter(model) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+def _validate(model, rows: List[dict]) -> list:
+    with timed("validate"):
+        return _list_adapter(model).validate_python(rows)
+
+async def load_personal_info() -> PersonalInfo:
+    return await portfolio_cache.get_or_load(("personal_info",), _fetch_personal_info)
+
+async def _fetch_personal_info():
+    personal = await repository.get_personal_info()
     if not personal:
         raise HTTPException(status_code=404, detail="Personal information not found")
-    
-    # Convert MongoDB _id to id
-    personal['id'] = str(personal.pop('_id'))
-    return PersonalInfo(**personal)
+    return _validate(PersonalInfo, [personal])[0]
 
-@api_router.get("/portfolio/education", response_model=List[Education])
-async def get_education():
-    """Get education details"""
-    education_cursor = education_collection.find({}).sort("order", 1)
-    education_list = await education_cursor.to_list(length=None)
-    
-    for edu in education_list:
-        edu['id'] = str(edu.pop('_id'))
-    
-    return [Education(**edu) for edu in education_list]
+async def load_education() -> List[Education]:
+    return await portfolio_cache.get_or_load(("education",), _fetch_education)
 
-@api_router.get("/portfolio/experience", response_model=List[Experience])
-async def get_experience():
-    """Get work experience"""
-    experience_cursor = experience_collection.find({}).sort("order", 1)
-    experience_list = await experience_cursor.to_list(length=None)
-    
-    for exp in experience_list:
-        exp['id'] = str(exp.pop('_id'))
-    
-    return [Experience(**exp) for exp in experience_list]
+async def _fetch_education():
+    education_list = await repository.list_education()
+    return _validate(Education, education_list)
 
-@api_router.get("/portfolio/projects", response_model=List[Project])
-async def get_projects(category: Optional[str] = None, featured_only: bool = False):
-    """Get all projects with optional filtering. Uses Supabase if configured, otherwise MongoDB."""
-    # Supabase path
-    if supabase:
-        q = supabase.table('projects').select('*')
-        if category and category != 'all':
-            q = q.eq('category', category)
-        if featured_only:
-            q = q.eq('featured', True)
-        # Order by display order if exists, else updated_at
-        try:
-            q = q.order('order', desc=False)
-        except Exception:
-            try:
-                q = q.order('updated_at', desc=False)
-            except Exception:
-                pass
-        result = q.execute()
-        rows = result.data or []
-        # Ensure all required fields exist with sensible defaults
-        normalized = []
-        for row in rows:
-            row.setdefault('tech', [])
-            row.setdefault('highlights', [])
-            row.setdefault('demo', None)
-            row.setdefault('featured', False)
-            row.setdefault('status', 'completed')
-            normalized.append(row)
-        return [Project(**row) for row in normalized]
-
-    # MongoDB path
-    if db is None:
-        raise HTTPException(status_code=500, detail="No database configured")
-    query = {}
-    if category and category != "all":
-        query["category"] = category
-    if featured_only:
-        query["featured"] = True
-    projects_cursor = projects_collection.find(query).sort("order", 1)
-    projects_list = await projects_cursor.to_list(length=None)
-    for project in projects_list:
-        project['id'] = str(project.pop('_id'))
-    return [Project(**project) for project in projects_list]
+# `fields` (see projection.py) loads and validates only those columns; None is the full model
 
-@api_router.get("/portfolio/projects/featured", response_model=List[Project])
-async def get_featured_projects():
-    """Get featured projects only"""
-    return await get_projects(featured_only=True)
+async def load_experience(fields: Fields = None) -> List[Experience]:
+    key = ("experience",) if fields is None else ("experience", fields)
+    return await portfolio_cache.get_or_load(key, lambda: _fetch_experience(fields))
 
-@api_router.post("/portfolio/projects/bulk", response_model=List[Project])
-async def bulk_create_projects(projects: List[ProjectCreate]):
-    """Create multiple projects at once. Uses Supabase if configured, otherwise MongoDB."""
+async def _fetch_experience(fields: Fields = None):
+    experience_list = await repository.list_experience(fields)
+    return _validate(sparse_model(Experience, fields), experience_list)
+
+async def load_projects(category: Optional[str] = None, featured_only: bool = False, fields: Fields = None) -> List[Project]:
+    if category == "all":
+        category = None
+    key = ("projects", category, featured_only) + (() if fields is None else (fields,))
+    return await portfolio_cache.get_or_load(key, lambda: _fetch_projects(category, featured_only, fields))
+
+async def _fetch_projects(category: Optional[str], featured_only: bool, fields: Fields = None):
+    projects_list = await repository.list_projects(category, featured_only, fields)
+    return _validate(_project_model(fields), _with_srcset(projects_list))
+
+def _project_model(fields: Fields = None):
+    model = sparse_model(Project, fields)
+    return with_image_srcset(model) if image_service is not None and "image" in model.model_fields else model
+
+def _with_srcset(rows: List[dict]) -> List[dict]:
+    """Add image_srcset to project rows that have an image (derived, never stored).
+
+    Only images already resolved get one; the rest are resolved on image_executor
+    and the projects snapshots dropped once they are, so reads never hash files.
+    """
+    if image_service is None:
+        return rows
+    srcsets = {}
+    for row in rows:
+        image = row.get("image")
+        if image:
+            if image not in srcsets:
+                srcsets[image] = image_service.srcset(image)
+            row["image_srcset"] = srcsets[image]
+    _resolve_images(srcsets)
+    return rows
+
+# Images seen by reads, waiting for the resolver task (app.state.image_resolver)
+_images_to_resolve: set = set()
+
+def _resolve_images(images):
+    _images_to_resolve.update(images)
+    if not _images_to_resolve:
+        return
     try:
-        if supabase:
-            payload = [p.dict() for p in projects]
-            # Ensure arrays exist
-            for p in payload:
-                p.setdefault('tech', [])
-                p.setdefault('highlights', [])
-            result = supabase.table('projects').insert(payload).execute()
-            rows = result.data or []
-            return [Project(**row) for row in rows]
-
-        if db is None:
-            raise HTTPException(status_code=500, detail="No database configured")
-        created: List[Project] = []
-        for proj in projects:
-            project_obj = Project(**proj.dict())
-            result = await projects_collection.insert_one(project_obj.dict())
-            project_obj.id = str(result.inserted_id)
-            created.append(project_obj)
-        return created
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error creating projects: {str(e)}")
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return  # called outside the app (a script, a test): left pending for the next read
+    resolver = getattr(app.state, "image_resolver", None)
+    if resolver is None or resolver.done():
+        app.state.image_resolver = asyncio.ensure_future(_resolve_pending_images())
 
-@api_router.get("/portfolio/skills")
-async def get_skills():
-    """Get all skills grouped by category"""
-    skills_cursor = skills_collection.find({}).sort("order", 1)
-    skills_list = await skills_cursor.to_list(length=None)
+async def _resolve_pending_images():
+    while _images_to_resolve:
+        batch = list(_images_to_resolve)
+        _images_to_resolve.clear()
+        try:
+            changed = await image_executor.run(image_service.resolve, batch)
+        except Exception as e:
+            logger.warning("Resolving project images failed: %s", e)
+            continue
+        if changed:
+            portfolio_cache.invalidate("projects")
+
+async def load_skills() -> dict:
+    return await portfolio_cache.get_or_load(("skills",), _fetch_skills)
+
+async def _fetch_skills():
+    skills_list = await repository.list_skills()
     
     # Group skills by skill_group
     grouped_skills = {
@@ -181,125 +322,608 @@ async def get_skills():
         "aiMl": []
     }
     
-    for skill in skills_list:
-        skill['id'] = str(skill.pop('_id'))
-        skill_obj = Skill(**skill)
+    for skill_obj in _validate(Skill, skills_list):
         grouped_skills[skill_obj.skill_group].append(skill_obj)
     
     return grouped_skills
 
+# Aggregate endpoint settings: per-section timeout (seconds) and whether a failed
+# section fails the whole request or is reported in the `errors` map
+PORTFOLIO_SECTION_TIMEOUT = float(os.environ.get('PORTFOLIO_SECTION_TIMEOUT', '5'))
+PORTFOLIO_COMPLETE_PARTIAL = os.environ.get('PORTFOLIO_COMPLETE_PARTIAL', 'false').lower() in ('1', 'true', 'yes')
+
+async def load_complete_portfolio(partial: bool = False, fields: Optional[Dict[str, Fields]] = None) -> PortfolioComplete:
+    """Load every section concurrently; `fields` selects project/experience columns"""
+    fields = fields or {}
+    sections = {
+        "personal": load_personal_info,
+        "education": load_education,
+        "experience": lambda: load_experience(fields.get("experience")),
+        "projects": lambda: load_projects(fields=fields.get("projects")),
+        "skills": load_skills,
+    }
+    tasks = {
+        name: asyncio.create_task(asyncio.wait_for(loader(), PORTFOLIO_SECTION_TIMEOUT))
+        for name, loader in sections.items()
+    }
+    if partial:
+        await asyncio.wait(tasks.values())
+    else:
+        # Fail fast: stop waiting (and cancel the rest) on the first failing section
+        await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        for name, task in tasks.items():
+            if task.done() and task.exception() is not None:
+                for other in tasks.values():
+                    other.cancel()
+                _raise_section_error(name, task.exception())
+
+    results = {}
+    errors = {}
+    for name, task in tasks.items():
+        error = task.exception()
+        if error is None:
+            results[name] = task.result()
+        elif isinstance(error, HTTPException):
+            errors[name] = str(error.detail)
+        elif isinstance(error, asyncio.TimeoutError):
+            errors[name] = f"Timed out after {PORTFOLIO_SECTION_TIMEOUT}s"
+        else:
+            errors[name] = str(error) or type(error).__name__
+
+    model = sparse_complete_model(fields.get("projects"), fields.get("experience"))
+    return model(**results, errors=errors)
+
+def _raise_section_error(name: str, error: BaseException):
+    if isinstance(error, HTTPException):
+        raise error
+    if isinstance(error, asyncio.TimeoutError):
+        raise HTTPException(status_code=504, detail=f"Loading '{name}' timed out after {PORTFOLIO_SECTION_TIMEOUT}s")
+    raise HTTPException(status_code=500, detail=f"Error loading '{name}': {str(error)}")
+
+async def cached_json_response(request: Request, key: tuple, loader, cacheable=None) -> Response:
+    """Serve `loader()`'s result as JSON serialized once per data version, with ETag/304
+    and precompressed variants. `key` follows the portfolio cache's convention;
+    `cacheable(content)` can keep a result out of the cache."""
+    async def build():
+        content = await loader()
+        return SerializedBody.from_content(content), cacheable is None or cacheable(content)
+
+    body, _ = await portfolio_cache.get_or_load(key + ("body",), build, lambda entry: entry[1])
+    return body.response(request)
+
+# Portfolio Data Endpoints
+@api_router.get("/portfolio/personal", response_model=PersonalInfo)
+async def get_personal_info(request: Request):
+    """Get personal information"""
+    return await cached_json_response(request, ("personal_info",), load_personal_info)
+
+@api_router.get("/portfolio/education", response_model=List[Education])
+async def get_education(request: Request):
+    """Get education details"""
+    return await cached_json_response(request, ("education",), load_education)
+
+def _selection(resolve, *args):
+    try:
+        return resolve(*args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Sparse responses: `view=card|detail` or `fields=title,tech,...` (id is always included)
+FieldsQuery = Query(None, description="Comma-separated fields to return")
+ViewQuery = Query(None, description="Named field set: card or detail")
+
+@api_router.get("/portfolio/experience", response_model=List[Experience])
+async def get_experience(request: Request, fields: Optional[str] = FieldsQuery, view: Optional[str] = ViewQuery):
+    """Get work experience"""
+    selected = _selection(resolve_fields, Experience, view, fields)
+    key = ("experience",) if selected is None else ("experience", selected)
+    return await cached_json_response(request, key, lambda: load_experience(selected))
+
+@api_router.get("/portfolio/projects", response_model=List[Project])
+async def get_projects(
+    request: Request,
+    category: Optional[str] = None,
+    featured_only: bool = False,
+    fields: Optional[str] = FieldsQuery,
+    view: Optional[str] = ViewQuery,
+):
+    """Get all projects with optional filtering"""
+    if category == "all":
+        category = None
+    selected = _selection(resolve_fields, Project, view, fields)
+    return await cached_json_response(
+        request,
+        ("projects", category, featured_only) + (() if selected is None else (selected,)),
+        lambda: load_projects(category, featured_only, selected),
+    )
+
+@api_router.get("/portfolio/projects/featured", response_model=List[Project])
+async def get_featured_projects(request: Request, fields: Optional[str] = FieldsQuery, view: Optional[str] = ViewQuery):
+    """Get featured projects only"""
+    return await get_projects(request, featured_only=True, fields=fields, view=view)
+
+# Bulk project writes go to the repository in batches of this many rows
+PORTFOLIO_INGEST_BATCH_SIZE = int(os.environ.get('PORTFOLIO_INGEST_BATCH_SIZE', '500'))
+PORTFOLIO_INGEST_MAX_LINE_BYTES = int(os.environ.get('PORTFOLIO_INGEST_MAX_LINE_BYTES', str(1024 * 1024)))
+
+@api_router.post("/portfolio/projects/bulk", response_model=BulkIngestResult)
+async def bulk_create_projects(projects: List[ProjectCreate]):
+    """Create multiple projects at once, with one result per item.
+
+    A row the repository rejects is reported as failed instead of failing the
+    request, so the caller knows which items were written and can retry the rest.
+    """
+    ingest = ProjectIngest(repository, PORTFOLIO_INGEST_BATCH_SIZE, portfolio_search.add_projects)
+    try:
+        for item, project in enumerate(projects, 1):
+            await ingest.add(item, project)
+        await ingest.flush()
+        return ingest.summary()
+    except ReadOnlyRepositoryError as e:
+        raise HTTPException(status_code=405, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating projects ({ingest.created} rows already created): {str(e)}")
+    finally:
+        if ingest.created:
+            portfolio_cache.invalidate("projects")
+
+@api_router.post("/portfolio/projects/ingest", response_model=BulkIngestResult)
+async def ingest_projects(request: Request, batch_size: Optional[int] = Query(None, ge=1, le=10000)):
+    """Bulk import projects from a streamed NDJSON body (one ProjectCreate per line).
+
+    Rows are validated as they arrive and written in batches; the response has
+    one result per line instead of failing the whole import on a bad row.
+    """
+    ingest = ProjectIngest(repository, batch_size or PORTFOLIO_INGEST_BATCH_SIZE, portfolio_search.add_projects)
+    try:
+        async for line, raw in iter_ndjson_lines(request.stream(), PORTFOLIO_INGEST_MAX_LINE_BYTES):
+            await ingest.add_json(line, raw)
+        await ingest.flush()
+        return ingest.summary()
+    except IngestError as e:
+        raise HTTPException(status_code=413, detail=f"{str(e)} ({ingest.created} rows already created)")
+    except ReadOnlyRepositoryError as e:
+        raise HTTPException(status_code=405, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ingesting projects ({ingest.created} rows already created): {str(e)}")
+    finally:
+        if ingest.created:
+            portfolio_cache.invalidate("projects")
+
+@api_router.get("/portfolio/skills")
+async def get_skills(request: Request):
+    """Get all skills grouped by category"""
+    return await cached_json_response(request, ("skills",), load_skills)
+
 @api_router.get("/portfolio/complete", response_model=PortfolioComplete)
-async def get_complete_portfolio():
-    """Get all portfolio data in one request"""
-    personal = await get_personal_info()
-    education = await get_education()
-    experience = await get_experience()
-    projects = await get_projects()
-    skills = await get_skills()
-    
-    return PortfolioComplete(
-        personal=personal,
-        education=education,
-        experience=experience,
-        projects=projects,
-        skills=skills
+async def get_complete_portfolio(
+    request: Request,
+    partial: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated section.field names, e.g. projects.title"),
+    view: Optional[str] = ViewQuery,
+):
+    """Get all portfolio data in one request. Sections load concurrently.
+
+    `view` applies to the projects and experience lists; `fields` picks their
+    columns as `projects.<field>` / `experience.<field>`.
+    """
+    if partial is None:
+        partial = PORTFOLIO_COMPLETE_PARTIAL
+    selected = _selection(resolve_complete_fields, view, fields)
+    selection_key = tuple(selected.items()) if any(value is not None for value in selected.values()) else ()
+    # Depends on every collection; a body with section errors is never cached
+    return await cached_json_response(
+        request,
+        (PORTFOLIO_COLLECTIONS, "complete") + selection_key,
+        lambda: load_complete_portfolio(partial, selected),
+        cacheable=lambda portfolio: not portfolio.errors,
     )
 
-# Contact Endpoints
-@api_router.post("/contact", response_model=ContactMessage)
-async def submit_contact_form(form_data: ContactMessageCreate):
-    """Submit contact form. Uses Supabase if configured, otherwise MongoDB."""
+# Delta sync: every portfolio write gets the next data version in the repository's
+# change log (deletes as tombstones), so clients fetch only what changed since theirs
+PORTFOLIO_CHANGES_LIMIT = int(os.environ.get('PORTFOLIO_CHANGES_LIMIT', '1000'))
+# A missing version younger than this may be a write still committing; older ones were rolled back
+PORTFOLIO_CHANGES_GAP_GRACE = float(os.environ.get('PORTFOLIO_CHANGES_GAP_GRACE', '30'))
+# Seconds of history kept; a client further behind gets a reset (0 keeps everything)
+PORTFOLIO_CHANGES_RETENTION = float(os.environ.get('PORTFOLIO_CHANGES_RETENTION', str(30 * 86400)))
+
+@api_router.get("/portfolio/changes", response_model=PortfolioChanges)
+async def get_portfolio_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="`version` from the previous call; leave out for every row"),
+    limit: int = Query(PORTFOLIO_CHANGES_LIMIT, ge=1, le=10000, description="Change log entries to read"),
+):
+    """Rows upserted or deleted since data version `since`, with the version to ask from next.
+
+    Without `since`, or with a version older than the retained history or one
+    this backend never issued, the answer is `reset: true` with every row.
+    """
     try:
-        # Prefer Supabase if available
-        if supabase:
-            payload = form_data.dict()
-            payload.setdefault("status", "new")
-            result = supabase.table("contact_messages").insert(payload).execute()
-            rows = result.data or []
-            if not rows:
-                raise HTTPException(status_code=500, detail="Failed to save contact message")
-            row = rows[0]
-            # Normalize optional fields for Pydantic
-            row.setdefault("status", "new")
-            return ContactMessage(**row)
-
-        # Fallback to MongoDB
-        if db is None:
-            raise HTTPException(status_code=500, detail="No database configured")
-
-        message_obj = ContactMessage(**form_data.dict())
-        result = await contact_collection.insert_one(message_obj.dict())
-        message_obj.id = str(result.inserted_id)
-        return message_obj
+        oldest, newest = await repository.change_log_bounds()
+        if since is None or since > newest or since < oldest - 1:
+            # Every reset at one version is the same body, so it is cached like a section
+            return await cached_json_response(request, (PORTFOLIO_COLLECTIONS, "changes", newest), lambda: load_all_rows(newest))
+        changes = PortfolioChanges(version=since) if since == newest else await load_changes(since, limit)
     except HTTPException:
         raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading changes: {str(e)}")
+    return SerializedBody.from_content(changes).response(request)
+
+def _section_rows(collection: str, rows: List[dict]) -> list:
+    if collection == "projects":
+        return _validate(_project_model(), _with_srcset(rows))
+    return _validate(SECTION_MODELS[collection], rows)
+
+async def load_all_rows(version: int) -> PortfolioChanges:
+    # Read after `version` was, so rows may be newer than it; replaying those changes is harmless
+    personal, *lists = await asyncio.gather(
+        repository.get_personal_info(),
+        repository.list_education(),
+        repository.list_experience(),
+        repository.list_projects(),
+        repository.list_skills(),
+    )
+    rows = dict(zip(PORTFOLIO_COLLECTIONS, [[personal] if personal else []] + lists))
+    return PortfolioChanges(
+        version=version,
+        reset=True,
+        changes={collection: SectionChanges(upserted=_section_rows(collection, rows[collection])) for collection in PORTFOLIO_COLLECTIONS},
+    )
+
+async def load_changes(since: int, limit: int) -> PortfolioChanges:
+    logged = await repository.list_changes(since, limit)
+    entries = _settled(logged, since)
+    # Only the last entry per row matters, and the row's current state is the answer:
+    # a row that is gone now is a tombstone whatever was logged before
+    changed: Dict[str, Dict[str, None]] = {}
+    for entry in entries:
+        if entry["collection"] in SECTION_MODELS:
+            changed.setdefault(entry["collection"], {})[entry["id"]] = None
+    collections = list(changed)
+    found = await asyncio.gather(*(repository.get_rows(collection, list(changed[collection])) for collection in collections))
+    changes = {}
+    for collection, rows in zip(collections, found):
+        upserted = sorted(_section_rows(collection, rows), key=lambda row: getattr(row, "order", 0))
+        present = {row.id for row in upserted}
+        changes[collection] = SectionChanges(upserted=upserted, deleted=[row_id for row_id in changed[collection] if row_id not in present])
+    version = entries[-1]["version"] if entries else since
+    # Stopping at an unsettled gap is not `more`: the next poll picks it up
+    return PortfolioChanges(version=version, more=len(logged) == limit and len(entries) == limit, changes=changes)
+
+def _settled(entries: List[dict], since: int) -> List[dict]:
+    """`entries` up to the first gap in versions that may still be filled by a write in flight"""
+    expected = since + 1
+    cutoff = datetime.utcnow() - timedelta(seconds=PORTFOLIO_CHANGES_GAP_GRACE)
+    for i, entry in enumerate(entries):
+        if entry["version"] != expected and entry["changed_at"] > cutoff:
+            return entries[:i]
+        expected = entry["version"] + 1
+    return entries
+
+@api_router.get("/portfolio/search", response_model=SearchResult)
+async def search_portfolio(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    category: Optional[str] = None,
+    tech: Optional[str] = None,
+    kind: Optional[Literal["project", "experience"]] = Query(None, alias="type"),
+):
+    """Search projects and experience. Every query word also matches as a prefix;
+    results are BM25-ranked and `facets` counts category/tech/type over all matches."""
+    try:
+        index = await portfolio_search.ensure(load_projects, load_experience)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building search index: {str(e)}")
+    filters = {name: value for name, value in (("category", category), ("tech", tech), ("type", kind)) if value}
+    matches = index.search(q, filters)
+    return ModelJSONResponse(SearchResult(
+        query=q,
+        total=len(matches),
+        results=[
+            SearchHit(type=doc_type, id=item_id, score=round(score, 4), item=index.payloads[doc_id])
+            for doc_id, score in matches[:limit]
+            for doc_type, item_id in [doc_id.split(":", 1)]
+        ],
+        facets=index.facet_counts(doc_id for doc_id, _ in matches),
+    ))
+
+# Concurrent requests for the same derivative share one render
+_image_renders: Dict[tuple, asyncio.Task] = {}
+
+async def _derivative(src: str, width: int, fmt: str) -> Derivative:
+    key = (src, width, fmt)
+    task = _image_renders.get(key)
+    if task is None:
+        task = asyncio.ensure_future(image_executor.run(image_service.derivative, src, width, fmt))
+        _image_renders[key] = task
+        task.add_done_callback(lambda done: _rendered(key, done))
+    return await asyncio.shield(task)
+
+def _rendered(key: tuple, task: asyncio.Task):
+    _image_renders.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # retrieved here so a failure nobody waited for isn't logged as unhandled
+
+@api_router.get("/images/{variant}")
+async def get_image(
+    request: Request,
+    variant: str,
+    src: str = Query(..., max_length=2048, description="Public path (/images/projects/x.jpeg) or allow-listed URL"),
+    v: Optional[str] = Query(None, description="Content version from image_srcset"),
+):
+    """A resized copy of a project image or logo, e.g. `/api/images/480.webp?src=/logos/x.png`.
+
+    Widths and formats are whitelisted. URLs from `image_srcset` carry the
+    source's content hash in `v` and are served as immutable.
+    """
+    if image_service is None:
+        raise HTTPException(status_code=404, detail="Image derivatives are disabled")
+    width, _, fmt = variant.partition(".")
+    if not width.isdigit():
+        raise HTTPException(status_code=400, detail="Expected <width>.<format>, e.g. 480.webp")
+    try:
+        derivative = await _derivative(src, int(width), fmt)
+    except ImageError as e:
+        raise HTTPException(status_code=e.status, detail=str(e))
+    etag = f'"{derivative.path.name}"'
+    # A stale or missing version still gets the current image, just not cached for good
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE if v == derivative.digest else CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(derivative.path, media_type=derivative.media_type, headers=headers)
+
+# Per-client token buckets for /contact and /admin/* (RATE_LIMIT_ENABLED=false turns
+# them off). Buckets are per process unless RATE_LIMIT_REDIS_URL shares them
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RATE_LIMIT_TRUST_PROXY = os.environ.get('RATE_LIMIT_TRUST_PROXY', 'false').lower() in ('1', 'true', 'yes')
+rate_limiter = RateLimiter(
+    RedisBucketStore(os.environ['RATE_LIMIT_REDIS_URL']) if os.environ.get('RATE_LIMIT_REDIS_URL') else MemoryBucketStore(),
+    {
+        'contact': RateLimitRule.parse(os.environ.get('RATE_LIMIT_CONTACT', '5/minute')),
+        'admin': RateLimitRule.parse(os.environ.get('RATE_LIMIT_ADMIN', '30/minute;burst=10')),
+    },
+)
+
+def _client_address(request: Request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def rate_limited(rule: str):
+    """Dependency that spends one token of `rule` for the client and route, or answers 429"""
+    async def check(request: Request, response: Response):
+        if not RATE_LIMIT_ENABLED:
+            return
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        result = await rate_limiter.check(rule, f"{_client_address(request)}:{route}")
+        if result is None:
+            return
+        if not result.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, round(result.retry_after + 0.5))), "X-RateLimit-Remaining": "0"},
+            )
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+
+    return Depends(check)
+
+# Identical contact submissions inside CONTACT_DEDUP_WINDOW seconds get the first
+# acknowledgement back instead of a second write (0 disables)
+contact_dedup = DedupWindow(ttl=float(os.environ.get('CONTACT_DEDUP_WINDOW', '600')))
+
+# Contact submissions are acknowledged once journaled and written in batches
+# behind the request (CONTACT_WRITE_BEHIND=false writes inline instead)
+CONTACT_WRITE_BEHIND = os.environ.get('CONTACT_WRITE_BEHIND', 'true').lower() in ('1', 'true', 'yes')
+contact_queue = ContactWriteQueue(
+    lambda batch: repository.insert_contact_messages(batch),
+    Path(os.environ.get('CONTACT_JOURNAL_PATH', str(ROOT_DIR / 'contact_journal.ndjson'))),
+    max_depth=int(os.environ.get('CONTACT_QUEUE_MAX_DEPTH', '1000')),
+    batch_size=int(os.environ.get('CONTACT_BATCH_SIZE', '100')),
+    flush_interval=float(os.environ.get('CONTACT_FLUSH_INTERVAL', '0.5')),
+    fsync=os.environ.get('CONTACT_JOURNAL_FSYNC', 'false').lower() in ('1', 'true', 'yes'),
+    load=lambda raw: ContactMessage(**raw).dict(),
+)
+
+# Contact Endpoints
+@api_router.post("/contact", response_model=ContactMessage, dependencies=[rate_limited("contact")])
+async def submit_contact_form(form_data: ContactMessageCreate, response: Response):
+    """Submit contact form"""
+    dedup_key = DedupWindow.key(form_data.dict())
+    duplicate = contact_dedup.get(dedup_key)
+    if duplicate is not None:
+        # Same status as the first answer (202 when it was journaled), so one result reads one way
+        message_obj, response.status_code = duplicate
+        response.headers["X-Duplicate-Submission"] = "true"
+        return message_obj
+    message_obj = await _submit_contact_message(form_data, response)
+    contact_dedup.put(dedup_key, (message_obj, response.status_code))
+    return message_obj
+
+async def _submit_contact_message(form_data: ContactMessageCreate, response: Response) -> ContactMessage:
+    message_obj = ContactMessage(**form_data.dict())
+    if contact_queue.running:
+        if repository.read_only:
+            raise HTTPException(status_code=405, detail=f"The {repository.name} backend is read-only")
+        try:
+            contact_queue.submit(message_obj.dict())
+        except QueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+        except OSError as e:
+            raise HTTPException(status_code=503, detail=f"Could not journal contact message: {str(e)}")
+        response.status_code = 202
+        return message_obj
+    try:
+        row = await repository.insert_contact_message(message_obj.dict())
+        return ContactMessage(**row)
+    except ReadOnlyRepositoryError as e:
+        raise HTTPException(status_code=405, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error submitting contact form: {str(e)}")
 
+# Keyset pagination for the admin list endpoints: a page of at most `limit` rows,
+# newest first, plus an opaque X-Next-Cursor header when more rows may follow
+PAGE_LIMIT_DEFAULT = 100
+PAGE_LIMIT_MAX = 1000
+
+def _encode_cursor(keyset) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(keyset)).encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: Optional[str]):
+    if not cursor:
+        return None
+    try:
+        keyset = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(keyset) == 2 and all(isinstance(part, str) for part in keyset):
+            return tuple(keyset)
+    except ValueError:
+        pass
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _set_next_cursor(response: Response, rows: List[dict], limit: int, time_field: str):
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(keyset_of(rows[-1], time_field))
+
+def _ndjson_export(rows, model) -> StreamingResponse:
+    """Stream rows as NDJSON while they come off the repository, one line each"""
+    async def lines():
+        async for row in rows:
+            yield model(**row).model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @api_router.get("/contact/messages", response_model=List[ContactMessage])
-async def get_contact_messages():
-    """Get all contact messages (admin endpoint). Uses Supabase if configured, otherwise MongoDB."""
+async def get_contact_messages(
+    limit: int = Query(PAGE_LIMIT_DEFAULT, ge=1, le=PAGE_LIMIT_MAX),
+    cursor: Optional[str] = None,
+    status: Optional[Literal["new", "read", "replied"]] = None,
+    export_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+):
+    """Get contact messages, newest first (admin endpoint).
+
+    Paginate with `limit` and the `X-Next-Cursor` response header; `format=ndjson`
+    streams every matching message instead.
+    """
+    if export_format == "ndjson":
+        return _ndjson_export(repository.iter_contact_messages(status), ContactMessage)
+    after = _decode_cursor(cursor)
     try:
-        if supabase:
-            result = supabase.table("contact_messages").select("*").order("created_at", desc=True).execute()
-            rows = result.data or []
-            return [ContactMessage(**row) for row in rows]
-
-        if db is None:
-            raise HTTPException(status_code=500, detail="No database configured")
-
-        messages_cursor = contact_collection.find({}).sort("created_at", -1)
-        messages_list = await messages_cursor.to_list(length=None)
-        for message in messages_list:
-            message['id'] = str(message.pop('_id'))
-        return [ContactMessage(**message) for message in messages_list]
-    except HTTPException:
-        raise
+        messages_list = await repository.list_contact_messages(limit, after, status)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching contact messages: {str(e)}")
+    # Returned as a Response, so the cursor goes on it rather than on `response`
+    result = ModelJSONResponse(_list_adapter(ContactMessage).validate_python(messages_list))
+    _set_next_cursor(result, messages_list, limit, "created_at")
+    return result
 
 # Admin/Seed Endpoints
-@api_router.post("/admin/seed")
+# Overlapping seed requests share one run instead of racing each other
+seed_flight = SingleFlight()
+
+@api_router.post("/admin/seed", dependencies=[rate_limited("admin")])
 async def seed_database():
     """Seed database with initial portfolio data"""
+    result, coalesced = await seed_flight.run(_seed_database)
+    return {**result, "coalesced": coalesced}
+
+async def _seed_database() -> dict:
     try:
-        if db is None:
-            raise HTTPException(status_code=500, detail="No database configured")
-        # Clear existing data
-        await personal_collection.delete_many({})
-        await education_collection.delete_many({})
-        await experience_collection.delete_many({})
-        await projects_collection.delete_many({})
-        await skills_collection.delete_many({})
-        
-        # Insert personal info
-        personal_obj = PersonalInfo(**PERSONAL_INFO)
-        await personal_collection.insert_one(personal_obj.dict())
-        
-        # Insert education
-        for edu_data in EDUCATION_DATA:
-            edu_obj = Education(**edu_data)
-            await education_collection.insert_one(edu_obj.dict())
-        
-        # Insert experience
-        for exp_data in EXPERIENCE_DATA:
-            exp_obj = Experience(**exp_data)
-            await experience_collection.insert_one(exp_obj.dict())
-        
-        # Insert projects
-        for project_data in PROJECTS_DATA:
-            project_obj = Project(**project_data)
-            await projects_collection.insert_one(project_obj.dict())
-        
-        # Insert skills
-        for skill_data in SKILLS_DATA:
-            skill_obj = Skill(**skill_data)
-            await skills_collection.insert_one(skill_obj.dict())
-        
-        return {"message": "Database seeded successfully", "status": "success"}
+        started = time.perf_counter()
+        collections = await repository.replace_all(build_seed_data())
+        return {
+            "message": "Database seeded successfully",
+            "status": "success",
+            "seconds": round(time.perf_counter() - started, 4),
+            "collections": collections,
+        }
     
+    except ReadOnlyRepositoryError as e:
+        raise HTTPException(status_code=405, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error seeding database: {str(e)}")
+    finally:
+        # Even a partial seed has replaced data, so never keep the old snapshots
+        portfolio_cache.invalidate()
+        portfolio_search.invalidate()
+
+@api_router.get("/admin/diagnostics/query-plans", dependencies=[rate_limited("admin")])
+async def get_query_plans():
+    """explain() every Mongo endpoint query and flag COLLSCAN / in-memory SORT stages"""
+    mongo = next((backend for backend in _backends() if isinstance(backend, MongoRepository)), None)
+    if mongo is None:
+        raise HTTPException(status_code=400, detail=f"Query plans are only available for the mongo backend (using '{repository.name}')")
+    from indexes import explain_queries
+
+    try:
+        plans = await explain_queries(mongo)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error explaining queries: {str(e)}")
+    return {"ok": not any(plan["problems"] for plan in plans), "queries": plans}
+
+# Server-side GitHub sync: imports GITHUB_SYNC_USERNAME's public repos as projects
+# every GITHUB_SYNC_INTERVAL seconds (off when no username is set)
+GITHUB_SYNC_USERNAME = os.environ.get('GITHUB_SYNC_USERNAME')
+GITHUB_SYNC_INTERVAL = float(os.environ.get('GITHUB_SYNC_INTERVAL', '3600'))
+github_sync: Optional[GitHubSync] = None
+if GITHUB_SYNC_USERNAME:
+    github_sync = GitHubSync(
+        GITHUB_SYNC_USERNAME,
+        api_url=os.environ.get('GITHUB_API_URL', GITHUB_API_URL),
+        token=os.environ.get('GITHUB_TOKEN'),
+        exclude=[name for name in os.environ.get('GITHUB_SYNC_EXCLUDE', ','.join(DEFAULT_EXCLUDED_REPOS)).split(',') if name.strip()],
+    )
+
+def _github_synced(result: dict):
+    portfolio_cache.invalidate("projects")
+    portfolio_search.invalidate()
+
+@api_router.post("/admin/github/sync", dependencies=[rate_limited("admin")])
+async def sync_github(force: bool = False):
+    """Sync GitHub repos into projects now; `force` rewrites rows even when GitHub reports no change"""
+    if github_sync is None:
+        raise HTTPException(status_code=400, detail="GitHub sync is not configured (set GITHUB_SYNC_USERNAME)")
+    try:
+        result = await github_sync.sync(repository, force=force)
+    except ReadOnlyRepositoryError as e:
+        raise HTTPException(status_code=405, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Error syncing GitHub repos: {str(e)}")
+    if result["changed"]:
+        _github_synced(result)
+    return result
+
+@api_router.get("/admin/github/sync", dependencies=[rate_limited("admin")])
+async def get_github_sync_status():
+    """Outcome of the last GitHub sync"""
+    if github_sync is None:
+        return {"enabled": False}
+    return {"enabled": True, "username": github_sync.username, "interval": GITHUB_SYNC_INTERVAL, "last_result": github_sync.last_result}
+
+@api_router.get("/admin/contact-queue", dependencies=[rate_limited("admin")])
+async def get_contact_queue_stats():
+    """Depth and flush counters of the contact write-behind queue"""
+    return {"enabled": contact_queue.running, **contact_queue.stats(), "duplicates_suppressed": contact_dedup.hits}
+
+@api_router.get("/admin/cache", dependencies=[rate_limited("admin")])
+async def get_cache_stats():
+    """Report portfolio cache hit/miss counters"""
+    return {
+        **portfolio_cache.stats(),
+        "watcher": change_watcher.stats() if change_watcher is not None else None,
+        "shared_snapshot": shared_snapshot.stats() if shared_snapshot is not None else None,
+        "images": image_service.stats() if image_service is not None else None,
+    }
+
+@api_router.post("/admin/cache/invalidate", dependencies=[rate_limited("admin")])
+async def invalidate_cache(collection: Optional[str] = None):
+    """Drop cached portfolio snapshots (all, or a single collection)"""
+    portfolio_cache.invalidate(collection)
+    if collection in (None, "projects", "experience"):
+        portfolio_search.invalidate()
+    return portfolio_cache.stats()
 
 # Legacy endpoints (keeping for compatibility)
 @api_router.get("/")
@@ -310,25 +934,60 @@ async def root():
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
+    try:
+        await repository.insert_status_check(status_obj.dict())
+    except ReadOnlyRepositoryError as e:
+        raise HTTPException(status_code=405, detail=str(e))
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+async def get_status_checks(
+    limit: int = Query(PAGE_LIMIT_DEFAULT, ge=1, le=PAGE_LIMIT_MAX),
+    cursor: Optional[str] = None,
+    export_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+):
+    if export_format == "ndjson":
+        return _ndjson_export(repository.iter_status_checks(), StatusCheck)
+    status_checks = await repository.list_status_checks(limit, _decode_cursor(cursor))
+    result = ModelJSONResponse(_list_adapter(StatusCheck).validate_python(status_checks))
+    _set_next_cursor(result, status_checks, limit, "timestamp")
+    return result
 
 # Include the router in the main app
 app.include_router(api_router)
 
+if shared_snapshot is not None:
+    app.add_middleware(SharedSnapshotMiddleware, snapshot=shared_snapshot)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Request metrics (PORTFOLIO_METRICS) and the Server-Timing header
+# (PORTFOLIO_SERVER_TIMING); with both off the middleware isn't installed at all
+PORTFOLIO_METRICS = os.environ.get('PORTFOLIO_METRICS', 'false').lower() in ('1', 'true', 'yes')
+PORTFOLIO_SERVER_TIMING = os.environ.get('PORTFOLIO_SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+metrics = Metrics()
+if PORTFOLIO_METRICS or PORTFOLIO_SERVER_TIMING:
+    app.add_middleware(
+        MetricsMiddleware,
+        metrics=metrics,
+        record=PORTFOLIO_METRICS,
+        server_timing=PORTFOLIO_SERVER_TIMING,
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of the request metrics"""
+    if not PORTFOLIO_METRICS:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (set PORTFOLIO_METRICS=true)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Simple health endpoints for platform probes
 @app.get("/")
 async def health_root():
@@ -336,7 +995,29 @@ async def health_root():
 
 @app.get("/healthz")
 async def healthz():
-    return {"status": "ok"}
+    """Liveness: always 200 while the process serves requests, with each backend's
+    latest probe (no database round trip)"""
+    return {"status": "ok", "backends": health_monitor.report()}
+
+@app.get("/readyz")
+async def readyz(response: Response):
+    """Readiness: probes every backend now; 503 unless one of them can serve reads"""
+    if repository is None:
+        response.status_code = 503
+        return {"status": "starting", "backends": {}}
+    if not health_monitor.repositories:
+        health_monitor.watch(_backends())
+    backends = await health_monitor.probe_all()
+    ready = any(backend["status"] != "down" for backend in backends.values())
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if ready else "unavailable",
+        "primary": repository.name,
+        "failovers": getattr(repository, "failovers", 0),
+        "stale_served": portfolio_cache.stale_served,
+        "backends": backends,
+    }
 
 # Configure logging
 logging.basicConfig(
@@ -345,7 +1026,213 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    if client:
-        client.close()
\ No newline at end of file
+# Backends are created and warmed up by the lifespan hook rather than at import:
+# the first request after a cold start finds an open connection and loaded snapshots
+PORTFOLIO_WARM_UP = os.environ.get('PORTFOLIO_WARM_UP', 'true').lower() in ('1', 'true', 'yes')
+PORTFOLIO_WARM_UP_TIMEOUT = float(os.environ.get('PORTFOLIO_WARM_UP_TIMEOUT', '10'))
+
+# Live refresh (PORTFOLIO_WATCH_CHANGES): a background watcher applies every write to
+# the portfolio collections, from this process or any other, to the cached snapshots
+# and the search index as it happens. Mongo needs a replica set for change streams;
+# Supabase needs SUPABASE_DB_URL (a direct Postgres connection), the asyncpg package
+# and the notify triggers in supabase_schema.sql. While it runs, snapshots don't
+# expire unless PORTFOLIO_CACHE_TTL is set explicitly
+PORTFOLIO_WATCH_CHANGES = os.environ.get('PORTFOLIO_WATCH_CHANGES', 'false').lower() in ('1', 'true', 'yes')
+SUPABASE_DB_URL = os.environ.get('SUPABASE_DB_URL')
+# A batch with more changes than this for one collection reloads it instead of patching
+PORTFOLIO_WATCH_MAX_PATCH = int(os.environ.get('PORTFOLIO_WATCH_MAX_PATCH', '200'))
+change_watcher: Optional[ChangeWatcher] = None
+
+SECTION_MODELS = {"personal_info": PersonalInfo, "education": Education, "experience": Experience, "projects": Project, "skills": Skill}
+
+def apply_changes(events: List[ChangeEvent]):
+    grouped: Dict[str, List[ChangeEvent]] = {}
+    for event in events:
+        if event.collection in SECTION_MODELS:
+            grouped.setdefault(event.collection, []).append(event)
+    for collection, changes in grouped.items():
+        try:
+            changed = _changed_rows(collection, changes)
+            if changed is not None:
+                portfolio_cache.patch(collection, lambda key, value: _patch_snapshot(collection, key, value, changed))
+                _patch_search(collection, changed)
+                continue
+        except Exception as e:
+            logger.warning("Could not apply %d %s changes, reloading instead: %s", len(changes), collection, e)
+        portfolio_cache.invalidate(collection)
+        if collection in ("projects", "experience"):
+            portfolio_search.invalidate()
+
+def _changed_rows(collection: str, changes: List[ChangeEvent]) -> Optional[Dict[str, Optional[BaseModel]]]:
+    """The final state of each changed row (None: deleted), validated once; None
+    when the batch can't be patched in (too large, a reset, a row not sent)"""
+    if len(changes) > PORTFOLIO_WATCH_MAX_PATCH:
+        return None
+    changed: Dict[str, Optional[BaseModel]] = {}
+    for change in changes:
+        if change.op == "reset" or (change.op == "upsert" and change.document is None):
+            return None
+        if change.op == "delete":
+            changed[change.id] = None
+        elif collection == "projects":
+            changed[change.id] = _project_model()(**_with_srcset([dict(change.document)])[0])
+        else:
+            changed[change.id] = SECTION_MODELS[collection](**change.document)
+    return changed
+
+def _patch_snapshot(collection: str, key: tuple, value, changed: Dict[str, Optional[BaseModel]]):
+    # Serialized bodies and /complete are rebuilt from the patched section snapshots
+    if isinstance(key[0], tuple) or key[-1] == "body":
+        return None
+    if collection == "personal_info":
+        rows = [row for row in changed.values() if row is not None]
+        return rows[-1] if rows else (None if value.id in changed else value)
+    if collection == "skills":
+        grouped = {group: [] for group in value}
+        for skill in _patch_rows([skill for group in value.values() for skill in group], changed, lambda fields: Skill):
+            grouped.setdefault(skill.skill_group, []).append(skill)
+        return grouped
+    if collection == "projects":
+        category, featured_only = key[1], key[2]
+        return _patch_rows(
+            value, changed, _project_model, key[3] if len(key) > 3 else None,
+            lambda project: (not category or project.category == category) and (project.featured or not featured_only),
+        )
+    model = SECTION_MODELS[collection]
+    return _patch_rows(value, changed, lambda fields: sparse_model(model, fields), key[1] if len(key) > 1 else None)
+
+def _patch_rows(rows: list, changed: Dict[str, Optional[BaseModel]], model_for, fields: Fields = None, keep=lambda row: True):
+    """`model_for(fields)` is the model the snapshot holds for a selection"""
+    if fields is not None and "order" not in fields:
+        return None  # nowhere to place a row without its sort key: reload this selection
+    by_id = {row.id: row for row in rows}
+    for row_id, row in changed.items():
+        by_id.pop(row_id, None)
+        if row is not None and keep(row):
+            if fields is not None:
+                model = model_for(fields)
+                row = model(**row.model_dump(include=set(model.model_fields)))
+            by_id[row_id] = row
+    return sorted(by_id.values(), key=lambda row: row.order)
+
+def _patch_search(collection: str, changed: Dict[str, Optional[BaseModel]]):
+    if collection not in ("projects", "experience"):
+        return
+    prefix = "project" if collection == "projects" else "experience"
+    portfolio_search.remove(f"{prefix}:{row_id}" for row_id, row in changed.items() if row is None)
+    rows = [row for row in changed.values() if row is not None]
+    (portfolio_search.add_projects if collection == "projects" else portfolio_search.add_experience)(rows)
+
+def _reset_snapshots():
+    portfolio_cache.invalidate()
+    portfolio_search.invalidate()
+
+def create_change_watcher() -> Optional[ChangeWatcher]:
+    primary = getattr(repository, "primary", repository)
+    if isinstance(primary, MongoRepository):
+        source = MongoChangeSource(primary.db)
+    elif isinstance(primary, SupabaseRepository) and SUPABASE_DB_URL:
+        source = PostgresNotifySource(SUPABASE_DB_URL)
+    else:
+        logger.warning("PORTFOLIO_WATCH_CHANGES has no change feed for the %s backend%s", primary.name,
+                       " (set SUPABASE_DB_URL)" if isinstance(primary, SupabaseRepository) else "")
+        return None
+    return ChangeWatcher(source, apply_changes, _reset_snapshots)
+
+background_tasks: List[asyncio.Task] = []
+
+async def startup():
+    started = time.perf_counter()
+    open_repository()
+    # Reads work without indexes (just slower), so building them never delays startup
+    background_tasks.append(asyncio.create_task(ensure_indexes()))
+    # With a shared snapshot the publisher process does the reading
+    if PORTFOLIO_WATCH_CHANGES and shared_snapshot is None:
+        await start_change_watcher()
+    if PORTFOLIO_WARM_UP and shared_snapshot is None:
+        await warm_up()
+    start_contact_queue()
+    if shared_snapshot is None:
+        start_github_sync()
+        if PORTFOLIO_CHANGES_RETENTION > 0:
+            background_tasks.append(asyncio.create_task(prune_changes_forever()))
+    if health_monitor.interval > 0:
+        background_tasks.append(asyncio.create_task(health_monitor.run_forever()))
+    logger.info("Started with the %s backend in %.3fs", repository.name, time.perf_counter() - started)
+
+async def ensure_indexes():
+    if os.environ.get('MONGO_ENSURE_INDEXES', 'true').lower() not in ('1', 'true', 'yes'):
+        return
+    from indexes import ensure_mongo_indexes
+
+    for backend in _backends():
+        if isinstance(backend, MongoRepository):
+            try:
+                await ensure_mongo_indexes(backend.db)
+            except Exception as e:
+                logger.warning("Could not ensure Mongo indexes: %s", e)
+
+async def warm_up():
+    """Open the database connections and load every portfolio section into the cache"""
+    async def run():
+        await health_monitor.probe_all()
+        await load_complete_portfolio(partial=True)
+
+    try:
+        await asyncio.wait_for(run(), PORTFOLIO_WARM_UP_TIMEOUT)
+    except Exception as e:
+        # The first requests will retry on their own; a slow database must not block startup
+        logger.warning("Warm-up of the %s backend failed: %s", repository.name, str(e) or type(e).__name__)
+
+async def start_change_watcher():
+    global change_watcher
+    change_watcher = create_change_watcher()
+    if change_watcher is None:
+        return
+    background_tasks.append(asyncio.create_task(change_watcher.run_forever()))
+    # Warm up only once the feed is open, so no change lands between the two
+    try:
+        await asyncio.wait_for(change_watcher.connected.wait(), PORTFOLIO_WARM_UP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Change stream not open after %.0fs; snapshots expire on the TTL until it is", PORTFOLIO_WARM_UP_TIMEOUT)
+        return
+    if 'PORTFOLIO_CACHE_TTL' not in os.environ:
+        portfolio_cache.ttl = 0
+
+def start_contact_queue():
+    if CONTACT_WRITE_BEHIND:
+        recovered = contact_queue.start()
+        if recovered:
+            logger.info("Replaying %d journaled contact messages", recovered)
+
+async def prune_changes_forever(interval: float = 3600):
+    while True:
+        try:
+            pruned = await repository.prune_changes(datetime.utcnow() - timedelta(seconds=PORTFOLIO_CHANGES_RETENTION))
+            if pruned:
+                logger.info("Pruned %d change log entries", pruned)
+        except Exception as e:
+            logger.warning("Could not prune the change log: %s", e)
+        await asyncio.sleep(interval)
+
+def start_github_sync():
+    if github_sync is not None and GITHUB_SYNC_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(github_sync.run_forever(repository, GITHUB_SYNC_INTERVAL, _github_synced)))
+
+async def shutdown():
+    # Drain queued contact messages while the database is still open
+    await contact_queue.close()
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    resolver = getattr(app.state, "image_resolver", None)
+    if resolver is not None:
+        resolver.cancel()
+        app.state.image_resolver = None
+    _images_to_resolve.clear()
+    if github_sync is not None:
+        github_sync.close()
+    if repository is not None:
+        await repository.close()
+    supabase_executor.shutdown()
+    image_executor.shutdown()
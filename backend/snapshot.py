@@ -0,0 +1,390 @@
+"""Shared read snapshot for multi-worker deployments (see gunicorn.conf.py).
+
+    python snapshot.py publish [--dir /dev/shm/portfolio-snapshot] [--interval 60] [--keep 2]
+
+One publisher process requests every /portfolio read endpoint from `server:app`
+in each content encoding and writes the responses to a single immutable file:
+
+    magic (8 bytes) | index length (8 bytes, little endian) | JSON index | bodies
+
+`CURRENT` is then pointed at it with an atomic rename (and rewritten on every
+republish as a heartbeat, even when nothing changed). Workers mmap the file
+`CURRENT` names and answer matching GETs from the mapping; the body sent is a
+memoryview of the shared pages, so every worker serves the same copy in RAM.
+A worker notices a new version at most `check_interval` seconds after it is
+published, and since files never change after publishing it always serves one
+whole version.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, urlencode
+
+from responses import choose_encoding, choose_format, encoded_etag, etag_matches
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PSNAP001"
+CURRENT = "CURRENT"
+REFRESH = "REFRESH"  # a worker writes a timestamp here after a write, so the publisher reloads
+PREFIX = "/api/portfolio/"
+ENCODINGS = ("identity", "gzip", "br")
+# Response headers kept in the snapshot; the length and encoding are per variant
+KEPT_HEADERS = {"content-type", "etag", "cache-control", "vary"}
+PUBLISH_TIMEOUT = 60.0
+
+
+def default_directory() -> Path:
+    shm = Path("/dev/shm")  # RAM-backed on Linux, so the mapping never touches disk
+    return (shm if shm.is_dir() else Path(tempfile.gettempdir())) / "portfolio-snapshot"
+
+
+def snapshot_key(path: str, query_string: bytes = b"") -> str:
+    """Request path plus its query in a canonical order and encoding."""
+    query = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    if not query:
+        return path
+    return path + "?" + urlencode(sorted(query), quote_via=quote, safe="")
+
+
+class MappedSnapshot:
+    """One published snapshot file, mapped read-only."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a portfolio snapshot")
+        (index_length,) = struct.unpack_from("<Q", self.map, len(MAGIC))
+        start = len(MAGIC) + 8
+        index = json.loads(self.map[start:start + index_length])
+        self.version: str = index["version"]
+        self.routes: Dict[str, dict] = index["routes"]
+        self._base = start + index_length
+        self._view = memoryview(self.map)
+
+    def body(self, span: List[int]) -> memoryview:
+        offset, length = span
+        return self._view[self._base + offset:self._base + offset + length]
+
+
+def write_snapshot(directory: Path, routes: Dict[str, dict], keep: int = 2, refreshed: float = 0.0) -> str:
+    """Publish `routes` ({key: {"headers": [...], "variants": {encoding: body}}})
+    and return its version. `refreshed` is the newest refresh request the data
+    reflects. The file is only written when the bodies changed."""
+    digest = hashlib.sha256()
+    for key in sorted(routes):
+        digest.update(key.encode() + b"\0" + routes[key]["variants"]["identity"] + b"\0")
+    version = digest.hexdigest()[:16]
+    name = f"snapshot-{version}.bin"
+    if _read_pointer(directory)[0] != name:
+        _write_file(directory, name, version, routes)
+    pointer = directory / (CURRENT + ".tmp")
+    pointer.write_text(f"{name}\n{refreshed!r}\n")
+    os.replace(pointer, directory / CURRENT)
+
+    # Unlinking a file a worker still maps is safe; the pages go when it unmaps
+    published = sorted(directory.glob("snapshot-*.bin"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for stale in [path for path in published if path.name != name][max(keep - 1, 0):]:
+        stale.unlink(missing_ok=True)
+    return version
+
+
+def _write_file(directory: Path, name: str, version: str, routes: Dict[str, dict]) -> None:
+    index = {"version": version, "published_at": time.time(), "routes": {}}
+    blobs: List[bytes] = []
+    offset = 0
+    for key, route in sorted(routes.items()):
+        spans = {}
+        for encoding, body in route["variants"].items():
+            spans[encoding] = [offset, len(body)]
+            blobs.append(body)
+            offset += len(body)
+        index["routes"][key] = {"headers": route["headers"], "etag": route["etag"], "variants": spans}
+    encoded = json.dumps(index, separators=(",", ":")).encode()
+
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / (name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(encoded)) + encoded)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, directory / name)
+
+
+def _read_pointer(directory: Path) -> Tuple[Optional[str], float]:
+    """(snapshot file name, refresh timestamp it covers) from `CURRENT`"""
+    try:
+        name, refreshed = (directory / CURRENT).read_text().split()
+        return name, float(refreshed)
+    except (FileNotFoundError, ValueError):
+        return None, 0.0
+
+
+def _read_stamp(path: Path) -> float:
+    try:
+        return float(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return 0.0
+
+
+class SharedSnapshot:
+    """A worker's view of the published snapshot.
+
+    `current()` re-reads `CURRENT` at most every `check_interval` seconds and
+    returns None while nothing is published, when the publisher hasn't touched
+    it for `max_age` seconds (it has probably died), or after this worker wrote
+    data and asked for a refresh that hasn't been published yet.
+    """
+
+    def __init__(self, directory: Path, check_interval: float = 1.0, max_age: float = 300.0):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self.served = 0
+        self._snapshot: Optional[MappedSnapshot] = None
+        self._name: Optional[str] = None
+        self._fresh = False
+        self._checked_at = float("-inf")
+        self._refreshed = 0.0  # refresh timestamp the published snapshot covers
+        self._requested = 0.0  # this worker's last refresh request
+
+    def current(self) -> Optional[MappedSnapshot]:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._check()
+        if not self._fresh or self._snapshot is None or self._refreshed < self._requested:
+            return None
+        return self._snapshot
+
+    def _check(self) -> None:
+        try:
+            stat = os.stat(self.directory / CURRENT)
+            self._fresh = self.max_age <= 0 or time.time() - stat.st_mtime < self.max_age
+            name, self._refreshed = _read_pointer(self.directory)
+            if name and name != self._name:
+                self._snapshot = MappedSnapshot(self.directory / name)
+                self._name = name
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning("Could not map the shared snapshot: %s", e)
+            self._fresh = False
+
+    def request_refresh(self, collection: Optional[str] = None) -> None:
+        """Called after this worker changed data: stop serving the old version and
+        ask the publisher for a new one."""
+        self._requested = time.time()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / REFRESH).write_text(repr(self._requested))
+        except OSError as e:
+            logger.warning("Could not request a snapshot refresh: %s", e)
+
+    def stats(self) -> Dict[str, object]:
+        snapshot = self.current()
+        return {
+            "directory": str(self.directory),
+            "version": snapshot.version if snapshot is not None else None,
+            "routes": len(snapshot.routes) if snapshot is not None else 0,
+            "served": self.served,
+        }
+
+
+class _SnapshotRoute:
+    # Stands in for the matched route in scope["route"], so metrics label by path
+    def __init__(self, path: str):
+        self.path = path
+
+
+class SharedSnapshotMiddleware:
+    """Answers GET/HEAD requests for published /portfolio reads from the shared
+    snapshot; everything else (and everything while none is published) goes to the app.
+    Only JSON is published, so requests negotiating msgpack or CBOR go to the app too."""
+
+    def __init__(self, app, snapshot: SharedSnapshot):
+        self.app = app
+        self.snapshot = snapshot
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or not scope["path"].startswith(PREFIX):
+            await self.app(scope, receive, send)
+            return
+        snapshot = self.snapshot.current()
+        route = snapshot.routes.get(snapshot_key(scope["path"], scope["query_string"])) if snapshot is not None else None
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = {name: value for name, value in scope["headers"] if name in (b"if-none-match", b"accept-encoding", b"accept")}
+        accept = request_headers.get(b"accept")
+        if accept and choose_format(accept.decode("latin-1")) is not None:
+            await self.app(scope, receive, send)
+            return
+
+        scope["route"] = _SnapshotRoute(scope["path"])
+        self.snapshot.served += 1
+        accept_encoding = request_headers.get(b"accept-encoding")
+        encoding = choose_encoding(accept_encoding.decode("latin-1") if accept_encoding else None) or "identity"
+        if encoding not in route["variants"]:
+            encoding = "identity"
+        # Stored headers carry the identity ETag; each variant is sent with its own
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in route["headers"] if name != "etag"]
+        headers.append((b"etag", encoded_etag(route["etag"], encoding).encode("latin-1")))
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match and etag_matches(if_none_match.decode("latin-1"), route["etag"]):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        body = snapshot.body(route["variants"][encoding])
+        headers.append((b"content-length", str(len(body)).encode()))
+        if encoding != "identity":
+            headers.append((b"content-encoding", encoding.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+
+# Card views the frontend requests, on top of export_static's endpoint list
+CARD_ENDPOINTS = (
+    "/portfolio/projects?view=card",
+    "/portfolio/projects/featured?view=card",
+    "/portfolio/experience?view=card",
+    "/portfolio/complete?view=card",
+)
+
+
+async def render_snapshot(client) -> Dict[str, dict]:
+    """GET every read endpoint from the app in each encoding; routes for write_snapshot."""
+    from export_static import read_endpoints
+
+    routes: Dict[str, dict] = {}
+    for endpoint in await read_endpoints(client) + list(CARD_ENDPOINTS):
+        path, _, query = ("/api" + endpoint).partition("?")
+        route = None
+        for encoding in ENCODINGS:
+            url = path + ("?" + query if query else "")
+            async with client.stream("GET", url, headers={"Accept-Encoding": encoding}) as response:
+                if response.status_code != 200:
+                    break  # not cacheable right now (e.g. a section failed); workers ask the app
+                # aiter_raw: the bytes as sent, still compressed
+                body = b"".join([chunk async for chunk in response.aiter_raw()])
+            if route is None:  # identity comes first, so these are the identity headers
+                route = {
+                    "etag": response.headers["etag"],
+                    "headers": [[name, value] for name, value in response.headers.items() if name in KEPT_HEADERS],
+                    "variants": {},
+                }
+            route["variants"][response.headers.get("content-encoding", "identity")] = body
+        if route is not None and "identity" in route["variants"]:
+            routes[snapshot_key(path, query.encode())] = route
+    return routes
+
+
+async def publish_forever(directory: Path, interval: float = 60.0, keep: int = 2, poll: float = 0.5) -> None:
+    """Publish now, then again when a worker asks (after a write), when the change
+    watcher has applied changes, or every `interval` seconds."""
+    import httpx
+
+    import server
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    refresh = directory / REFRESH
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://snapshot") as client:
+            requested = _read_stamp(refresh)
+            while True:
+                data_version = _data_version(server.portfolio_cache)
+                try:
+                    version = await asyncio.wait_for(_publish(client, directory, keep, requested), PUBLISH_TIMEOUT)
+                    logger.info("Published snapshot %s", version)
+                except Exception as e:
+                    logger.warning("Could not publish the portfolio snapshot: %s", str(e) or type(e).__name__)
+                deadline = time.monotonic() + interval
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(poll)
+                    if _read_stamp(refresh) != requested:
+                        requested = _read_stamp(refresh)
+                        # The write happened in a worker, so this process's snapshots are stale
+                        server.portfolio_cache.invalidate()
+                        server.portfolio_search.invalidate()
+                        break
+                    if _data_version(server.portfolio_cache) != data_version:
+                        break
+
+
+async def _publish(client, directory: Path, keep: int, refreshed: float) -> str:
+    routes = await render_snapshot(client)
+    return await asyncio.get_running_loop().run_in_executor(None, write_snapshot, directory, routes, keep, refreshed)
+
+
+def _data_version(cache) -> Tuple:
+    stats = cache.stats()
+    return stats["version"], tuple(sorted(stats["collection_versions"].items()))
+
+
+class PublisherProcess:
+    """Runs `snapshot.py publish` next to the gunicorn master, restarting it if it exits."""
+
+    def __init__(self, directory: Path, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self.process = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self._supervise, name="snapshot-publisher", daemon=True).start()
+
+    def _supervise(self) -> None:
+        env = dict(os.environ)
+        env.pop("PORTFOLIO_SHARED_SNAPSHOT", None)  # it publishes the snapshot, it doesn't read it
+        env["CONTACT_WRITE_BEHIND"] = "false"  # serves no contact requests, so needs no journal
+        command = [sys.executable, str(Path(__file__).resolve()), "publish",
+                   "--dir", str(self.directory), "--interval", str(self.interval)]
+        backoff = 1.0
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            self.process = subprocess.Popen(command, cwd=Path(__file__).resolve().parent, env=env)
+            code = self.process.wait()
+            if self._stopping.is_set():
+                return
+            backoff = 1.0 if time.monotonic() - started > 60 else min(backoff * 2, 60.0)
+            logger.warning("Snapshot publisher exited with %s, restarting in %.0fs", code, backoff)
+            self._stopping.wait(backoff)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+
+def _main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["publish"])
+    parser.add_argument("--dir", type=Path, default=default_directory())
+    parser.add_argument("--interval", type=float, default=60.0, help="seconds between republishing when nothing changes")
+    parser.add_argument("--keep", type=int, default=2, help="snapshot files to keep, including the current one")
+    args = parser.parse_args()
+
+    os.environ.pop("PORTFOLIO_SHARED_SNAPSHOT", None)
+    try:
+        asyncio.run(publish_forever(args.dir, args.interval, args.keep))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -8,6 +8,7 @@ create table if not exists public.projects (
   category text not null,
   featured boolean not null default false,
   github text not null,
+  github_repo text null, -- owner/name, set only on rows imported by the GitHub sync
   demo text null,
   image text not null,
   status text not null check (status in ('completed','in-progress')),
@@ -69,3 +70,222 @@ create policy "Contact read (admin)" on public.contact_messages
 drop policy if exists "Contact write (service)" on public.contact_messages;
 create policy "Contact write (service)" on public.contact_messages
   for all using (auth.role() = 'service_role') with check (auth.role() = 'service_role');
+
+-- Remaining portfolio tables, so every endpoint can run on Supabase alone
+create table if not exists public.personal_info (
+  id uuid primary key default gen_random_uuid(),
+  name text not null,
+  title text not null,
+  email text not null,
+  github text not null,
+  linkedin text not null,
+  location text not null,
+  bio text not null,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now()
+);
+
+create table if not exists public.education (
+  id uuid primary key default gen_random_uuid(),
+  degree text not null,
+  institution text not null,
+  location text not null,
+  period text not null,
+  gpa text not null,
+  type text not null check (type in ('masters','bachelors','phd')),
+  "order" int not null default 0,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now()
+);
+
+create table if not exists public.experience (
+  id uuid primary key default gen_random_uuid(),
+  title text not null,
+  company text not null,
+  location text not null,
+  period text not null,
+  type text not null check (type in ('Internship','Full-time','Research','Contract')),
+  color text not null check (color in ('blue','purple','cyan','green','red','orange')),
+  achievements text[] not null default '{}',
+  tech text[] not null default '{}',
+  "order" int not null default 0,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now()
+);
+
+create table if not exists public.skills (
+  id uuid primary key default gen_random_uuid(),
+  name text not null,
+  level int not null,
+  category text not null,
+  skill_group text not null check (skill_group in ('languages','frameworks','tools','aiMl')),
+  "order" int not null default 0,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now()
+);
+
+do $$
+declare t text;
+begin
+  foreach t in array array['personal_info','education','experience','skills'] loop
+    execute format('drop trigger if exists %I_set_updated_at on public.%I', t, t);
+    execute format('create trigger %I_set_updated_at before update on public.%I for each row execute function public.set_updated_at()', t, t);
+    execute format('alter table public.%I enable row level security', t);
+    execute format('drop policy if exists "%s read" on public.%I', t, t);
+    execute format('create policy "%s read" on public.%I for select using (true)', t, t);
+    execute format('drop policy if exists "%s write" on public.%I', t, t);
+    execute format('create policy "%s write" on public.%I for all using (auth.role() = ''service_role'') with check (auth.role() = ''service_role'')', t, t);
+  end loop;
+end $$;
+
+-- Legacy /api/status checks
+create table if not exists public.status_checks (
+  id uuid primary key default gen_random_uuid(),
+  client_name text not null,
+  timestamp timestamptz not null default now()
+);
+
+alter table public.status_checks enable row level security;
+
+drop policy if exists "Status checks (service)" on public.status_checks;
+create policy "Status checks (service)" on public.status_checks
+  for all using (auth.role() = 'service_role') with check (auth.role() = 'service_role');
+
+-- Used by POST /api/admin/seed: replaces a portfolio table's rows in a single
+-- transaction, so readers never observe a half-seeded table
+create or replace function public.replace_portfolio_table(target text, rows jsonb)
+returns integer
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  inserted integer;
+begin
+  if target not in ('personal_info','education','experience','projects','skills') then
+    raise exception 'replace_portfolio_table: unknown table %', target;
+  end if;
+  execute format('delete from public.%I', target);
+  execute format('insert into public.%I select * from jsonb_populate_recordset(null::public.%I, $1)', target, target)
+    using rows;
+  get diagnostics inserted = row_count;
+  return inserted;
+end;
+$$;
+
+revoke all on function public.replace_portfolio_table(text, jsonb) from public, anon, authenticated;
+
+-- Indexes matching the API's queries: list endpoints sort on "order", projects
+-- filter on category/featured, admin lists are keyset-paginated newest first
+create index if not exists projects_order_idx on public.projects ("order");
+create index if not exists projects_category_order_idx on public.projects (category, "order");
+create index if not exists projects_featured_order_idx on public.projects ("order") where featured;
+-- GitHub sync upserts match on github_repo; unique so concurrent syncs cannot
+-- both insert the same repo. Hand-written projects leave it null (nulls never
+-- conflict), so any number of them may link the same GitHub URL
+alter table public.projects add column if not exists github_repo text null;
+drop index if exists public.projects_github_idx;
+drop index if exists public.projects_github_key;
+create unique index if not exists projects_github_repo_key on public.projects (github_repo);
+create index if not exists education_order_idx on public.education ("order");
+create index if not exists experience_order_idx on public.experience ("order");
+create index if not exists skills_order_idx on public.skills ("order");
+create index if not exists contact_messages_created_at_id_idx on public.contact_messages (created_at desc, id desc);
+create index if not exists contact_messages_status_created_at_id_idx on public.contact_messages (status, created_at desc, id desc);
+create index if not exists status_checks_timestamp_id_idx on public.status_checks (timestamp desc, id desc);
+
+-- Change feed for PORTFOLIO_WATCH_CHANGES: every write to a portfolio table is
+-- announced on the portfolio_changes channel. NOTIFY payloads are capped at
+-- 8000 bytes, so a larger row is sent without `row` and the API reloads the table
+create or replace function public.notify_portfolio_change()
+returns trigger
+language plpgsql
+as $$
+declare
+  payload jsonb;
+begin
+  if tg_op = 'TRUNCATE' then
+    perform pg_notify('portfolio_changes', json_build_object('table', tg_table_name, 'op', tg_op)::text);
+    return null;
+  end if;
+  if tg_op = 'DELETE' then
+    payload := jsonb_build_object('table', tg_table_name, 'op', tg_op, 'id', old.id);
+  else
+    payload := jsonb_build_object('table', tg_table_name, 'op', tg_op, 'id', new.id, 'row', to_jsonb(new));
+    if octet_length(payload::text) > 7900 then
+      payload := payload - 'row';
+    end if;
+  end if;
+  perform pg_notify('portfolio_changes', payload::text);
+  return null;
+end;
+$$;
+
+do $$
+declare
+  t text;
+begin
+  foreach t in array array['personal_info','education','experience','projects','skills'] loop
+    execute format('drop trigger if exists %I on public.%I', t || '_notify_change', t);
+    execute format('create trigger %I after insert or update or delete on public.%I for each row execute function public.notify_portfolio_change()', t || '_notify_change', t);
+    execute format('drop trigger if exists %I on public.%I', t || '_notify_truncate', t);
+    execute format('create trigger %I after truncate on public.%I for each statement execute function public.notify_portfolio_change()', t || '_notify_truncate', t);
+  end loop;
+end;
+$$;
+
+-- Change log behind GET /api/portfolio/changes: every insert, update and delete
+-- on a portfolio table is recorded under the next data version, deletes as
+-- tombstones. Writers take a transaction-level lock before drawing a version,
+-- so versions become visible in order (a rolled-back write leaves a gap, which
+-- the API skips once it is old enough). TRUNCATE logs a tombstone per row first.
+create table if not exists public.portfolio_changes (
+  version bigserial primary key,
+  collection text not null,
+  row_id uuid not null,
+  op text not null check (op in ('upsert','delete')),
+  changed_at timestamptz not null default now()
+);
+
+create index if not exists portfolio_changes_changed_at_idx on public.portfolio_changes (changed_at);
+
+alter table public.portfolio_changes enable row level security;
+
+drop policy if exists "Portfolio changes (service)" on public.portfolio_changes;
+create policy "Portfolio changes (service)" on public.portfolio_changes
+  for all using (auth.role() = 'service_role') with check (auth.role() = 'service_role');
+
+create or replace function public.log_portfolio_change()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  perform pg_advisory_xact_lock(hashtext('portfolio_changes'));
+  if tg_op = 'TRUNCATE' then
+    execute format('insert into public.portfolio_changes (collection, row_id, op) select %L, id, ''delete'' from public.%I', tg_table_name, tg_table_name);
+  elsif tg_op = 'DELETE' then
+    insert into public.portfolio_changes (collection, row_id, op) values (tg_table_name, old.id, 'delete');
+  else
+    if tg_op = 'UPDATE' and old.id <> new.id then
+      insert into public.portfolio_changes (collection, row_id, op) values (tg_table_name, old.id, 'delete');
+    end if;
+    insert into public.portfolio_changes (collection, row_id, op) values (tg_table_name, new.id, 'upsert');
+  end if;
+  return null;
+end;
+$$;
+
+do $$
+declare
+  t text;
+begin
+  foreach t in array array['personal_info','education','experience','projects','skills'] loop
+    execute format('drop trigger if exists %I on public.%I', t || '_log_change', t);
+    execute format('create trigger %I after insert or update or delete on public.%I for each row execute function public.log_portfolio_change()', t || '_log_change', t);
+    execute format('drop trigger if exists %I on public.%I', t || '_log_truncate', t);
+    execute format('create trigger %I before truncate on public.%I for each statement execute function public.log_portfolio_change()', t || '_log_truncate', t);
+  end loop;
+end;
+$$;
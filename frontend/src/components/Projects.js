@@ -5,6 +5,21 @@ import { firebaseReady } from '../services/firebase';
 import { resolveThumbnailForRepo } from '../config/projectThumbnails';
 import { getAuth, GoogleAuthProvider, signInWithPopup, onAuthStateChanged, signOut } from 'firebase/auth';
 
+// Resized variants from the backend's /api/images when the project carries image_srcset
+const ProjectImage = ({ project, sizes, ...props }) => {
+  const srcset = project.image_srcset;
+  if (!srcset) {
+    return <img src={project.image} {...props} />;
+  }
+  return (
+    <picture>
+      {srcset.avif && <source type="image/avif" srcSet={srcset.avif} sizes={sizes} />}
+      {srcset.webp && <source type="image/webp" srcSet={srcset.webp} sizes={sizes} />}
+      <img src={project.image} srcSet={srcset.jpeg} sizes={sizes} {...props} />
+    </picture>
+  );
+};
+
 const Projects = () => {
   const highlightRegex = /(\b\d{1,3}(?:,\d{3})*\+?\b|\b\d+\s?[kK]\+?\b|\b\d+%\b|\b<\d+\s?s\b|\b\d+\s?s\b)/g;
   const highlightMetrics = (text) => {
@@ -29,6 +44,8 @@ const Projects = () => {
   const [selectedRepoIds, setSelectedRepoIds] = useState(new Set());
   const [importing, setImporting] = useState(false);
   const GITHUB_USERNAME = process.env.REACT_APP_GITHUB_USERNAME || 'RohanChavan0701';
+  // When the backend syncs GitHub repos itself (GITHUB_SYNC_USERNAME), read projects from the API
+  const GITHUB_SERVER_SYNC = process.env.REACT_APP_GITHUB_SERVER_SYNC === 'true';
   const [currentUser, setCurrentUser] = useState(null);
 
   // Exclude specific GitHub repositories from being shown
@@ -84,7 +101,7 @@ const Projects = () => {
     const fetchProjects = async () => {
     try {
         setLoading(true);
-        if (GITHUB_USERNAME) {
+        if (GITHUB_USERNAME && !GITHUB_SERVER_SYNC) {
           // Fetch directly from GitHub and show on site
           const resp = await fetch(
             `https://api.github.com/users/${GITHUB_USERNAME}/repos?per_page=100&sort=updated`,
@@ -324,8 +341,9 @@ const Projects = () => {
             </button>
           </div>
 
-          <img 
-            src={project.image} 
+          <ProjectImage
+            project={project}
+            sizes="(min-width: 768px) 896px, 100vw"
             alt={project.title}
             className="w-full h-64 object-cover rounded-lg mb-6"
           />
@@ -463,8 +481,9 @@ const Projects = () => {
                   onClick={() => setSelectedProject(project)}
                 >
                   <div className="relative overflow-hidden">
-                    <img 
-                      src={project.image} 
+                    <ProjectImage
+                      project={project}
+                      sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                       alt={`${project.title} thumbnail`}
                       width="800"
                       height="384"
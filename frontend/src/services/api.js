@@ -16,6 +16,42 @@ const apiClient = axios.create({
   timeout: 10000, // 10 second timeout
 });
 
+// Static export mode (backend/export_static.py): read pre-rendered JSON from
+// public/static-api via its manifest instead of calling the backend
+const STATIC_API = process.env.REACT_APP_STATIC_API === 'true';
+const STATIC_API_BASE = process.env.REACT_APP_STATIC_API_BASE || `${process.env.PUBLIC_URL || ''}/static-api`;
+let staticManifest = null;
+
+const getStatic = async (endpoint) => {
+  if (!staticManifest) {
+    staticManifest = fetch(`${STATIC_API_BASE}/manifest.json`, { cache: 'no-cache' }).then((response) => {
+      if (!response.ok) throw new Error(`Static manifest error: ${response.status}`);
+      return response.json();
+    });
+  }
+  let manifest;
+  try {
+    manifest = await staticManifest;
+  } catch (error) {
+    staticManifest = null; // retry on the next call
+    throw error;
+  }
+  const entry = manifest.files[endpoint];
+  if (!entry) return null;
+  const response = await fetch(`${STATIC_API_BASE}/${entry.file}`);
+  if (!response.ok) throw new Error(`Static export error: ${response.status}`);
+  return response.json();
+};
+
+const getStaticProjects = async (category, featuredOnly) => {
+  if (!category || category === 'all') {
+    return getStatic(featuredOnly ? '/portfolio/projects/featured' : '/portfolio/projects');
+  }
+  // Only per-category lists are exported; an unknown category has no projects
+  const projects = (await getStatic(`/portfolio/projects?category=${encodeURIComponent(category)}`)) || [];
+  return featuredOnly ? projects.filter((p) => p.featured) : projects;
+};
+
 // Local fallbacks to keep the site functional when backend is unavailable
 const fallbackPersonal = {
   name: 'Rohan Praveen Chavan',
@@ -106,6 +142,9 @@ export const portfolioAPI = {
   // Get personal information
   async getPersonalInfo() {
     try {
+      if (STATIC_API) {
+        return await getStatic('/portfolio/personal');
+      }
       if (!BACKEND_CONFIGURED && process.env.NODE_ENV === 'production') {
         return fallbackPersonal;
       }
@@ -121,6 +160,9 @@ export const portfolioAPI = {
   // Get education details
   async getEducation() {
     try {
+      if (STATIC_API) {
+        return await getStatic('/portfolio/education');
+      }
       if (!BACKEND_CONFIGURED && process.env.NODE_ENV === 'production') {
         return fallbackEducation;
       }
@@ -136,6 +178,9 @@ export const portfolioAPI = {
   // Get work experience
   async getExperience() {
     try {
+      if (STATIC_API) {
+        return await getStatic('/portfolio/experience');
+      }
       if (!BACKEND_CONFIGURED && process.env.NODE_ENV === 'production') {
         return mapExperienceFromJson();
       }
@@ -161,6 +206,10 @@ export const portfolioAPI = {
       return snap.docs.map((doc) => ({ id: doc.id, ...doc.data() }));
     }
 
+    if (STATIC_API) {
+      return getStaticProjects(category, featuredOnly);
+    }
+
     // Default: use backend API
     const params = new URLSearchParams();
     if (category && category !== 'all') params.append('category', category);
@@ -189,6 +238,9 @@ export const portfolioAPI = {
   // Get featured projects only
   async getFeaturedProjects() {
     try {
+      if (STATIC_API) {
+        return await getStaticProjects(null, true);
+      }
       const response = await apiClient.get('/portfolio/projects/featured');
       return response.data;
     } catch (error) {
@@ -200,6 +252,9 @@ export const portfolioAPI = {
   // Get skills grouped by category
   async getSkills() {
     try {
+      if (STATIC_API) {
+        return await getStatic('/portfolio/skills');
+      }
       if (!BACKEND_CONFIGURED && process.env.NODE_ENV === 'production') {
         return fallbackSkills;
       }
@@ -216,6 +271,9 @@ export const portfolioAPI = {
   // Get complete portfolio data
   async getCompletePortfolio() {
     try {
+      if (STATIC_API) {
+        return await getStatic('/portfolio/complete');
+      }
       if (!BACKEND_CONFIGURED && process.env.NODE_ENV === 'production') {
         return {
           personal: fallbackPersonal,
@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# server.py reads its configuration at import: run it on the writable in-memory
+# backend with every background loop and outside service off
+os.environ.update(
+    PORTFOLIO_BACKEND="memory",
+    PORTFOLIO_MEMORY_WRITABLE="true",
+    PORTFOLIO_FAILOVER="",
+    PORTFOLIO_HEALTH_INTERVAL="0",
+    PORTFOLIO_CHANGES_RETENTION="0",
+    PORTFOLIO_IMAGES="false",
+    RATE_LIMIT_ENABLED="false",
+    CONTACT_WRITE_BEHIND="false",
+    CONTACT_JOURNAL_PATH=str(Path(tempfile.mkdtemp(prefix="portfolio-tests-")) / "contact_journal.ndjson"),
+    MONGO_ENSURE_INDEXES="false",
+)
+os.environ.pop("PORTFOLIO_SHARED_SNAPSHOT", None)
+os.environ.pop("GITHUB_SYNC_USERNAME", None)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """The server module with a fresh in-memory repository, empty caches and no dedup history."""
+    import server as module
+    from guards import DedupWindow
+
+    monkeypatch.setattr(module, "repository", None)
+    monkeypatch.setattr(module, "contact_dedup", DedupWindow())
+    module.portfolio_cache.invalidate()
+    module.portfolio_search.invalidate()
+    return module
+
+
+@pytest.fixture
+def client(server):
+    from fastapi.testclient import TestClient
+
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def new_project():
+    """Builds a valid ProjectCreate payload; keyword arguments override fields."""
+    def build(**fields):
+        project = {
+            "title": "Test project",
+            "description": "A project created by the tests",
+            "long_description": "A project created by the tests",
+            "tech": ["Python"],
+            "category": "Web Development",
+            "featured": False,
+            "github": "https://github.com/example/test-project",
+            "image": "",
+            "status": "completed",
+            "highlights": [],
+            "order": 100,
+        }
+        project.update(fields)
+        return project
+
+    return build
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from cache import SnapshotCache
+
+pytestmark = pytest.mark.anyio
+
+
+class Loader:
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+async def test_hit_after_first_load():
+    cache = SnapshotCache()
+    loader = Loader("a", "b")
+    assert await cache.get_or_load(("projects",), loader) == "a"
+    assert await cache.get_or_load(("projects",), loader) == "a"
+    assert loader.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = SnapshotCache()
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "rows"
+
+    results = await asyncio.gather(*(cache.get_or_load(("projects",), slow) for _ in range(5)))
+    assert results == ["rows"] * 5
+    assert calls == 1
+
+
+async def test_invalidate_drops_only_that_collection():
+    cache = SnapshotCache()
+    projects, skills = Loader("p1", "p2"), Loader("s1", "s2")
+    await cache.get_or_load(("projects",), projects)
+    await cache.get_or_load(("skills",), skills)
+    cache.invalidate("projects")
+    assert await cache.get_or_load(("projects",), projects) == "p2"
+    assert await cache.get_or_load(("skills",), skills) == "s1"
+
+
+async def test_multi_collection_key_invalidated_by_either():
+    cache = SnapshotCache()
+    loader = Loader("v1", "v2")
+    key = (("projects", "skills"), "complete")
+    await cache.get_or_load(key, loader)
+    cache.invalidate("skills")
+    assert await cache.get_or_load(key, loader) == "v2"
+
+
+async def test_load_started_before_invalidation_is_not_stored():
+    cache = SnapshotCache()
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def racing():
+        started.set()
+        await release.wait()
+        return "old"
+
+    pending = asyncio.ensure_future(cache.get_or_load(("projects",), racing))
+    await started.wait()
+    cache.invalidate("projects")
+    release.set()
+    assert await pending == "old"  # the caller still gets its answer...
+    assert await cache.get_or_load(("projects",), Loader("new")) == "new"  # ...but it isn't cached
+
+
+async def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    cache = SnapshotCache(ttl=10)
+    loader = Loader("v1", "v2")
+    await cache.get_or_load(("projects",), loader)
+    now[0] += 9
+    assert await cache.get_or_load(("projects",), loader) == "v1"
+    now[0] += 2
+    assert await cache.get_or_load(("projects",), loader) == "v2"
+
+
+async def test_lru_eviction():
+    cache = SnapshotCache(max_entries=2)
+    for name in ("a", "b", "c"):
+        await cache.get_or_load((name,), Loader(name))
+    assert cache.stats()["entries"] == 2
+    loader = Loader("a2")
+    assert await cache.get_or_load(("a",), loader) == "a2"
+
+
+async def test_cacheable_veto():
+    cache = SnapshotCache()
+    loader = Loader(None, "rows")
+    assert await cache.get_or_load(("projects",), loader, cacheable=lambda value: value is not None) is None
+    assert await cache.get_or_load(("projects",), loader) == "rows"
+
+
+async def test_stale_if_error_serves_last_good_snapshot():
+    cache = SnapshotCache(stale_if_error=lambda error: isinstance(error, ConnectionError))
+    loader = Loader("good", ConnectionError("down"), "fresh")
+    await cache.get_or_load(("projects",), loader)
+    cache.invalidate("projects")
+    assert await cache.get_or_load(("projects",), loader) == "good"
+    assert cache.stale_served == 1
+    # The stale value was not stored as fresh: the next read loads again
+    assert await cache.get_or_load(("projects",), loader) == "fresh"
+
+
+async def test_stale_if_error_respects_predicate():
+    cache = SnapshotCache(stale_if_error=lambda error: isinstance(error, ConnectionError))
+    loader = Loader("good", LookupError("404"))
+    await cache.get_or_load(("personal_info",), loader)
+    cache.invalidate()
+    with pytest.raises(LookupError):
+        await cache.get_or_load(("personal_info",), loader)
+
+
+async def test_error_without_stale_propagates_to_every_waiter():
+    cache = SnapshotCache()
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise ConnectionError("down")
+
+    results = await asyncio.gather(
+        *(cache.get_or_load(("projects",), failing) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+async def test_patch_updates_entries_in_place():
+    cache = SnapshotCache()
+    await cache.get_or_load(("projects",), Loader(["a"]))
+    cache.patch("projects", lambda key, value: value + ["b"])
+    loader = Loader(["reloaded"])
+    assert await cache.get_or_load(("projects",), loader) == ["a", "b"]
+    assert loader.calls == 0
+
+
+def test_write_invalidates_cached_endpoint(client):
+    before = client.get("/api/portfolio/projects").json()
+    project = dict(before[0], title="Fresh project", github="https://github.com/example/fresh", order=99)
+    del project["id"]
+    assert client.post("/api/portfolio/projects/bulk", json=[project]).status_code == 200
+    titles = [row["title"] for row in client.get("/api/portfolio/projects").json()]
+    assert titles[-1] == "Fresh project"
+    assert len(titles) == len(before) + 1
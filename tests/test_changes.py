@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from changes import ChangeEvent, ChangeWatcher, QueueChangeSource, mongo_event, notify_event
+
+pytestmark = pytest.mark.anyio
+
+
+def test_mongo_events():
+    insert = {"operationType": "insert", "ns": {"coll": "projects"}, "fullDocument": {"_id": "p1", "title": "A"}}
+    assert mongo_event(insert) == [ChangeEvent("projects", "upsert", "p1", {"id": "p1", "title": "A"})]
+    gone = {"operationType": "update", "ns": {"coll": "projects"}, "fullDocument": None, "documentKey": {"_id": "p1"}}
+    assert mongo_event(gone) == [ChangeEvent("projects", "delete", "p1")]
+    rename = {"operationType": "rename", "ns": {"coll": "projects_shadow"}, "to": {"coll": "projects"}}
+    assert mongo_event(rename) == [ChangeEvent("projects", "reset")]
+    assert {event.collection for event in mongo_event({"operationType": "dropDatabase", "ns": {}})} >= {"projects", "skills"}
+
+
+def test_notify_events():
+    assert notify_event('{"table": "skills", "op": "TRUNCATE"}') == [ChangeEvent("skills", "reset")]
+    assert notify_event('{"table": "skills", "op": "DELETE", "id": 7}') == [ChangeEvent("skills", "delete", "7")]
+    # Rows too large for a NOTIFY payload arrive without one
+    assert notify_event('{"table": "skills", "op": "UPDATE", "id": "s1"}') == [ChangeEvent("skills", "upsert", "s1", None)]
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+        self.resets = 0
+
+    def apply(self, batch):
+        self.batches.append([event.id for event in batch])
+
+    def reset(self):
+        self.resets += 1
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.fixture
+async def watched():
+    source, recorder = QueueChangeSource(), Recorder()
+    watcher = ChangeWatcher(source, recorder.apply, recorder.reset, max_batch=3)
+    task = asyncio.create_task(watcher.run_forever())
+    await asyncio.wait_for(watcher.connected.wait(), 1)
+    yield source, recorder, watcher
+    task.cancel()
+
+
+async def test_events_that_arrive_together_are_one_batch(watched):
+    source, recorder, watcher = watched
+    assert recorder.resets == 1  # the first connect drops whatever was loaded before
+    for i in range(5):
+        source.push(ChangeEvent("projects", "delete", f"p{i}"))
+    await wait_for(lambda: watcher.applied == 5)
+    assert recorder.batches == [["p0", "p1", "p2"], ["p3", "p4"]]
+    assert watcher.stats()["batches"] == 2
+
+
+async def test_a_dropped_stream_reconnects_and_resets(watched):
+    source, recorder, watcher = watched
+    source.push(ConnectionError("stream lost"))
+    await wait_for(lambda: watcher.reconnects == 1)
+    assert watcher.last_error == "stream lost"
+    await wait_for(lambda: recorder.resets == 2)  # not resumable, so anything missed is reloaded
+    source.push(ChangeEvent("projects", "delete", "p1"))
+    await wait_for(lambda: recorder.batches == [["p1"]])
+
+
+def test_upserts_and_deletes_patch_the_snapshots_without_a_reload(client, server, monkeypatch):
+    projects = client.get("/api/portfolio/projects").json()
+    first, second = projects[0], projects[1]
+    assert client.get("/api/portfolio/search?q=zeppelin").json()["total"] == 0
+
+    monkeypatch.setattr(server, "repository", None)  # any reload would fail now
+    server.apply_changes([
+        ChangeEvent("projects", "upsert", first["id"], dict(first, title="Zeppelin tracker")),
+        ChangeEvent("projects", "delete", second["id"]),
+        ChangeEvent("unrelated", "reset"),
+    ])
+    patched = client.get("/api/portfolio/projects").json()
+    assert [row["id"] for row in patched] == [row["id"] for row in projects if row["id"] != second["id"]]
+    assert patched[0]["title"] == "Zeppelin tracker"
+    assert client.get("/api/portfolio/complete").json()["projects"] == patched
+    hits = client.get("/api/portfolio/search?q=zeppelin").json()["results"]
+    assert [hit["id"] for hit in hits] == [first["id"]]
+
+
+def test_a_new_row_is_placed_by_order(client, server):
+    projects = client.get("/api/portfolio/projects").json()
+    row = dict(projects[1], id="new", title="Inserted", order=projects[0]["order"] - 1)
+    server.apply_changes([ChangeEvent("projects", "upsert", "new", row)])
+    ids = [project["id"] for project in client.get("/api/portfolio/projects").json()]
+    assert ids == ["new"] + [project["id"] for project in projects]
+
+
+def test_a_reset_or_an_unsent_row_reloads_the_collection(client, server):
+    client.get("/api/portfolio/skills")
+    misses = server.portfolio_cache.misses
+    server.apply_changes([ChangeEvent("skills", "upsert", "s1", None)])
+    client.get("/api/portfolio/skills")
+    assert server.portfolio_cache.misses > misses
+
+    misses = server.portfolio_cache.misses
+    server.apply_changes([ChangeEvent("skills", "reset")])
+    client.get("/api/portfolio/skills")
+    assert server.portfolio_cache.misses > misses
+
+
+def test_a_selection_without_the_sort_key_is_reloaded(client, server):
+    before = client.get("/api/portfolio/projects?fields=title").json()
+    server.apply_changes([ChangeEvent("projects", "delete", before[0]["id"])])
+    # The deleted row is still in the memory backend, so the reload brings it back
+    assert client.get("/api/portfolio/projects?fields=title").json() == before
+
+
+def test_the_memory_backend_has_no_change_feed(client, server):
+    assert server.create_change_watcher() is None
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+SECTION_READS = ("get_personal_info", "list_education", "list_experience", "list_projects", "list_skills")
+
+
+@pytest.fixture
+def slow_repository(server, client, monkeypatch):
+    """Each section read takes 50ms; records how many ran at once."""
+    state = {"running": 0, "peak": 0}
+    repository = server.repository
+    for name in SECTION_READS:
+        read = getattr(repository, name)
+
+        async def slow(*args, _read=read, **kwargs):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            try:
+                await asyncio.sleep(0.05)
+                return await _read(*args, **kwargs)
+            finally:
+                state["running"] -= 1
+
+        monkeypatch.setattr(repository, name, slow)
+    server.portfolio_cache.invalidate()
+    return state
+
+
+@pytest.fixture
+def no_stale(server, monkeypatch):
+    monkeypatch.setattr(server.portfolio_cache, "stale_if_error", None)
+    server.portfolio_cache.invalidate()
+
+
+def test_sections_load_concurrently(client, slow_repository):
+    response = client.get("/api/portfolio/complete")
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) >= {"personal", "education", "experience", "projects", "skills"}
+    assert slow_repository["peak"] == len(SECTION_READS)
+
+
+def test_failing_section_fails_fast(client, server, no_stale, monkeypatch):
+    async def broken():
+        raise RuntimeError("skills table is gone")
+
+    monkeypatch.setattr(server.repository, "list_skills", broken)
+    response = client.get("/api/portfolio/complete")
+    assert response.status_code == 500
+    assert "'skills'" in response.json()["detail"]
+
+
+def test_partial_reports_failed_section_and_is_not_cached(client, server, no_stale, monkeypatch):
+    async def broken():
+        raise RuntimeError("skills table is gone")
+
+    read = server.repository.list_skills
+    monkeypatch.setattr(server.repository, "list_skills", broken)
+    body = client.get("/api/portfolio/complete?partial=true").json()
+    assert body["errors"] == {"skills": "skills table is gone"}
+    assert body["skills"] is None
+    assert body["projects"]
+
+    monkeypatch.setattr(server.repository, "list_skills", read)
+    body = client.get("/api/portfolio/complete?partial=true").json()
+    assert body["errors"] == {}
+    assert body["skills"]["languages"]
+
+
+def test_slow_section_times_out(client, server, no_stale, monkeypatch):
+    async def stuck():
+        await asyncio.sleep(1)
+        return []
+
+    monkeypatch.setattr(server, "PORTFOLIO_SECTION_TIMEOUT", 0.05)
+    monkeypatch.setattr(server.repository, "list_skills", stuck)
+    response = client.get("/api/portfolio/complete")
+    assert response.status_code == 504
+    assert "'skills'" in response.json()["detail"]
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import install_fake_mongo
+from contact_queue import ContactWriteQueue, QueueFullError
+
+pytestmark = pytest.mark.anyio
+
+FORM = {"name": "Ada", "email": "ada@example.com", "subject": "Hello", "message": "A message"}
+
+
+class Writer:
+    def __init__(self, failures: int = 0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database down")
+        self.batches.append([message["id"] for message in batch])
+        return len(batch)
+
+
+def message(i: int) -> dict:
+    return {"id": f"m{i}", "name": "Ada", "message": f"Message {i}"}
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def test_messages_are_written_in_batches(tmp_path):
+    writer = Writer()
+    queue = ContactWriteQueue(writer, tmp_path / "journal.ndjson", batch_size=3, flush_interval=0.05)
+    queue.start()
+    for i in range(7):
+        queue.submit(message(i))
+    await wait_for(lambda: queue.written == 7)
+    assert writer.batches == [["m0", "m1", "m2"], ["m3", "m4", "m5"], ["m6"]]
+    await queue.close()
+
+
+async def test_full_batch_does_not_wait_for_the_interval(tmp_path):
+    writer = Writer()
+    queue = ContactWriteQueue(writer, tmp_path / "journal.ndjson", batch_size=2, flush_interval=30)
+    queue.start()
+    queue.submit(message(1))
+    queue.submit(message(2))
+    await wait_for(lambda: queue.written == 2, timeout=1)
+    await queue.close()
+
+
+async def test_queue_full_is_backpressure(tmp_path):
+    queue = ContactWriteQueue(Writer(failures=100), tmp_path / "journal.ndjson", max_depth=2, flush_interval=30)
+    queue.start()
+    queue.submit(message(1))
+    queue.submit(message(2))
+    with pytest.raises(QueueFullError):
+        queue.submit(message(3))
+    await queue.close(timeout=0.05)
+
+
+async def test_failed_flush_is_retried(tmp_path):
+    writer = Writer(failures=1)
+    queue = ContactWriteQueue(writer, tmp_path / "journal.ndjson", flush_interval=0.01)
+    queue.start()
+    queue.submit(message(1))
+    await wait_for(lambda: queue.written == 1)
+    assert queue.stats()["failures"] == 1
+    await queue.close()
+
+
+async def test_unwritten_messages_are_replayed_after_a_restart(tmp_path):
+    journal = tmp_path / "journal.ndjson"
+    down = ContactWriteQueue(Writer(failures=100), journal, flush_interval=30)
+    down.start()
+    for i in range(3):
+        down.submit(message(i))
+    await down.close(timeout=0.05)
+    with open(journal, "a") as f:
+        f.write('{"op": "add", "mess')  # torn by a crash mid-write
+
+    writer = Writer()
+    queue = ContactWriteQueue(writer, journal, flush_interval=0.01)
+    assert queue.start() == 3
+    await wait_for(lambda: queue.written == 3)
+    assert writer.batches == [["m0", "m1", "m2"]]
+    await queue.close()
+    assert journal.read_text() == ""  # compacted once everything was written
+
+
+async def test_journal_records(tmp_path):
+    journal = tmp_path / "journal.ndjson"
+    queue = ContactWriteQueue(Writer(), journal, flush_interval=30, compact_bytes=1 << 20)
+    queue.start()
+    queue.submit(message(1))
+    queue.submit(message(2))
+    records = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert [record["op"] for record in records] == ["add", "add"]
+    assert records[0]["message"]["id"] == "m1"
+    await queue.close()
+
+
+@pytest.fixture
+def write_behind(server, monkeypatch, tmp_path):
+    queue = ContactWriteQueue(
+        lambda batch: server.repository.insert_contact_messages(batch),
+        tmp_path / "journal.ndjson",
+        flush_interval=0.01,
+        load=lambda raw: server.ContactMessage(**raw).dict(),
+    )
+    monkeypatch.setattr(server, "CONTACT_WRITE_BEHIND", True)
+    monkeypatch.setattr(server, "contact_queue", queue)
+    with TestClient(server.app) as client:
+        yield client
+
+
+def test_write_behind_acknowledges_with_202(write_behind):
+    first = write_behind.post("/api/contact", json=FORM)
+    assert first.status_code == 202
+    again = write_behind.post("/api/contact", json=FORM)
+    assert again.status_code == 202  # the duplicate reads the same way as the original
+    assert again.headers["x-duplicate-submission"] == "true"
+    assert again.json()["id"] == first.json()["id"]
+
+    deadline = time.monotonic() + 2
+    while not write_behind.get("/api/contact/messages").json():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert [row["id"] for row in write_behind.get("/api/contact/messages").json()] == [first.json()["id"]]
+    assert write_behind.get("/api/admin/contact-queue").json()["written"] == 1
+
+
+def test_inline_write_answers_200(client):
+    first = client.post("/api/contact", json=FORM)
+    again = client.post("/api/contact", json=FORM)
+    assert (first.status_code, again.status_code) == (200, 200)
+    assert again.json()["id"] == first.json()["id"]
+
+
+async def test_mongo_contact_writes_use_the_message_id(server):
+    db = install_fake_mongo(server)
+    await server.repository.insert_contact_message(dict(message(1), created_at="2026-01-01T00:00:00"))
+    await server.repository.insert_contact_messages([dict(message(2), created_at="2026-01-01T00:00:01")])
+    assert sorted(doc["_id"] for doc in db["contact_messages"].docs) == ["m1", "m2"]
+    assert [row["id"] for row in await server.repository.list_contact_messages(10)] == ["m2", "m1"]
@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from repository import PORTFOLIO_COLLECTIONS
+
+
+def changes(client, **params):
+    response = client.get("/api/portfolio/changes", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_first_sync_is_a_reset_with_every_row(client):
+    body = changes(client)
+    assert (body["version"], body["reset"], body["more"]) == (0, True, False)
+    assert set(body["changes"]) == set(PORTFOLIO_COLLECTIONS)
+    complete = client.get("/api/portfolio/complete").json()
+    assert body["changes"]["projects"]["upserted"] == complete["projects"]
+    assert body["changes"]["personal_info"]["upserted"] == [complete["personal"]]
+
+
+def test_reset_is_cached_and_revalidated(client):
+    first = client.get("/api/portfolio/changes")
+    again = client.get("/api/portfolio/changes", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_writes_since_a_version(client, new_project):
+    created = client.post("/api/portfolio/projects/bulk", json=[
+        new_project(title="One", github="https://github.com/example/one"),
+        new_project(title="Two", github="https://github.com/example/two"),
+    ]).json()
+    body = changes(client, since=0)
+    assert (body["version"], body["reset"], body["more"]) == (2, False, False)
+    assert list(body["changes"]) == ["projects"]
+    assert [row["title"] for row in body["changes"]["projects"]["upserted"]] == ["One", "Two"]
+    assert [row["id"] for row in body["changes"]["projects"]["upserted"]] == [row["id"] for row in created["results"]]
+
+    assert changes(client, since=2) == {"version": 2, "reset": False, "more": False, "changes": {}}
+
+
+def test_limit_pages_through_the_log(client, new_project):
+    client.post("/api/portfolio/projects/bulk", json=[
+        new_project(title=f"Project {i}", github=f"https://github.com/example/p{i}") for i in range(3)
+    ])
+    first = changes(client, since=0, limit=2)
+    assert (first["version"], first["more"]) == (2, True)
+    rest = changes(client, since=first["version"], limit=2)
+    assert (rest["version"], rest["more"]) == (3, False)
+    assert [row["title"] for row in rest["changes"]["projects"]["upserted"]] == ["Project 2"]
+
+
+def test_deleted_rows_are_tombstones(client, server):
+    repository = server.repository
+    projects = list(repository.data["projects"])
+    data = {collection: list(repository.data[collection]) for collection in PORTFOLIO_COLLECTIONS}
+    asyncio.run(repository.replace_all(dict(data, projects=projects[1:])))
+
+    body = changes(client, since=0)
+    assert body["changes"]["projects"]["deleted"] == [projects[0]["id"]]
+    assert [row["id"] for row in body["changes"]["projects"]["upserted"]] == [row["id"] for row in projects[1:]]
+    assert body["changes"]["skills"]["deleted"] == []
+
+
+def test_unknown_or_pruned_versions_reset(client, server, new_project):
+    assert changes(client, since=5)["reset"]  # never issued by this backend
+
+    for i in range(3):
+        client.post("/api/portfolio/projects/bulk", json=[new_project(github=f"https://github.com/example/p{i}")])
+    asyncio.run(server.repository.prune_changes(datetime.utcnow() + timedelta(seconds=1)))
+    assert changes(client, since=0)["reset"]  # versions 1-2 are gone
+    assert not changes(client, since=2)["reset"]
+
+
+def test_an_unsettled_gap_stops_the_answer(server, monkeypatch):
+    now = datetime.utcnow()
+    entries = [
+        {"version": 1, "changed_at": now},
+        {"version": 3, "changed_at": now},  # version 2 may still be committing
+    ]
+    assert server._settled(entries, 0) == entries[:1]
+    # Old enough that nothing can still fill it: a rolled-back write
+    old = [dict(entry, changed_at=now - timedelta(minutes=5)) for entry in entries]
+    assert server._settled(old, 0) == old
+    monkeypatch.setattr(server, "PORTFOLIO_CHANGES_GAP_GRACE", 0)
+    assert server._settled(entries, 0) == entries
@@ -0,0 +1,103 @@
+import gzip
+import json
+
+import pytest
+
+from responses import SerializedBody, brotli, choose_encoding, etag_matches
+
+PROJECTS = "/api/portfolio/projects"
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ('"abc-gz"', True),
+        ('W/"abc-br"', True),
+        ('"abc-xx"', False),
+        ("*", True),
+        ('"other"', False),
+    ],
+)
+def test_etag_matches(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+@pytest.mark.parametrize(
+    "header, encoding",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br" if brotli is not None else "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br" if brotli is not None else "gzip"),
+        ("gzip;q=0", None),
+    ],
+)
+def test_choose_encoding(header, encoding):
+    assert choose_encoding(header) == encoding
+
+
+def test_conditional_get_returns_304(client):
+    first = client.get(PROJECTS)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"]
+    assert "Accept-Encoding" in first.headers["vary"]
+
+    again = client.get(PROJECTS, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    weak = client.get(PROJECTS, headers={"If-None-Match": f"W/{etag}"})
+    assert weak.status_code == 304
+
+
+def test_etag_is_stable_until_a_write(client):
+    etag = client.get(PROJECTS).headers["etag"]
+    assert client.get(PROJECTS).headers["etag"] == etag
+    project = {key: value for key, value in client.get(PROJECTS).json()[0].items() if key != "id"}
+    project.update(title="Another", github="https://github.com/example/another")
+    client.post("/api/portfolio/projects/bulk", json=[project])
+    changed = client.get(PROJECTS, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_compressed_variants_carry_the_same_body(client):
+    plain = client.get(PROJECTS, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    zipped = client.get(PROJECTS, headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] == plain.headers["etag"][:-1] + '-gz"'
+    assert json.loads(zipped.content) == plain.json()
+
+
+def test_each_encoding_revalidates_with_its_own_etag(client):
+    plain = client.get(PROJECTS, headers={"Accept-Encoding": "identity"})
+    zipped = client.get(PROJECTS, headers={"Accept-Encoding": "gzip"})
+    # A gzip ETag revalidates an identity request too; the 304 names the variant asked for
+    revalidated = client.get(PROJECTS, headers={"Accept-Encoding": "identity", "If-None-Match": zipped.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == plain.headers["etag"]
+    assert revalidated.headers["vary"] == "Accept, Accept-Encoding"
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli not installed")
+def test_brotli_preferred(client):
+    response = client.get("/api/portfolio/complete", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()["projects"]
+
+
+def test_gzip_variant_is_deterministic():
+    body = b'{"title": "LunaFlow"}'
+    first, second = SerializedBody(body).variant("gzip"), SerializedBody(body).variant("gzip")
+    assert first == second
+    assert gzip.decompress(first) == body
+    assert SerializedBody(body).etag == SerializedBody(body).etag
@@ -0,0 +1,62 @@
+import gzip
+import json
+import os
+import types
+
+import httpx
+import pytest
+
+from export_static import MANIFEST, _file_for, brotli, render_endpoints, write_export
+
+pytestmark = pytest.mark.anyio
+
+
+def test_file_names():
+    assert _file_for("/portfolio/projects") == "portfolio/projects.json"
+    assert _file_for("/portfolio/projects?category=AI%2FML") == "portfolio/projects/category/ai-ml.json"
+
+
+async def test_bodies_are_byte_identical_to_the_api(server, tmp_path):
+    bodies = await render_endpoints()
+    categories = {project["category"] for project in json.loads(bodies["/portfolio/projects"])}
+    assert len([endpoint for endpoint in bodies if "?category=" in endpoint]) == len(categories)
+
+    manifest = write_export(bodies, tmp_path)
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for endpoint, body in bodies.items():
+            response = await client.get("/api" + endpoint, headers={"Accept-Encoding": "identity"})
+            assert response.content == body
+            assert response.headers["etag"] == manifest["files"][endpoint]["etag"]
+
+
+async def test_relative_image_urls_are_left_out(server, monkeypatch, capsys):
+    monkeypatch.setattr(server, "image_service", types.SimpleNamespace(base_url="/api/images"))
+    await render_endpoints()
+    assert server.image_service is None
+    assert "PORTFOLIO_IMAGE_BASE_URL" in capsys.readouterr().err
+
+
+def test_write_export(tmp_path):
+    bodies = {"/portfolio/personal": b'{"name":"Ada"}', "/portfolio/projects?category=AI%2FML": b"[]"}
+    manifest = write_export(bodies, tmp_path)
+    assert json.loads((tmp_path / MANIFEST).read_text()) == manifest
+
+    entry = manifest["files"]["/portfolio/personal"]
+    target = tmp_path / entry["file"]
+    assert target.read_bytes() == b'{"name":"Ada"}'
+    assert gzip.decompress(target.with_name(target.name + ".gz").read_bytes()) == b'{"name":"Ada"}'
+    if brotli is not None:
+        assert brotli.decompress(target.with_name(target.name + ".br").read_bytes()) == b'{"name":"Ada"}'
+    assert entry["file"].startswith(manifest["version"] + "/")
+
+    assert write_export(bodies, tmp_path)["version"] == manifest["version"]
+
+
+def test_old_versions_are_pruned(tmp_path):
+    versions = []
+    for i in range(4):
+        versions.append(write_export({"/portfolio/personal": f'{{"n":{i}}}'.encode()}, tmp_path, keep=2)["version"])
+        os.utime(tmp_path / versions[-1], (1000 + i, 1000 + i))
+    remaining = sorted(path.name for path in tmp_path.iterdir() if path.is_dir())
+    assert remaining == sorted(versions[-2:])
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from failover import FailoverRepository, HealthMonitor
+from repository import MemoryRepository, load_memory_data
+
+pytestmark = pytest.mark.anyio
+
+
+class Backend(MemoryRepository):
+    """A writable in-memory backend that can be taken down or slowed."""
+
+    def __init__(self, name: str):
+        super().__init__(load_memory_data(), writable=True)
+        self.name = name
+        self.down = False
+        self.delay = 0.0
+        self.reads = 0
+
+    async def _maybe_fail(self):
+        self.reads += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.down:
+            raise ConnectionError(f"{self.name} unreachable")
+
+    async def ping(self):
+        await self._maybe_fail()
+
+    async def list_projects(self, category=None, featured_only=False, fields=None):
+        await self._maybe_fail()
+        return await super().list_projects(category, featured_only, fields)
+
+    async def list_contact_messages(self, limit=100, after=None, status=None):
+        await self._maybe_fail()
+        return await super().list_contact_messages(limit, after, status)
+
+
+@pytest.fixture
+def backends():
+    return Backend("primary"), Backend("fallback")
+
+
+@pytest.fixture
+def monitor(backends):
+    monitor = HealthMonitor(interval=0, timeout=0.2, failure_threshold=2, slow_ms=50, retry_after=30)
+    monitor.watch(backends)
+    return monitor
+
+
+@pytest.fixture
+def failover(backends, monitor):
+    return FailoverRepository(backends, monitor, read_timeout=0.1)
+
+
+async def test_reads_fall_back_when_the_primary_fails(backends, monitor, failover):
+    primary, fallback = backends
+    primary.down = True
+    assert await failover.list_projects() == await fallback.list_projects()
+    assert failover.failovers == 1
+    assert monitor.health["primary"].failures == 1
+    assert monitor.status("primary") == "up"  # one failure is below the threshold
+
+
+async def test_slow_primary_times_out_to_the_fallback(backends, failover):
+    primary, _ = backends
+    primary.delay = 1.0
+    assert await failover.list_projects()
+    assert failover.failovers == 1
+
+
+async def test_down_primary_is_skipped_until_retry_after(backends, monitor, failover, monkeypatch):
+    primary, _ = backends
+    primary.down = True
+    await failover.list_projects()
+    await failover.list_projects()
+    assert monitor.status("primary") == "down"
+
+    reads = primary.reads
+    await failover.list_projects()
+    assert primary.reads == reads  # the fallback is tried first now
+
+    primary.down = False
+    now = monitor.health["primary"].last_failure_at + 31
+    monkeypatch.setattr("failover.time.monotonic", lambda: now)
+    assert monitor.rank("fallback") < monitor.rank("primary")  # half-open ranks as slow
+    monitor.health["fallback"].record_failure(ConnectionError())
+    monitor.health["fallback"].record_failure(ConnectionError())
+    await failover.list_projects()
+    assert primary.reads == reads + 1
+    assert monitor.status("primary") == "up"
+
+
+async def test_every_backend_failing_raises(backends, failover):
+    for backend in backends:
+        backend.down = True
+    with pytest.raises(ConnectionError):
+        await failover.list_projects()
+
+
+async def test_cursor_pages_and_writes_use_the_primary(backends, failover):
+    primary, fallback = backends
+    await failover.insert_contact_message({"id": "m1", "name": "Ada", "created_at": "2026-01-01T00:00:00"})
+    assert [row["id"] for row in primary.data["contact_messages"]] == ["m1"]
+    assert fallback.data["contact_messages"] == []
+
+    primary.down = True
+    assert await failover.list_contact_messages(10) == []  # the fallback answers the first page
+    with pytest.raises(ConnectionError):
+        await failover.list_contact_messages(10, after=("2026-01-02T00:00:00", "m2"))
+
+
+async def test_probes_mark_backends_slow_and_down(backends, monitor):
+    primary, fallback = backends
+    fallback.delay = 0.08
+    report = await monitor.probe_all()
+    assert report["fallback"]["status"] == "slow"
+    assert report["primary"]["status"] == "up"
+
+    primary.down = True
+    await monitor.probe_all()
+    report = await monitor.probe_all()
+    assert report["primary"]["status"] == "down"
+    assert report["primary"]["last_error"] == "primary unreachable"
+
+
+def test_readyz(server, backends, monitor, failover, monkeypatch):
+    assert TestClient(server.app).get("/readyz").status_code == 503  # no repository before startup
+
+    monkeypatch.setattr(server, "health_monitor", monitor)
+    with TestClient(server.app) as client:
+        monkeypatch.setattr(server, "repository", failover)
+        monitor.watch(backends)  # startup watched the configured backend
+        backends[0].down = True
+        body = client.get("/readyz").json()
+        assert body["status"] == "ready"
+        assert body["backends"]["primary"]["failures"] == 1
+
+        backends[1].down = True
+        client.get("/readyz")
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["status"] == "unavailable"
+        assert client.get("/healthz").status_code == 200
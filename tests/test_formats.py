@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+import cbor2
+import msgpack
+import pytest
+
+from responses import BinaryFormat, choose_format
+
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+FORM = {"name": "Ada", "email": "ada@example.com", "subject": "Hello", "message": "A message"}
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, None),
+        ("*/*", None),
+        ("application/json", None),
+        ("application/msgpack", BinaryFormat("msgpack")),
+        ("application/x-msgpack", BinaryFormat("msgpack")),
+        ("application/cbor; layout=columnar", BinaryFormat("cbor", True)),
+        ("application/json, application/msgpack", None),  # ties go to the first listed
+        ("application/json;q=0.5, application/cbor", BinaryFormat("cbor")),
+        ("application/msgpack;q=0, application/json;q=0.1", None),
+        ("application/*", None),
+    ],
+)
+def test_choose_format(accept, expected):
+    assert choose_format(accept) == expected
+
+
+def decode(response):
+    media_type = response.headers["content-type"].partition(";")[0]
+    if media_type == MSGPACK:
+        return msgpack.unpackb(response.content, timestamp=3)
+    assert media_type == CBOR
+    return cbor2.loads(response.content)
+
+
+def as_json(value):
+    """Binary values with datetimes written the way the JSON body writes them."""
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+    if isinstance(value, list):
+        return [as_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: as_json(item) for key, item in value.items()}
+    return value
+
+
+def rows(columnar: dict) -> list:
+    columns = columnar["columns"]
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+@pytest.mark.parametrize("media_type", [MSGPACK, CBOR])
+@pytest.mark.parametrize(
+    "path",
+    ["/api/portfolio/complete", "/api/portfolio/projects?view=card", "/api/portfolio/skills", "/api/portfolio/changes"],
+)
+def test_binary_bodies_hold_the_json_content(client, media_type, path):
+    json_body = client.get(path).json()
+    response = client.get(path, headers={"Accept": media_type})
+    assert response.headers["content-type"] == media_type
+    assert as_json(decode(response)) == json_body
+
+
+@pytest.mark.parametrize("media_type", [MSGPACK, CBOR])
+def test_datetimes_are_native_timestamps(client, media_type):
+    client.post("/api/contact", json=FORM)
+    message = decode(client.get("/api/contact/messages", headers={"Accept": media_type}))[0]
+    assert isinstance(message["created_at"], datetime)
+    assert message["created_at"].tzinfo is not None
+
+
+def test_columnar_layout(client):
+    projects = client.get("/api/portfolio/projects").json()
+    response = client.get("/api/portfolio/projects", headers={"Accept": MSGPACK + "; layout=columnar"})
+    assert response.headers["content-type"] == MSGPACK + "; layout=columnar"
+    body = as_json(decode(response))
+    assert list(body["columns"]) == list(projects[0])
+    assert rows(body) == projects
+    assert len(response.content) < len(client.get("/api/portfolio/projects", headers={"Accept": MSGPACK}).content)
+
+
+def test_each_representation_has_its_own_etag_and_varies_on_accept(client):
+    as_json_response = client.get("/api/portfolio/projects")
+    as_msgpack = client.get("/api/portfolio/projects", headers={"Accept": MSGPACK})
+    assert as_json_response.headers["etag"] != as_msgpack.headers["etag"]
+    for response in (as_json_response, as_msgpack):
+        assert "Accept" in response.headers["vary"]
+    revalidated = client.get("/api/portfolio/projects", headers={"Accept": MSGPACK, "If-None-Match": as_msgpack.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert client.get("/api/portfolio/projects", headers={"If-None-Match": as_msgpack.headers["etag"]}).status_code == 200
+
+
+def test_uncached_endpoints_keep_status_and_headers(client):
+    created = client.post("/api/status", json={"client_name": "probe"}, headers={"Accept": CBOR})
+    assert created.status_code == 200
+    assert decode(created)["client_name"] == "probe"
+    assert created.headers["vary"] == "Accept"
+
+    client.post("/api/contact", json=FORM)
+    again = client.post("/api/contact", json=FORM, headers={"Accept": MSGPACK})
+    assert again.headers["x-duplicate-submission"] == "true"
+    assert decode(again)["name"] == "Ada"
+
+
+def test_errors_stay_json(client):
+    response = client.get("/api/portfolio/projects?fields=password", headers={"Accept": MSGPACK})
+    assert response.status_code == 400
+    assert response.headers["content-type"] == "application/json"
+    assert "detail" in response.json()
@@ -0,0 +1,137 @@
+import pytest
+from pymongo import ASCENDING, IndexModel
+
+from benchmarks.fakes import FakeDatabase
+from benchmarks.stub_github import StubGitHub, make_repos
+from github_sync import GitHubSync, infer_category, repo_key, repo_path
+from indexes import ensure_mongo_indexes
+from repository import MemoryRepository, build_seed_data
+
+pytestmark = pytest.mark.anyio
+
+pytest.importorskip("requests")
+
+
+@pytest.fixture
+def stub():
+    with StubGitHub(make_repos(5)) as stub:
+        yield stub
+
+
+@pytest.fixture
+def github(stub):
+    sync = GitHubSync("octocat", api_url=stub.url, exclude=["repo-3"])
+    yield sync
+    sync.close()
+
+
+@pytest.fixture
+def repository():
+    return MemoryRepository(build_seed_data(), writable=True)
+
+
+def synced(projects):
+    return [project for project in projects if "github.com/octocat/" in project["github"]]
+
+
+def test_repo_helpers():
+    assert repo_key("Agent_Hacks 2") == "agenthacks2"
+    assert infer_category({"topics": ["computer-vision"]}) == "Computer Vision"
+    assert infer_category({"topics": ["react"]}) == "Full-Stack"
+    assert infer_category({}) == "AI/ML"
+    assert repo_path("https://github.com/OctoCat/Repo-0/") == "octocat/repo-0"
+
+
+async def test_first_sync_imports_non_fork_repos(github, repository):
+    result = await github.sync(repository)
+    assert result["changed"] and result["created"] == 4  # repo-3 is excluded
+    titles = [project["title"] for project in synced(await repository.list_projects())]
+    assert titles == ["repo 0", "repo 1", "repo 2", "repo 4"]
+
+
+async def test_unchanged_account_costs_only_304s(github, stub, repository):
+    await github.sync(repository)
+    writes = len(repository.changes)
+    result = await github.sync(repository)
+    assert result["changed"] is False
+    assert stub.not_modified == 1
+    assert len(repository.changes) == writes
+
+
+async def test_pages_are_followed_and_cached(stub, github, repository):
+    stub.repos = make_repos(250)
+    await github.sync(repository)
+    assert stub.requests == 3
+    await github.sync(repository)
+    assert stub.not_modified == 3
+
+
+async def test_hand_edits_survive_and_new_repos_go_last(github, stub, repository):
+    await github.sync(repository)
+    edited = synced(await repository.list_projects())[0]
+    await repository.upsert_projects([dict(edited, featured=True, order=1)], "github")
+
+    stub.repos = make_repos(7)
+    stub.repos[0]["description"] = "Rewritten upstream"
+    result = await github.sync(repository)
+    assert (result["created"], result["updated"]) == (2, 4)
+
+    projects = {project["github"]: project for project in await repository.list_projects()}
+    first = projects[edited["github"]]
+    assert first["featured"] is True and first["order"] == 1  # insert-only fields kept
+    assert first["description"] == "Rewritten upstream"  # synced fields rewritten
+    before = max(project["order"] for project in projects.values() if project["title"] not in ("repo 5", "repo 6"))
+    assert [projects[f"https://github.com/octocat/repo-{i}"]["order"] for i in (5, 6)] == [before + 1, before + 2]
+
+
+async def test_failed_write_forgets_etags(github, stub, repository, monkeypatch):
+    await github.sync(repository)
+
+    async def broken(*args):
+        raise ConnectionError("database down")
+
+    stub.repos = make_repos(6)
+    with monkeypatch.context() as patch:
+        patch.setattr(repository, "upsert_projects", broken)
+        with pytest.raises(ConnectionError):
+            await github.sync(repository)
+    result = await github.sync(repository)
+    assert result["changed"] and result["created"] == 1
+
+
+async def test_curated_projects_with_a_repo_url_are_left_alone(github, repository):
+    curated = dict(build_seed_data()["projects"][0], id="curated", title="Hand-written", github="https://github.com/octocat/repo-0")
+    await repository.insert_projects([curated])
+    result = await github.sync(repository)
+    assert (result["created"], result["skipped"]) == (3, 1)
+    projects = [project for project in await repository.list_projects() if project["github"] == curated["github"]]
+    assert [project["title"] for project in projects] == ["Hand-written"]
+    assert "github_repo" not in projects[0]
+
+
+async def test_github_repo_index_only_covers_synced_rows():
+    db = FakeDatabase()
+    await db["projects"].create_indexes([IndexModel([("github", ASCENDING)], name="github_unique", unique=True)])
+    await ensure_mongo_indexes(db)
+    assert "github_unique" not in db["projects"].indexes
+    assert db["projects"].indexes["github_repo_unique"] == (
+        [("github_repo", ASCENDING)], True, {"github_repo": {"$type": "string"}},
+    )
+
+
+def test_hand_written_projects_may_share_a_url(client, new_project):
+    url = "https://github.com/example"
+    response = client.post("/api/portfolio/projects/bulk", json=[new_project(github=url), new_project(github=url)])
+    assert response.json()["created"] == 2
+
+
+def test_sync_endpoint(client, server, github, monkeypatch):
+    monkeypatch.setattr(server, "github_sync", None)
+    assert client.post("/api/admin/github/sync").status_code == 400
+    assert client.get("/api/admin/github/sync").json() == {"enabled": False}
+
+    monkeypatch.setattr(server, "github_sync", github)
+    result = client.post("/api/admin/github/sync").json()
+    assert result["created"] == 4
+    assert len(synced(client.get("/api/portfolio/projects").json())) == 4
+    assert client.get("/api/admin/github/sync").json()["last_result"]["created"] == 4
@@ -0,0 +1,112 @@
+import pytest
+
+from guards import DedupWindow, MemoryBucketStore, RateLimiter, RateLimitRule
+
+pytestmark = pytest.mark.anyio
+
+FORM = {"name": "Ada", "email": "ada@example.com", "subject": "Hello", "message": "A message"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("guards.time.monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize(
+    "spec, rule",
+    [
+        ("5/minute", RateLimitRule(5 / 60, 5)),
+        ("10/second", RateLimitRule(10.0, 10)),
+        (" 30 / hour ; burst = 3 ", RateLimitRule(30 / 3600, 3)),
+    ],
+)
+def test_rule_parsing(spec, rule):
+    assert RateLimitRule.parse(spec) == rule
+
+
+def test_invalid_rule():
+    with pytest.raises(ValueError):
+        RateLimitRule.parse("5 per minute")
+
+
+async def test_bucket_allows_a_burst_then_refills(clock):
+    store, rule = MemoryBucketStore(), RateLimitRule.parse("6/minute;burst=2")
+    assert [(await store.take("client", rule)).allowed for _ in range(3)] == [True, True, False]
+    denied = await store.take("client", rule)
+    assert denied.retry_after == pytest.approx(10.0)
+    clock[0] += 10
+    assert (await store.take("client", rule)).allowed
+    assert (await store.take("other", rule)).allowed  # buckets are per key
+
+
+async def test_idle_buckets_are_dropped_past_max_keys(clock):
+    store, rule = MemoryBucketStore(max_keys=2), RateLimitRule.parse("1/minute")
+    for key in ("a", "b", "c"):
+        await store.take(key, rule)
+    assert (await store.take("a", rule)).allowed  # evicted, so it starts full again
+    assert not (await store.take("c", rule)).allowed
+
+
+async def test_unknown_rule_is_not_limited():
+    limiter = RateLimiter(MemoryBucketStore(), {"contact": RateLimitRule.parse("1/minute")})
+    assert await limiter.check("admin", "client") is None
+
+
+def test_dedup_key_ignores_case_and_whitespace():
+    assert DedupWindow.key({"message": "Hello  there\n"}) == DedupWindow.key({"message": "hello there"})
+    assert DedupWindow.key({"message": "Hello"}) != DedupWindow.key({"message": "Goodbye"})
+
+
+def test_dedup_window_expires(clock):
+    window = DedupWindow(ttl=60)
+    window.put("key", "answer")
+    assert window.get("key") == "answer"
+    clock[0] += 61
+    assert window.get("key") is None
+    assert window.hits == 1
+
+
+def test_dedup_window_disabled():
+    window = DedupWindow(ttl=0)
+    window.put("key", "answer")
+    assert window.get("key") is None
+
+
+@pytest.fixture
+def limited(server, monkeypatch):
+    monkeypatch.setattr(server, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(server, "rate_limiter", RateLimiter(MemoryBucketStore(), {
+        "contact": RateLimitRule.parse("2/minute"),
+        "admin": RateLimitRule.parse("1/minute"),
+    }))
+
+
+def test_contact_is_rate_limited_per_client(client, limited):
+    forms = [dict(FORM, message=f"Message {i}") for i in range(3)]
+    responses = [client.post("/api/contact", json=form) for form in forms]
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[0].headers["x-ratelimit-remaining"] == "1"
+    assert int(responses[2].headers["retry-after"]) >= 1
+    # Other routes have their own buckets
+    assert client.get("/api/admin/cache").status_code == 200
+
+
+def test_forwarded_clients_only_when_trusted(client, server, limited, monkeypatch):
+    first = {"X-Forwarded-For": "203.0.113.1"}
+    second = {"X-Forwarded-For": "203.0.113.2"}
+    assert client.get("/api/admin/cache", headers=first).status_code == 200
+    assert client.get("/api/admin/cache", headers=second).status_code == 429
+
+    monkeypatch.setattr(server, "RATE_LIMIT_TRUST_PROXY", True)
+    assert client.get("/api/admin/cache", headers=second).status_code == 200
+    assert client.get("/api/admin/cache", headers=second).status_code == 429
+
+
+def test_duplicate_contact_is_not_written_twice(client, server):
+    first = client.post("/api/contact", json=FORM)
+    again = client.post("/api/contact", json=dict(FORM, message="  a MESSAGE "))
+    assert again.headers["x-duplicate-submission"] == "true"
+    assert again.json() == first.json()
+    assert len(client.get("/api/contact/messages").json()) == 1
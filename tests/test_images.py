@@ -0,0 +1,245 @@
+import asyncio
+import io
+import os
+
+import httpx
+import pytest
+from PIL import Image
+
+from images import IMMUTABLE, DerivativeCache, ImageError, ImageService, service_from_env
+
+
+def png(width: int, height: int, color=(200, 40, 40)) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(out, "PNG")
+    return out.getvalue()
+
+
+@pytest.fixture
+def service(tmp_path):
+    root = tmp_path / "public"
+    (root / "images" / "projects").mkdir(parents=True)
+    (root / "images" / "projects" / "shot.png").write_bytes(png(500, 250))
+    (root / "notes.txt").write_text("not an image")
+    (tmp_path / "secret.png").write_bytes(png(10, 10))
+    return ImageService(root, tmp_path / "cache", widths=(160, 320, 640), formats=["webp", "jpeg"])
+
+
+def remote(service: ImageService, handler) -> ImageService:
+    service._http_client = lambda: httpx.Client(transport=httpx.MockTransport(handler), follow_redirects=False)
+    return service
+
+
+def status(call) -> int:
+    with pytest.raises(ImageError) as error:
+        call()
+    return error.value.status
+
+
+@pytest.mark.parametrize(
+    "src, expected",
+    [
+        ("/../secret.png", 400),
+        ("/images/../../secret.png", 400),
+        ("/notes.txt", 400),
+        ("/images/projects/missing.png", 404),
+    ],
+)
+def test_only_images_under_the_root_are_read(service, src, expected):
+    assert status(lambda: service.derivative(src, 160, "webp")) == expected
+
+
+def test_derivatives_are_resized_and_cached(service):
+    first = service.derivative("/images/projects/shot.png", 320, "webp")
+    assert first.media_type == "image/webp"
+    with Image.open(first.path) as image:
+        assert (image.format, image.size) == ("WEBP", (320, 160))
+    assert service.derivative("/images/projects/shot.png", 320, "webp").path == first.path
+    assert service.cache.hits == 1
+    # Never scaled up
+    with Image.open(service.derivative("/images/projects/shot.png", 640, "jpeg").path) as image:
+        assert image.size == (500, 250)
+
+
+def test_unlisted_widths_and_formats_are_rejected(service):
+    assert status(lambda: service.derivative("/images/projects/shot.png", 300, "webp")) == 400
+    assert status(lambda: service.derivative("/images/projects/shot.png", 320, "gif")) == 400
+
+
+def test_srcset_only_after_resolve_and_up_to_the_source_width(service):
+    src = "/images/projects/shot.png"
+    assert service.srcset(src) is None
+    assert service.resolve([src, "/images/projects/missing.png"])
+    srcset = service.srcset(src)
+    assert set(srcset) == {"webp", "jpeg"}
+    digest = service.known(src).digest
+    assert srcset["webp"] == (
+        f"/api/images/160.webp?src={src}&v={digest} 160w, /api/images/320.webp?src={src}&v={digest} 320w"
+    )
+    assert not service.resolve([src])  # nothing changed
+
+    path = service.root / "images" / "projects" / "shot.png"
+    path.write_bytes(png(800, 400, color=(0, 0, 255)))
+    assert service.resolve([src])
+    assert service.known(src).digest != digest
+    assert "640w" in service.srcset(src)["webp"]
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = DerivativeCache(tmp_path, max_bytes=25)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"x" * 10)
+    assert cache.get("a") is not None
+    cache.put("c", b"x" * 10)
+    assert cache.get("b") is None
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+    assert cache.stats()["evicted"] == 1
+
+
+GITHUB = "https://opengraph.githubassets.com/1/example/repo"
+
+
+def test_remote_originals_are_fetched_once(service):
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        return httpx.Response(200, content=png(400, 200))
+
+    remote(service, handler)
+    assert service.derivative(GITHUB, 160, "jpeg").media_type == "image/jpeg"
+    service.derivative(GITHUB, 320, "jpeg")
+    assert requests == [GITHUB]
+
+
+@pytest.mark.parametrize(
+    "src",
+    ["http://opengraph.githubassets.com/1/example/repo", "https://example.com/image.png", "https://githubassets.com.evil.test/x.png"],
+)
+def test_only_https_on_allowed_hosts(service, src):
+    remote(service, lambda request: pytest.fail(f"fetched {request.url}"))
+    assert status(lambda: service.source(src)) == 400
+
+
+def test_redirects_are_checked_against_the_allow_list(service):
+    def handler(request):
+        if request.url.host == "opengraph.githubassets.com":
+            return httpx.Response(302, headers={"Location": "https://internal.example/admin.png"})
+        pytest.fail(f"followed a redirect to {request.url}")
+
+    assert status(lambda: remote(service, handler).source(GITHUB)) == 400
+
+
+def test_redirect_to_an_allowed_host_is_followed(service):
+    def handler(request):
+        if request.url.host == "opengraph.githubassets.com":
+            return httpx.Response(302, headers={"Location": "https://avatars.githubusercontent.com/u/1"})
+        return httpx.Response(200, content=png(300, 300))
+
+    assert remote(service, handler).source(GITHUB).width == 300
+
+
+def test_redirect_loop_is_a_502(service):
+    remote(service, lambda request: httpx.Response(302, headers={"Location": str(request.url)}))
+    assert status(lambda: service.source(GITHUB)) == 502
+
+
+def test_oversized_and_unreachable_originals(service):
+    service.max_source_bytes = 100
+    assert status(lambda: remote(service, lambda request: httpx.Response(200, content=b"x" * 500)).source(GITHUB)) == 413
+
+    def unreachable(request):
+        raise httpx.ConnectError("connection refused")
+
+    assert status(lambda: remote(service, unreachable).source(GITHUB)) == 502
+
+
+def test_stale_original_is_kept_when_the_refetch_fails(service):
+    remote(service, lambda request: httpx.Response(200, content=png(400, 200))).source(GITHUB)
+    service.remote_ttl = 0
+
+    def unreachable(request):
+        raise httpx.ConnectError("connection refused")
+
+    assert remote(service, unreachable).source(GITHUB).width == 400
+
+
+def test_warm_renders_each_width_up_to_the_source(service):
+    counts = service.warm(["/images/projects/shot.png", "/notes.txt"])
+    assert counts == {"sources": 2, "rendered": 4, "cached": 0, "failed": 1}
+    assert service.warm(["/images/projects/shot.png"])["cached"] == 4
+
+
+def test_images_are_off_unless_enabled(client, monkeypatch):
+    monkeypatch.delenv("PORTFOLIO_IMAGES", raising=False)
+    assert service_from_env() is None
+    assert client.get("/api/images/320.webp?src=/images/projects/shot.png").status_code == 404
+    assert all("image_srcset" not in project for project in client.get("/api/portfolio/projects").json())
+
+
+@pytest.fixture
+def images_client(server, service, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(server, "image_service", service)
+    with TestClient(server.app) as client:
+        yield client
+
+
+def test_image_endpoint(images_client, service):
+    src = "/images/projects/shot.png"
+    response = images_client.get(f"/api/images/320.webp?src={src}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["cache-control"] != IMMUTABLE  # no version, so not cacheable for good
+
+    versioned = images_client.get(f"/api/images/320.webp?src={src}&v={service.known(src).digest}")
+    assert versioned.headers["cache-control"] == IMMUTABLE
+    again = images_client.get(f"/api/images/320.webp?src={src}", headers={"If-None-Match": response.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_image_endpoint_errors(images_client):
+    assert images_client.get("/api/images/320.webp?src=/../secret.png").status_code == 400
+    assert images_client.get("/api/images/large.webp?src=/images/projects/shot.png").status_code == 400
+    assert images_client.get("/api/images/320.webp?src=/images/projects/missing.png").status_code == 404
+
+
+@pytest.fixture
+def resolving(server, service, monkeypatch):
+    monkeypatch.setattr(server, "image_service", service)
+    monkeypatch.setattr(server, "_images_to_resolve", set())
+    monkeypatch.setattr(server.app.state, "image_resolver", None, raising=False)
+    return server
+
+
+def test_images_stay_pending_without_a_running_loop(resolving, service):
+    src = "/images/projects/shot.png"
+    assert resolving._with_srcset([{"image": src}, {"image": ""}]) == [{"image": src, "image_srcset": None}, {"image": ""}]
+    assert resolving._images_to_resolve == {src}
+    assert resolving.app.state.image_resolver is None
+
+    asyncio.run(resolving._resolve_pending_images())
+    assert resolving._images_to_resolve == set()
+    assert resolving._with_srcset([{"image": src}])[0]["image_srcset"] == service.srcset(src)
+
+
+@pytest.mark.anyio
+async def test_reads_schedule_one_resolver_task(resolving, service):
+    src = "/images/projects/shot.png"
+    resolving._with_srcset([{"image": src}])
+    resolver = resolving.app.state.image_resolver
+    resolving._with_srcset([{"image": src}])
+    assert resolving.app.state.image_resolver is resolver  # one task while it runs
+    await resolver
+    assert resolving._with_srcset([{"image": src}])[0]["image_srcset"] == service.srcset(src)
+
+
+def test_shutdown_drops_the_resolver(resolving):
+    from fastapi.testclient import TestClient
+
+    with TestClient(resolving.app) as client:
+        client.get("/api/portfolio/projects")
+        assert resolving.app.state.image_resolver is not None
+    assert resolving.app.state.image_resolver is None
+    assert resolving._images_to_resolve == set()
@@ -0,0 +1,49 @@
+import pytest
+
+from benchmarks.fakes import install_fake_mongo
+from indexes import _plan_stages, ensure_mongo_indexes, explain_queries
+from repository import build_seed_data
+
+pytestmark = pytest.mark.anyio
+
+
+def test_plan_stages_walks_every_branch():
+    plan = {
+        "stage": "SORT_MERGE",
+        "inputStages": [
+            {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+            {"stage": "COLLSCAN"},
+        ],
+    }
+    assert _plan_stages(plan) == ["SORT_MERGE", "FETCH", "IXSCAN", "COLLSCAN"]
+
+
+async def test_queries_collection_scan_without_indexes(server):
+    install_fake_mongo(server)
+    report = await explain_queries(server.repository)
+    assert report and all("COLLSCAN" in entry["problems"] for entry in report)
+
+
+async def test_declared_indexes_serve_every_endpoint_query(server):
+    db = install_fake_mongo(server)
+    await ensure_mongo_indexes(db)
+    await ensure_mongo_indexes(db)  # a second run is a no-op
+    report = await explain_queries(server.repository)
+    assert [entry["endpoint"] for entry in report if entry["problems"]] == []
+    assert all("IXSCAN" in entry["stages"] for entry in report)
+
+
+async def test_seeding_keeps_the_indexes(server):
+    db = install_fake_mongo(server)
+    await ensure_mongo_indexes(db)
+    await server.repository.replace_all(build_seed_data())
+    assert not any(entry["problems"] for entry in await explain_queries(server.repository))
+
+
+def test_query_plan_endpoint(client, server):
+    response = client.get("/api/admin/diagnostics/query-plans")
+    assert response.status_code == 400
+
+    install_fake_mongo(server)
+    body = client.get("/api/admin/diagnostics/query-plans").json()
+    assert body["ok"] is False
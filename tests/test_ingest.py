@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from ingest import IngestError, iter_ndjson_lines
+from repository import InsertResult
+
+pytestmark = pytest.mark.anyio
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def collect(lines):
+    return [item async for item in lines]
+
+
+async def test_lines_split_across_chunks():
+    lines = iter_ndjson_lines(chunks(b'{"a": 1}\n{"b"', b": 2}\n\n", b'{"c": 3}'), 1024)
+    assert await collect(lines) == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+async def test_oversized_line_is_rejected():
+    with pytest.raises(IngestError, match="Line 2"):
+        await collect(iter_ndjson_lines(chunks(b"{}\n", b"x" * 50), 16))
+
+
+def ndjson(*rows) -> bytes:
+    return b"".join((row if isinstance(row, bytes) else json.dumps(row).encode()) + b"\n" for row in rows)
+
+
+def test_ndjson_ingest_reports_each_line(client, new_project):
+    body = ndjson(
+        new_project(title="One", github="https://github.com/example/one"),
+        b"{not json",
+        new_project(title="Two", github="https://github.com/example/two", status="unknown"),
+        new_project(title="Three", github="https://github.com/example/three"),
+    )
+    result = client.post("/api/portfolio/projects/ingest", content=body).json()
+    assert (result["created"], result["failed"]) == (2, 2)
+    assert [(row["line"], row["status"]) for row in result["results"]] == [
+        (1, "created"), (2, "invalid"), (3, "invalid"), (4, "created"),
+    ]
+    assert "status" in result["results"][2]["error"]
+    titles = [project["title"] for project in client.get("/api/portfolio/projects").json()]
+    assert {"One", "Three"} <= set(titles)
+    assert client.get("/api/portfolio/search?q=three").json()["total"] >= 1
+
+
+def test_ndjson_ingest_writes_in_batches(client, server, new_project, monkeypatch):
+    batches = []
+    insert = server.repository.insert_projects
+
+    async def recording(projects):
+        batches.append(len(projects))
+        return await insert(projects)
+
+    monkeypatch.setattr(server.repository, "insert_projects", recording)
+    body = ndjson(*(new_project(title=f"P{i}", github=f"https://github.com/example/p{i}") for i in range(5)))
+    result = client.post("/api/portfolio/projects/ingest?batch_size=2", content=body).json()
+    assert result["created"] == 5
+    assert batches == [2, 2, 1]
+
+
+def test_ndjson_ingest_line_limit(client, server, new_project, monkeypatch):
+    monkeypatch.setattr(server, "PORTFOLIO_INGEST_MAX_LINE_BYTES", 64)
+    response = client.post("/api/portfolio/projects/ingest", content=ndjson(new_project()))
+    assert response.status_code == 413
+
+
+def test_bulk_reports_rejected_rows(client, server, new_project, monkeypatch):
+    insert = server.repository.insert_projects
+
+    async def reject_second(projects):
+        results = await insert([projects[0], projects[2]])
+        return [results[0], InsertResult(error="duplicate key"), results[1]]
+
+    monkeypatch.setattr(server.repository, "insert_projects", reject_second)
+    payload = [new_project(title=f"B{i}", github=f"https://github.com/example/b{i}") for i in range(3)]
+    response = client.post("/api/portfolio/projects/bulk", json=payload)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 1)
+    assert [(row["line"], row["status"], row["error"]) for row in result["results"]][1] == (2, "failed", "duplicate key")
+
+
+def test_bulk_failure_names_rows_already_written(client, server, new_project, monkeypatch):
+    insert = server.repository.insert_projects
+    calls = []
+
+    async def fail_second_batch(projects):
+        calls.append(projects)
+        if len(calls) > 1:
+            raise ConnectionError("connection reset")
+        return await insert(projects)
+
+    monkeypatch.setattr(server, "PORTFOLIO_INGEST_BATCH_SIZE", 1)
+    monkeypatch.setattr(server.repository, "insert_projects", fail_second_batch)
+    payload = [new_project(title=f"C{i}", github=f"https://github.com/example/c{i}") for i in range(2)]
+    response = client.post("/api/portfolio/projects/bulk", json=payload)
+    assert response.status_code == 500
+    assert "1 rows already created" in response.json()["detail"]
+    assert "C0" in [project["title"] for project in client.get("/api/portfolio/projects").json()]
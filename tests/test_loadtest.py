@@ -0,0 +1,47 @@
+import argparse
+import json
+
+import pytest
+
+from benchmarks import loadtest
+
+pytestmark = pytest.mark.anyio
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert loadtest.percentile(values, 50) == 50.0
+    assert loadtest.percentile(values, 99) == 99.0
+    assert loadtest.percentile([3.0], 95) == 3.0
+    assert loadtest.percentile([], 50) == 0.0
+
+
+def test_dataset_rows_are_unique():
+    projects = loadtest.make_dataset(25)["projects"]
+    assert len(projects) == 25
+    for field in ("id", "title", "github"):
+        assert len({row[field] for row in projects}) == 25
+
+
+async def test_every_scenario_succeeds_on_each_backend(server, tmp_path, capsys):
+    output = tmp_path / "results.json"
+    args = argparse.Namespace(
+        backends=["memory", "mongo"],
+        projects=[5],
+        concurrency=[2],
+        endpoints=list(loadtest.SCENARIOS),
+        requests=4,
+        warmup=1,
+        no_cache=False,
+        output=str(output),
+        compare=None,
+    )
+    report = await loadtest.main(args)
+    results = report["results"]
+    assert len(results) == 2 * len(loadtest.SCENARIOS)
+    assert [(r["backend"], r["endpoint"], r["statuses"]) for r in results if r["errors"]] == []
+    assert json.loads(output.read_text())["results"] == results
+
+    capsys.readouterr()
+    loadtest.compare(results, str(output))
+    assert f"vs {output}" in capsys.readouterr().out
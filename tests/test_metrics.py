@@ -0,0 +1,72 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from metrics import Histogram, Metrics, MetricsMiddleware
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(("/a",), value)
+    lines = list(histogram.render())
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.550000' in lines
+
+
+@pytest.fixture
+def instrumented(server):
+    """The server app behind its metrics middleware, recording and sending Server-Timing."""
+    metrics = Metrics()
+    with TestClient(MetricsMiddleware(server.app, metrics, record=True, server_timing=True)) as client:
+        yield client, metrics
+
+
+def test_routes_are_labelled_by_template(instrumented):
+    client, metrics = instrumented
+    client.get("/api/portfolio/projects")
+    client.get("/api/portfolio/search?q=agent")
+    client.get("/api/portfolio/search?q=react")
+    client.get("/no/such/path")
+    text = metrics.render()
+    assert 'portfolio_request_duration_seconds_count{method="GET",route="/api/portfolio/search",status="200"} 2' in text
+    assert 'route="unmatched",status="404"' in text
+    assert "q=agent" not in text
+
+
+def test_phases_and_db_operations_are_attributed(instrumented, server):
+    client, metrics = instrumented
+    server.portfolio_cache.invalidate()
+    client.get("/api/portfolio/projects")
+    text = metrics.render()
+    for phase in ("db", "validate", "serialize"):
+        assert f'portfolio_request_phase_seconds_count{{route="/api/portfolio/projects",phase="{phase}"}} 1' in text
+    assert 'operation="list_projects"' in text
+
+
+def test_server_timing_header(instrumented, server):
+    client, _ = instrumented
+    server.portfolio_cache.invalidate()
+    header = client.get("/api/portfolio/education").headers["server-timing"]
+    assert re.search(r"db;dur=\d+\.\d\d", header)
+    assert re.search(r"app;dur=\d+\.\d\d$", header)
+
+
+def test_metrics_endpoint_off_by_default(client, server):
+    assert server.PORTFOLIO_METRICS is False
+    assert client.get("/metrics").status_code == 404
+    assert "server-timing" not in client.get("/api/portfolio/projects").headers
+
+
+def test_metrics_endpoint_renders_prometheus_text(client, server, monkeypatch):
+    metrics = Metrics()
+    metrics.requests.observe(("GET", "/api/portfolio/projects", "200"), 0.002)
+    monkeypatch.setattr(server, "PORTFOLIO_METRICS", True)
+    monkeypatch.setattr(server, "metrics", metrics)
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE portfolio_request_duration_seconds histogram" in response.text
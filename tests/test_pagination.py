@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from benchmarks.fakes import install_fake_mongo
+
+
+def send_messages(client, count: int, **fields):
+    ids = []
+    for i in range(count):
+        message = {"name": f"Sender {i}", "email": f"sender{i}@example.com", "subject": "Hello", "message": f"Message {i}"}
+        message.update(fields)
+        response = client.post("/api/contact", json=message)
+        assert response.status_code == 200
+        ids.append(response.json()["id"])
+    return ids
+
+
+def pages(client, path: str, limit: int):
+    cursor, seen = None, []
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        seen.append([row["id"] for row in response.json()])
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+
+
+@pytest.mark.parametrize("backend", ["memory", "mongo"])
+def test_contact_messages_page_newest_first(client, server, backend):
+    if backend == "mongo":
+        install_fake_mongo(server)
+    ids = send_messages(client, 5)
+    seen = pages(client, "/api/contact/messages", 2)
+    assert [len(page) for page in seen] == [2, 2, 1]
+    assert [row_id for page in seen for row_id in page] == ids[::-1]
+
+
+def test_full_last_page_ends_with_an_empty_one(client):
+    send_messages(client, 4)
+    assert [len(page) for page in pages(client, "/api/contact/messages", 2)] == [2, 2, 0]
+
+
+def test_status_filter(client, server):
+    ids = send_messages(client, 3)
+    assert client.get("/api/contact/messages?status=read").json() == []
+    assert [row["id"] for row in client.get("/api/contact/messages?status=new").json()] == ids[::-1]
+
+
+def test_invalid_cursor_and_limit(client):
+    assert client.get("/api/contact/messages?cursor=not-a-cursor").status_code == 400
+    assert client.get("/api/contact/messages?limit=0").status_code == 422
+    assert client.get("/api/contact/messages?limit=1001").status_code == 422
+
+
+def test_ndjson_export_streams_every_message(client):
+    ids = send_messages(client, 3)
+    response = client.get("/api/contact/messages?format=ndjson")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["id"] for row in rows) == sorted(ids)
+
+
+def test_status_checks_page(client):
+    ids = [client.post("/api/status", json={"client_name": f"client-{i}"}).json()["id"] for i in range(3)]
+    seen = pages(client, "/api/status", 2)
+    assert [row_id for page in seen for row_id in page] == ids[::-1]
@@ -0,0 +1,80 @@
+import pytest
+
+from models import Experience, Project
+from projection import VIEWS, resolve_complete_fields, resolve_fields, sparse_model
+
+
+def test_fields_are_resolved_in_model_order_with_id():
+    assert resolve_fields(Project, fields="tech, title") == ("id", "title", "tech")
+    assert resolve_fields(Project, view="card") == VIEWS[Project]["card"]
+    assert resolve_fields(Project, view="detail") is None
+    assert resolve_fields(Project) is None
+
+
+@pytest.mark.parametrize(
+    "view, fields",
+    [("grid", None), (None, "title,secret"), ("card", "title")],
+)
+def test_invalid_selections(view, fields):
+    with pytest.raises(ValueError):
+        resolve_fields(Project, view=view, fields=fields)
+
+
+def test_sparse_model_is_shared_per_selection():
+    card = sparse_model(Project, VIEWS[Project]["card"])
+    assert card.__name__ == "ProjectCard"
+    assert set(card.model_fields) == set(VIEWS[Project]["card"])
+    assert sparse_model(Project, VIEWS[Project]["card"]) is card
+    assert sparse_model(Project, None) is Project
+
+
+def test_complete_fields_by_section():
+    assert resolve_complete_fields(fields="projects.title,experience.company") == {
+        "projects": ("id", "title"),
+        "experience": ("id", "company"),
+    }
+    assert resolve_complete_fields(fields="projects.title")["experience"] is None
+    with pytest.raises(ValueError):
+        resolve_complete_fields(fields="skills.name")
+
+
+def test_fields_query(client):
+    rows = client.get("/api/portfolio/projects?fields=title,tech").json()
+    assert rows and all(set(row) == {"id", "title", "tech"} for row in rows)
+    full = client.get("/api/portfolio/projects").json()
+    assert [row["title"] for row in rows] == [row["title"] for row in full]
+
+
+def test_card_view(client):
+    projects = client.get("/api/portfolio/projects/featured?view=card").json()
+    assert projects and all(set(row) == set(VIEWS[Project]["card"]) for row in projects)
+    experience = client.get("/api/portfolio/experience?view=card").json()
+    assert experience and all(set(row) == set(VIEWS[Experience]["card"]) for row in experience)
+
+
+def test_sparse_selection_reads_only_those_fields(client, server, monkeypatch):
+    requested = []
+    read = server.repository.list_projects
+
+    async def recording(category=None, featured_only=False, fields=None):
+        requested.append(fields)
+        return await read(category, featured_only, fields)
+
+    monkeypatch.setattr(server.repository, "list_projects", recording)
+    client.get("/api/portfolio/projects?fields=title")
+    assert requested == [("id", "title")]
+
+
+def test_complete_view(client):
+    body = client.get("/api/portfolio/complete?view=card").json()
+    assert all(set(row) == set(VIEWS[Project]["card"]) for row in body["projects"])
+    assert body["personal"]["name"]
+    narrow = client.get("/api/portfolio/complete?fields=projects.title").json()
+    assert all(set(row) == {"id", "title"} for row in narrow["projects"])
+    assert "company" in narrow["experience"][0]
+
+
+def test_bad_selection_is_400(client):
+    assert client.get("/api/portfolio/projects?fields=password").status_code == 400
+    assert client.get("/api/portfolio/projects?view=card&fields=title").status_code == 400
+    assert client.get("/api/portfolio/complete?fields=title").status_code == 400
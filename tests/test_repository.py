@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fakes import install_fake_mongo
+from repository import MemoryRepository, ReadOnlyRepositoryError, build_seed_data, load_memory_data
+
+pytestmark = pytest.mark.anyio
+
+FRONTEND_DATA = Path(__file__).resolve().parent.parent / "frontend" / "src" / "data"
+VOLATILE = ("id", "created_at", "updated_at")  # generated afresh by every build_seed_data()
+
+
+def content(rows):
+    return [{key: value for key, value in row.items() if key not in VOLATILE} for row in rows]
+
+
+async def test_memory_reads_are_ordered_and_filtered():
+    repository = MemoryRepository(build_seed_data())
+    projects = await repository.list_projects()
+    assert [row["order"] for row in projects] == sorted(row["order"] for row in projects)
+    category = projects[0]["category"]
+    assert all(row["category"] == category for row in await repository.list_projects(category))
+    assert all(row["featured"] for row in await repository.list_projects(featured_only=True))
+    assert await repository.list_projects(fields=("id", "title")) == [
+        {"id": row["id"], "title": row["title"]} for row in projects
+    ]
+
+
+async def test_memory_reads_return_copies():
+    repository = MemoryRepository(build_seed_data())
+    (await repository.list_education())[0]["degree"] = "changed"
+    assert (await repository.list_education())[0]["degree"] != "changed"
+
+
+async def test_memory_is_read_only_by_default():
+    repository = MemoryRepository(build_seed_data())
+    assert repository.read_only
+    with pytest.raises(ReadOnlyRepositoryError):
+        await repository.insert_contact_message({"id": "m1"})
+
+
+def test_read_only_backend_answers_405(client, server, monkeypatch):
+    monkeypatch.setattr(server, "repository", MemoryRepository(build_seed_data()))
+    response = client.post(
+        "/api/contact", json={"name": "Ada", "email": "ada@example.com", "subject": "Hi", "message": "Hello"}
+    )
+    assert response.status_code == 405
+    assert client.get("/api/portfolio/projects").status_code == 200
+
+
+@pytest.mark.skipif(not FRONTEND_DATA.is_dir(), reason="no frontend/src/data checkout")
+def test_frontend_data_source():
+    data = load_memory_data(str(FRONTEND_DATA))
+    assert data["projects"] and data["experience"] and data["skills"]
+    assert content(data["personal_info"]) == content(build_seed_data()["personal_info"])
+
+
+def test_mongo_backend_serves_the_same_responses(client, server):
+    memory = {path: client.get(path).json() for path in ("/api/portfolio/projects", "/api/portfolio/skills")}
+    install_fake_mongo(server)
+    for path, body in memory.items():
+        mongo = client.get(path).json()
+        if isinstance(body, list):
+            assert content(mongo) == content(body)
+        else:
+            assert {group: content(rows) for group, rows in mongo.items()} == {
+                group: content(rows) for group, rows in body.items()
+            }
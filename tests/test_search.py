@@ -0,0 +1,65 @@
+from search import SearchIndex, tokenize
+
+
+def document(title: str = "", description: str = "", tech=()):
+    return {"title": (title, 3.0), "description": (description, 1.0), "tech": (" ".join(tech), 2.0)}
+
+
+def build_index() -> SearchIndex:
+    index = SearchIndex()
+    index.add("a", document("Sentiment analysis", "Classifies reviews", ["Python"]), {"tech": ["Python"]}, "A")
+    index.add("b", document("Web shop", "Sentiment of buyers", ["React"]), {"tech": ["React"]}, "B")
+    index.add("c", document("Compiler", "A C++ compiler", ["C++"]), {"tech": ["C++"]}, "C")
+    return index
+
+
+def test_tokenize_keeps_language_names():
+    assert tokenize("C++ and C# with Node.js") == ["c++", "and", "c#", "with", "node", "js"]
+
+
+def test_title_hits_rank_above_description_hits():
+    assert [doc_id for doc_id, _ in build_index().search("sentiment")] == ["a", "b"]
+
+
+def test_prefix_matches_score_less_than_exact():
+    index = build_index()
+    exact = dict(index.search("compiler"))["c"]
+    prefix = dict(index.search("compil"))["c"]
+    assert 0 < prefix < exact
+
+
+def test_filters_and_facets():
+    index = build_index()
+    matches = index.search("sentiment", {"tech": "React"})
+    assert [doc_id for doc_id, _ in matches] == ["b"]
+    assert index.facet_counts(doc_id for doc_id, _ in index.search("sentiment")) == {"tech": {"Python": 1, "React": 1}}
+
+
+def test_remove_and_replace():
+    index = build_index()
+    index.remove("c")
+    assert index.search("compiler") == []
+    assert "compiler" not in index.terms
+    index.add("a", document("Image resizer"), {}, "A2")
+    assert index.search("sentiment")[0][0] == "b"
+    assert len(index) == 2
+
+
+def test_search_endpoint(client):
+    body = client.get("/api/portfolio/search", params={"q": "agent"}).json()
+    assert body["total"] == len(body["results"]) > 0
+    scores = [hit["score"] for hit in body["results"]]
+    assert scores == sorted(scores, reverse=True)
+    assert body["facets"]["type"]
+
+    projects_only = client.get("/api/portfolio/search", params={"q": "agent", "type": "project", "limit": 1}).json()
+    assert len(projects_only["results"]) == 1
+    assert projects_only["results"][0]["type"] == "project"
+    assert client.get("/api/portfolio/search", params={"q": ""}).status_code == 422
+
+
+def test_search_sees_new_projects(client, new_project):
+    client.get("/api/portfolio/search", params={"q": "warmup"})
+    client.post("/api/portfolio/projects/bulk", json=[new_project(title="Quasar telescope scheduler")])
+    hits = client.get("/api/portfolio/search", params={"q": "quasar"}).json()["results"]
+    assert [hit["item"]["title"] for hit in hits] == ["Quasar telescope scheduler"]
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.fakes import install_fake_mongo
+from guards import SingleFlight
+from repository import PORTFOLIO_COLLECTIONS, build_seed_data
+
+pytestmark = pytest.mark.anyio
+
+
+def test_seed_replaces_every_collection(client):
+    project = {key: value for key, value in client.get("/api/portfolio/projects").json()[0].items() if key != "id"}
+    client.post("/api/portfolio/projects/bulk", json=[dict(project, github="https://github.com/example/extra")])
+
+    result = client.post("/api/admin/seed").json()
+    assert result["status"] == "success"
+    assert result["coalesced"] is False
+    seed = build_seed_data()
+    assert {name: entry["count"] for name, entry in result["collections"].items()} == {
+        name: len(seed[name]) for name in PORTFOLIO_COLLECTIONS
+    }
+    assert len(client.get("/api/portfolio/projects").json()) == len(seed["projects"])
+
+
+async def test_mongo_seed_runs_collections_concurrently(server):
+    latency = 0.05
+    db = install_fake_mongo(server, {name: latency for name in PORTFOLIO_COLLECTIONS})
+    started = time.perf_counter()
+    collections = await server.repository.replace_all(build_seed_data())
+    elapsed = time.perf_counter() - started
+
+    # Each collection makes several round trips; run one after another they would
+    # take at least len(PORTFOLIO_COLLECTIONS) times as long as one collection
+    slowest = max(entry["seconds"] for entry in collections.values())
+    assert elapsed < slowest * 2
+    assert not [name for name in db.keys() if name.endswith("__seed")]
+    assert len(db["projects"].docs) == len(build_seed_data()["projects"])
+
+
+async def test_single_flight_shares_one_run():
+    flight = SingleFlight()
+    runs = 0
+
+    async def seed():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return {"status": "success"}
+
+    results = await asyncio.gather(flight.run(seed), flight.run(seed), flight.run(seed))
+    assert runs == 1
+    assert [joined for _, joined in results] == [False, True, True]
+    assert not flight.running
+    await flight.run(seed)
+    assert runs == 2
+
+
+async def test_single_flight_failure_reaches_every_caller():
+    flight = SingleFlight()
+
+    async def broken():
+        await asyncio.sleep(0)
+        raise RuntimeError("seed failed")
+
+    results = await asyncio.gather(flight.run(broken), flight.run(broken), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import List
+
+import pydantic
+import pytest
+from fastapi.utils import create_response_field
+
+import responses
+from benchmarks.bench_validation import MODELS, fastapi_body, storage_rows
+from models import ContactMessage
+from responses import encode_json
+
+
+def reference(model, models) -> bytes:
+    """The body FastAPI writes for `models` returned from a `List[model]` endpoint."""
+    loop = asyncio.new_event_loop()
+    try:
+        return fastapi_body(loop, create_response_field(name="response", type_=List[model]), models)
+    finally:
+        loop.close()
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        if responses.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(responses, "orjson", None)
+    return encode_json
+
+
+@pytest.mark.parametrize("name", list(MODELS))
+def test_bodies_are_byte_identical_to_fastapi(name, encoder, server):
+    model = MODELS[name]
+    models = server._validate(model, storage_rows(name, 25))
+    assert encoder(models) == reference(model, models)
+
+
+def test_datetimes_and_unicode(encoder):
+    messages = [
+        ContactMessage(name="Zoë", email="z@example.com", subject="Ünïcode ✓", message="こんにちは",
+                       created_at=datetime(2026, 1, 2, 3, 4, 5, 600000)),
+        ContactMessage(name="Ada", email="a@example.com", subject="UTC", message="Aware",
+                       created_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)),
+    ]
+    body = encoder(messages)
+    assert body == reference(ContactMessage, messages)
+    assert b'"created_at":"2026-01-02T03:04:05.600000"' in body
+    assert b'"created_at":"2026-01-02T03:04:05Z"' in body
+    assert "こんにちは".encode() in body
+
+
+def test_validate_builds_models_in_one_pass(server):
+    rows = storage_rows("Project", 3)
+    projects = server._validate(MODELS["Project"], rows)
+    assert [project.id for project in projects] == [row["id"] for row in rows]
+    assert all(type(project) is MODELS["Project"] for project in projects)
+    with pytest.raises(pydantic.ValidationError):
+        server._validate(MODELS["Project"], [dict(rows[0], order="first")])
+
+
+def test_list_endpoints_match_fastapi(client, server):
+    for i in range(3):
+        client.post("/api/status", json={"client_name": f"client {i}"})
+        client.post("/api/contact", json={"name": "Ada", "email": "a@example.com", "subject": "Hi", "message": f"Message {i}"})
+    statuses = client.get("/api/status")
+    assert statuses.content == reference(server.StatusCheck, [server.StatusCheck(**row) for row in statuses.json()])
+    messages = client.get("/api/contact/messages")
+    assert messages.content == reference(ContactMessage, [ContactMessage(**row) for row in messages.json()])
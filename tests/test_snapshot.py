@@ -0,0 +1,120 @@
+import gzip
+import os
+
+import httpx
+import pytest
+
+from snapshot import CURRENT, SharedSnapshot, SharedSnapshotMiddleware, render_snapshot, snapshot_key, write_snapshot
+
+pytestmark = pytest.mark.anyio
+
+BODY = b'{"name":"Ada"}'
+
+
+def route(body: bytes = BODY, etag: str = '"v1"') -> dict:
+    return {
+        "etag": etag,
+        "headers": [["content-type", "application/json"], ["etag", etag], ["vary", "Accept, Accept-Encoding"]],
+        "variants": {"identity": body, "gzip": gzip.compress(body)},
+    }
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 418, "headers": []})
+    await send({"type": "http.response.body", "body": b"from the app"})
+
+
+async def request(snapshot: SharedSnapshot, method: str, url: str, **headers) -> httpx.Response:
+    transport = httpx.ASGITransport(app=SharedSnapshotMiddleware(app, snapshot))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, url, headers=headers)
+
+
+def test_snapshot_key_is_canonical():
+    assert snapshot_key("/p", b"b=2&a=AI%2FML") == snapshot_key("/p", b"a=AI/ML&b=2") == "/p?a=AI%2FML&b=2"
+    assert snapshot_key("/p") == "/p"
+
+
+def test_unchanged_data_keeps_its_version(tmp_path):
+    version = write_snapshot(tmp_path, {"/api/portfolio/personal": route()})
+    assert write_snapshot(tmp_path, {"/api/portfolio/personal": route()}) == version
+    assert write_snapshot(tmp_path, {"/api/portfolio/personal": route(b"{}")}, keep=3) != version
+    assert len(list(tmp_path.glob("snapshot-*.bin"))) == 2
+    latest = write_snapshot(tmp_path, {"/api/portfolio/personal": route(b"[]")}, keep=1)
+    assert [path.name for path in tmp_path.glob("snapshot-*.bin")] == [f"snapshot-{latest}.bin"]
+
+
+def test_workers_map_the_published_version(tmp_path):
+    shared = SharedSnapshot(tmp_path, check_interval=0)
+    assert shared.current() is None  # nothing published yet
+
+    version = write_snapshot(tmp_path, {"/api/portfolio/personal": route()})
+    snapshot = shared.current()
+    assert snapshot.version == version
+    assert bytes(snapshot.body(snapshot.routes["/api/portfolio/personal"]["variants"]["identity"])) == BODY
+
+    write_snapshot(tmp_path, {"/api/portfolio/personal": route(b"{}")})
+    assert shared.current().version != version
+
+
+def test_a_write_stops_serving_until_the_refresh_is_published(tmp_path):
+    shared = SharedSnapshot(tmp_path, check_interval=0)
+    write_snapshot(tmp_path, {"/api/portfolio/personal": route()})
+    shared.request_refresh("personal_info")
+    assert shared.current() is None
+    write_snapshot(tmp_path, {"/api/portfolio/personal": route()}, refreshed=float((tmp_path / "REFRESH").read_text()))
+    assert shared.current() is not None
+
+
+def test_an_abandoned_snapshot_is_not_served(tmp_path):
+    write_snapshot(tmp_path, {"/api/portfolio/personal": route()})
+    os.utime(tmp_path / CURRENT, (1, 1))
+    assert SharedSnapshot(tmp_path, check_interval=0, max_age=60).current() is None
+
+
+async def test_middleware_serves_published_reads(tmp_path):
+    write_snapshot(tmp_path, {"/api/portfolio/personal": route()})
+    shared = SharedSnapshot(tmp_path, check_interval=0)
+
+    response = await request(shared, "GET", "/api/portfolio/personal", **{"Accept-Encoding": "identity"})
+    assert (response.status_code, response.content) == (200, BODY)
+    assert response.headers["etag"] == '"v1"'
+    compressed = await request(shared, "GET", "/api/portfolio/personal", **{"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == '"v1-gz"'
+    assert compressed.content == BODY
+    revalidated = await request(shared, "GET", "/api/portfolio/personal", **{"If-None-Match": '"v1"', "Accept-Encoding": "gzip"})
+    assert revalidated.status_code == 304
+    assert (revalidated.headers["etag"], revalidated.headers["vary"]) == ('"v1-gz"', "Accept, Accept-Encoding")
+    assert (await request(shared, "HEAD", "/api/portfolio/personal")).content == b""
+    assert shared.served == 4
+
+
+async def test_middleware_passes_everything_else_to_the_app(tmp_path):
+    write_snapshot(tmp_path, {"/api/portfolio/personal": route()})
+    shared = SharedSnapshot(tmp_path, check_interval=0)
+    for method, url, headers in [
+        ("GET", "/api/portfolio/skills", {}),
+        ("POST", "/api/portfolio/personal", {}),
+        ("GET", "/api/status", {}),
+        ("GET", "/api/portfolio/personal", {"Accept": "application/msgpack"}),
+    ]:
+        assert (await request(shared, method, url, **headers)).status_code == 418
+    assert shared.served == 0
+
+
+async def test_render_snapshot_matches_the_api(server, tmp_path):
+    server.open_repository()
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        routes = await render_snapshot(client)
+        assert "/api/portfolio/projects?view=card" in routes
+        write_snapshot(tmp_path, routes)
+        snapshot = SharedSnapshot(tmp_path, check_interval=0).current()
+        for key in ("/api/portfolio/complete", "/api/portfolio/projects?view=card"):
+            expected = await client.get(key, headers={"Accept-Encoding": "identity"})
+            assert bytes(snapshot.body(snapshot.routes[key]["variants"]["identity"])) == expected.content
+            assert snapshot.routes[key]["etag"] == expected.headers["etag"]
+            zipped = await client.get(key, headers={"Accept-Encoding": "gzip"})
+            served = await request(SharedSnapshot(tmp_path, check_interval=0), "GET", key, **{"Accept-Encoding": "gzip"})
+            assert served.headers["etag"] == zipped.headers["etag"]
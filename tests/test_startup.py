@@ -0,0 +1,65 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.importtime import BACKEND_DIR, FORBIDDEN_AT_IMPORT
+
+
+@pytest.mark.parametrize("backend", ["memory", "mongo", "supabase"])
+def test_import_opens_no_backend_and_loads_no_client_library(backend):
+    env = dict(
+        os.environ,
+        PYTHONPATH=str(BACKEND_DIR),
+        PORTFOLIO_BACKEND=backend,
+        MONGO_URL="mongodb://db.invalid:27017",
+        DB_NAME="portfolio",
+        SUPABASE_URL="https://project.invalid",
+        SUPABASE_SERVICE_ROLE_KEY="key",
+    )
+    script = (
+        "import json, sys, server; "
+        "print(json.dumps([server.repository is None, sorted({name.split('.')[0] for name in sys.modules})]))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    unopened, loaded = json.loads(result.stdout)
+    assert unopened
+    assert [name for name in FORBIDDEN_AT_IMPORT if name in loaded] == []
+
+
+def test_lifespan_opens_the_repository_and_warms_every_section(server, monkeypatch):
+    assert server.repository is None
+    with TestClient(server.app) as client:
+        assert server.repository is not None
+        assert server.portfolio_cache.stats()["entries"] > 0
+        # Answered from the warmed snapshots: a database read would fail now
+        monkeypatch.setattr(server, "repository", None)
+        assert client.get("/api/portfolio/complete").status_code == 200
+
+
+def test_warm_up_can_be_turned_off(server, monkeypatch):
+    monkeypatch.setattr(server, "PORTFOLIO_WARM_UP", False)
+    with TestClient(server.app):
+        assert server.repository is not None
+        assert server.portfolio_cache.stats()["entries"] == 0
+
+
+def test_slow_warm_up_does_not_block_startup(server, monkeypatch, caplog):
+    async def hang(partial=False):
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(server, "load_complete_portfolio", hang)
+    monkeypatch.setattr(server, "PORTFOLIO_WARM_UP_TIMEOUT", 0.05)
+    with TestClient(server.app) as client:
+        assert client.get("/api/portfolio/personal").status_code == 200
+    assert "Warm-up of the memory backend failed" in caplog.text
+
+
+def test_open_repository_is_idempotent(server):
+    repository = server.open_repository()
+    assert server.open_repository() is repository
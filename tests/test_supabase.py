@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.stub_postgrest import StubPostgREST
+from executor import BlockingExecutor
+from repository import SupabaseRepository, build_seed_data
+
+supabase = pytest.importorskip("supabase")
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def stub():
+    with StubPostgREST({name: jsonable_encoder(rows) for name, rows in build_seed_data().items()}) as stub:
+        yield stub
+
+
+def repository_for(stub, workers: int = 4) -> SupabaseRepository:
+    return SupabaseRepository(supabase.create_client(stub.url, "service-role-key"), BlockingExecutor(workers, "test"))
+
+
+async def test_reads_go_through_postgrest(stub):
+    repository = repository_for(stub)
+    projects = await repository.list_projects()
+    assert [row["order"] for row in projects] == sorted(row["order"] for row in projects)
+    assert all(row["featured"] for row in await repository.list_projects(featured_only=True))
+    assert (await repository.get_personal_info())["name"]
+
+
+async def test_calls_overlap_up_to_the_pool_size(stub):
+    stub.delay = 0.1
+    repository = repository_for(stub, workers=4)
+    started = time.perf_counter()
+    await asyncio.gather(*(repository.list_education() for _ in range(4)))
+    assert time.perf_counter() - started < 0.3
+    assert stub.peak_in_flight == 4
+
+
+async def test_pool_size_bounds_concurrency(stub):
+    stub.delay = 0.05
+    repository = repository_for(stub, workers=2)
+    await asyncio.gather(*(repository.list_education() for _ in range(6)))
+    assert stub.peak_in_flight == 2
+
+
+async def test_event_loop_keeps_running_during_a_call(stub):
+    stub.delay = 0.2
+    repository = repository_for(stub)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    beating = asyncio.ensure_future(heartbeat())
+    await repository.list_skills()
+    beating.cancel()
+    assert ticks >= 10
+
+
+async def test_contact_round_trip(stub):
+    repository = repository_for(stub)
+    message = {"id": "m1", "name": "Ada", "email": "ada@example.com", "subject": "Hi", "message": "Hello"}
+    await repository.insert_contact_message(message)
+    rows = await repository.list_contact_messages(10)
+    assert [row["id"] for row in rows] == ["m1"]